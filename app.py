@@ -1,15 +1,39 @@
 import streamlit as st
 import pandas as pd
-import pdfplumber
-import tabula
-import PyPDF2
-import numpy as np
 from io import BytesIO
-import tempfile
 import os
-import re
-from typing import List, Dict, Tuple
-import time
+import tempfile
+import uuid
+from contextlib import closing
+from table_cache import TableDiskCache
+from conversion_cache import ConversionCache, options_key, conversion_signature, conversion_complete
+from document_pool import DocumentPool
+from page_preview import PagePreviewCache
+from converter import (
+    EXTRACTION_METHODS,
+    METHOD_PDFPLUMBER,
+    METHOD_SETTINGS_KEYS,
+    OCR_METHODS,
+    TableStore,
+    get_document_id,
+    get_total_pages,
+    iter_detect_tables,
+    iter_extracted_tables,
+    pdfplumber_settings_key,
+)
+from page_analysis import TABLE_SETTINGS_PRESETS, PRESET_LABELS
+from ocr import OCR_SETTINGS_KEY, ocr_available, find_scanned_pages
+from exporters import (
+    write_excel,
+    write_excel_streaming,
+    write_parquet,
+    write_arrow,
+    write_csv_zip,
+    write_tables_streaming,
+)
+from memory_guard import MemoryGuard, DEFAULT_MEMORY_LIMIT_MB
+from profiling import StageProfiler, NULL_PROFILER, STAGE_SERIALIZATION
+from job_queue import JobManager, JOB_QUEUED, JOB_DONE, JOB_CANCELLED
 
 st.set_page_config(
     page_title="PDF to Excel Converter - Deteksi Tabel",
@@ -17,6 +41,16 @@ st.set_page_config(
     layout="wide"
 )
 
+# Ekstensi file dan MIME type untuk setiap format output
+OUTPUT_FILE_TYPES = {
+    "Excel (.xlsx)": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "CSV (.csv)": ("csv", "text/csv"),
+    "Parquet (.parquet)": ("parquet", "application/vnd.apache.parquet"),
+    "Arrow IPC (.arrows)": ("arrows", "application/vnd.apache.arrow.stream"),
+}
+# Arsip ZIP berisi satu CSV per tabel (CSV tanpa digabung)
+ZIP_MIME = "application/zip"
+
 # Judul aplikasi
 st.title("📊 PDF to Excel/CSV Converter dengan Deteksi Tabel")
 st.markdown("Unggah file PDF, deteksi halaman yang berisi tabel, dan konversi hanya tabelnya saja")
@@ -28,15 +62,30 @@ with st.sidebar:
     # Metode ekstraksi
     extraction_method = st.selectbox(
         "Pilih metode ekstraksi:",
-        ["pdfplumber (recommended)", "tabula", "PyPDF2"]
+        EXTRACTION_METHODS
     )
     
     # Format output
     output_format = st.selectbox(
         "Format output:",
-        ["Excel (.xlsx)", "CSV (.csv)"]
+        ["Excel (.xlsx)", "CSV (.csv)", "Parquet (.parquet)", "Arrow IPC (.arrows)"]
     )
     
+    # Mode streaming untuk Excel berukuran besar
+    # (mode PDF besar di bawah selalu menulis Excel secara streaming, jadi pilihan ini disembunyikan)
+    if output_format == "Excel (.xlsx)" and st.session_state.get('low_memory', False):
+        streaming_excel = True
+        st.caption("📉 Mode PDF besar aktif: Excel selalu ditulis secara streaming.")
+    elif output_format == "Excel (.xlsx)":
+        streaming_excel = st.checkbox(
+            "Mode hemat memori (streaming)",
+            value=False,
+            help="Tulis Excel baris demi baris ke file sementara (xlsxwriter). Disarankan untuk hasil yang sangat besar; "
+                 "otomatis pindah ke sheet baru jika melebihi 1.048.576 baris."
+        )
+    else:
+        streaming_excel = False
+    
     # Mode pemilihan halaman
     page_mode = st.radio(
         "Mode pemilihan halaman:",
@@ -49,6 +98,18 @@ with st.sidebar:
     clean_columns = st.checkbox("Bersihkan nama kolom", value=True)
     remove_empty_columns = st.checkbox("Hapus kolom kosong", value=True)
     fill_na_values = st.checkbox("Isi nilai kosong dengan string kosong", value=True)
+    infer_types = st.checkbox(
+        "Deteksi tipe angka & tanggal",
+        value=False,
+        help="Kolom berisi angka (1.234.567,89, (1.000), 12,5%) atau tanggal dd/mm/yyyy "
+             "disimpan sebagai angka/tanggal, bukan teks"
+    )
+    stitch_tables = st.checkbox(
+        "Sambung tabel lintas halaman",
+        value=True,
+        help="Tabel yang berlanjut ke halaman berikutnya (jumlah dan posisi kolom sama, "
+             "atau header diulang) digabung menjadi satu tabel"
+    )
     
     # Threshold untuk deteksi tabel
     st.markdown("---")
@@ -60,6 +121,78 @@ with st.sidebar:
         value=3,
         help="Nilai lebih tinggi = hanya deteksi tabel yang lebih jelas"
     )
+    table_preset = st.selectbox(
+        "Preset table finder (pdfplumber):",
+        list(TABLE_SETTINGS_PRESETS),
+        format_func=PRESET_LABELS.get,
+        help="Dipakai untuk deteksi dan konversi pdfplumber. Hasil disimpan per preset, "
+             "jadi kembali ke preset sebelumnya tidak mengekstrak ulang."
+    )
+    table_settings = TABLE_SETTINGS_PRESETS[table_preset]
+    # OCR hanya dipakai metode di OCR_METHODS (tabula membaca PDF langsung)
+    use_ocr = st.checkbox(
+        "🔤 OCR untuk halaman hasil scan (Tesseract)",
+        value=False,
+        disabled=not ocr_available() or extraction_method not in OCR_METHODS,
+        help="Halaman tanpa teks yang berisi satu gambar besar dibaca dengan Tesseract di proses terpisah, "
+             "bersamaan dengan halaman digital. Tidak berlaku untuk metode tabula."
+             if ocr_available() else
+             "Butuh paket pytesseract dan program tesseract terpasang di server"
+    ) and extraction_method in OCR_METHODS
+    
+    # Pengaturan performa
+    st.markdown("---")
+    st.header("⚡ Pengaturan Performa")
+    use_parallel = st.checkbox(
+        "Ekstraksi paralel (multi-proses)",
+        value=False,
+        help="Membagi halaman ke beberapa proses (pdfplumber). Berguna untuk PDF dengan banyak halaman."
+    )
+    cpu_count = os.cpu_count() or 1
+    if use_parallel and cpu_count > 1:
+        parallel_workers = st.slider(
+            "Jumlah proses:",
+            min_value=2,
+            max_value=cpu_count,
+            value=cpu_count,
+            help="Untuk deteksi. Konversi berjalan sebagai job bersama pengguna lain, "
+                 "sehingga jumlah prosesnya dibatasi bagian CPU per job."
+        )
+    else:
+        parallel_workers = 1
+    
+    # Mode untuk PDF sangat besar (ribuan halaman)
+    low_memory = st.checkbox(
+        "📉 Mode PDF besar (hemat memori)",
+        value=False,
+        key="low_memory",
+        help="Layout setiap halaman langsung dilepas setelah diproses dan tabel ditulis langsung ke file output, "
+             "tanpa menyimpan semua tabel di memori. Format output dan opsi gabung ditentukan sebelum konversi."
+    )
+    if low_memory:
+        memory_limit_mb = st.number_input(
+            "Batas memori server (MB, 0 = tanpa batas):",
+            min_value=0,
+            value=DEFAULT_MEMORY_LIMIT_MB,
+            step=256,
+            help="Jika pemakaian memori proses melewati batas ini, konversi menunggu memori dilepas "
+                 "lalu dihentikan dengan pesan, bukan crash"
+        )
+    else:
+        memory_limit_mb = 0
+    
+    # Instrumentasi waktu/memori per tahap dan per halaman
+    diagnostics_mode = st.checkbox(
+        "🩺 Mode diagnostik",
+        value=False,
+        help="Mencatat waktu per tahap (buka, cari tabel, DataFrame, pembersihan, serialisasi) "
+             "per halaman. Catatan juga ditulis sebagai log JSON."
+    )
+    trace_memory = diagnostics_mode and st.checkbox(
+        "Ukur puncak memori (lebih lambat)",
+        value=False,
+        help="Memakai tracemalloc; hanya menghitung alokasi Python"
+    )
     
     st.markdown("---")
     st.markdown("### Cara Penggunaan:")
@@ -70,216 +203,451 @@ with st.sidebar:
     4. Download hasil konversi
     """)
 
-# Fungsi untuk mendeteksi halaman yang mengandung tabel
-def detect_tables_in_pdf(pdf_file, threshold: int = 3) -> Dict[int, List[Dict]]:
+# Cache tabel di disk, dipakai bersama oleh semua sesi
+@st.cache_resource
+def get_disk_cache() -> TableDiskCache:
+    return TableDiskCache()
+
+# Cache tabel bersih dan file output di memori, dipakai bersama oleh semua sesi
+@st.cache_resource
+def get_conversion_cache() -> ConversionCache:
+    return ConversionCache()
+
+# Fungsi untuk membuat profiler sesuai mode diagnostik
+def create_profiler(run, document_id):
+    if not diagnostics_mode:
+        return NULL_PROFILER
+    return StageProfiler(
+        trace_memory=trace_memory,
+        log_json=True,
+        context={'run': run, 'document_id': document_id[:16]}
+    )
+
+# Fungsi untuk menampilkan panel diagnostik dari profiler terakhir
+def render_diagnostics(profiler):
+    if not profiler.records:
+        return
+    with st.expander("🩺 Diagnostik Performa"):
+        st.write("**Waktu per tahap:**")
+        summary_df = pd.DataFrame(profiler.stage_summary())
+        st.dataframe(summary_df, use_container_width=True, hide_index=True)
+        
+        slowest_df = pd.DataFrame(profiler.slowest_pages())
+        if not slowest_df.empty:
+            st.write("**Halaman paling lambat:**")
+            st.dataframe(slowest_df, use_container_width=True, hide_index=True)
+        st.caption("Waktu dalam detik; memori (peak_mb) hanya alokasi Python. "
+                   "Catatan dari proses paralel dijumlahkan per proses.")
+
+# Fungsi untuk meringkas satu tabel hasil konversi (untuk statistik dan laporan tipe)
+def table_summary(table_df):
+    return {
+        'halaman': table_df.iloc[0]['PDF_Halaman'] if 'PDF_Halaman' in table_df.columns else 'N/A',
+        'rows': len(table_df),
+        'cols': len(table_df.columns),
+        'type_report': table_df.attrs.get('type_report', []),
+    }
+
+# Fungsi untuk menampilkan laporan konversi tipe kolom
+def render_type_report(summaries):
+    report_rows = []
+    for i, summary in enumerate(summaries):
+        for item in summary['type_report']:
+            report_rows.append({
+                'Tabel': i + 1,
+                'Halaman': summary['halaman'],
+                'Kolom': item['column'],
+                'Tipe': item['type'],
+                'Berhasil': item['parsed'],
+                'Gagal': item['failed'],
+                'Contoh gagal': ", ".join(item['failed_examples'])
+            })
+    
+    if not report_rows:
+        st.info("ℹ️ Tidak ada kolom yang dikonversi ke angka/tanggal")
+        return
+    
+    failed_total = sum(row['Gagal'] for row in report_rows)
+    with st.expander(f"🔢 Konversi Tipe: {len(report_rows)} kolom, {failed_total} sel gagal di-parse",
+                     expanded=failed_total > 0):
+        st.dataframe(pd.DataFrame(report_rows), use_container_width=True, hide_index=True)
+        st.caption("Sel yang gagal di-parse dikosongkan pada kolom yang dikonversi")
+
+# Fungsi untuk menampilkan backend yang dipakai per halaman (metode auto)
+def render_backend_report(backend_report):
+    report_rows = []
+    for item in backend_report:
+        report_rows.append({
+            'Halaman': item['page'],
+            'Backend': "cache" if item['cached'] else (item['backend'] or "-"),
+            'Waktu (dtk)': round(item['seconds'], 3),
+            'Skor': round(item['score'], 2),
+            'Dicoba': ", ".join(
+                f"{attempt['backend']} (gagal)" if attempt['error'] else f"{attempt['backend']} ({attempt['score']:.2f})"
+                for attempt in item['attempts']
+            )
+        })
+    
+    counts = pd.Series([row['Backend'] for row in report_rows]).value_counts()
+    with st.expander("🧭 Backend per Halaman: " + ", ".join(f"{name} {count}" for name, count in counts.items())):
+        st.dataframe(pd.DataFrame(report_rows), use_container_width=True, hide_index=True)
+        st.caption("Backend berikutnya hanya dicoba jika skor kualitas (rasio sel terisi) terlalu rendah")
+
+# Fungsi untuk menampilkan hasil deteksi satu halaman
+def render_detected_tables(page_num, tables):
+    with st.expander(f"Halaman {page_num} - {len(tables)} tabel ditemukan"):
+        for table_info in tables:
+            st.write(f"**Tabel {table_info['index'] + 1}:**")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Baris", table_info['rows'])
+            with col2:
+                st.metric("Kolom", table_info['cols'])
+            with col3:
+                st.metric("Kepadatan", f"{table_info['fill_ratio']*100:.1f}%")
+            
+            # Tampilkan preview kecil
+            if table_info['preview_data']:
+                preview_df = pd.DataFrame(table_info['preview_data'][1:], 
+                                          columns=table_info['preview_data'][0] if table_info['preview_data'][0] else [])
+                st.dataframe(preview_df, height=120, hide_index=True)
+
+# Job manager dipakai bersama oleh semua sesi (satu antrian dan batas CPU)
+@st.cache_resource
+def get_job_manager() -> JobManager:
+    return JobManager()
+
+# Fungsi job konversi (dijalankan di thread worker JobManager, tanpa pemanggilan st.*)
+def run_conversion_job(job, pdf_bytes, pages, method, store, workers, clean_options,
+                       stitch, infer_types, profiler, stream_output=None, memory_limit_mb=0,
+                       table_settings=None, ocr=False, conversion_cache=None):
+    """
+    stream_output: (ekstensi, merge, gzip) untuk mode PDF besar: tabel langsung ditulis
+    ke satu file output dan hanya 3 tabel pertama (10 baris) disimpan untuk preview
+    table_settings: preset table finder untuk metode pdfplumber (store harus sesuai)
+    ocr: halaman hasil scan dibaca dengan Tesseract (lihat iter_extracted_tables)
+    store: milik job ini (TableStore.snapshot()), karena store sesi bisa diisi
+    deteksi di thread utama pada saat yang sama
+    conversion_cache: tabel bersih diambil dari cache jika tabel mentah dan opsinya
+    sama dengan konversi sebelumnya (None pada mode PDF besar). Diambil di thread
+    utama karena st.cache_resource butuh konteks script Streamlit.
+    """
+    job.report_progress(0, len(pages), "Memulai konversi...")
+    if profiler.enabled:
+        profiler.start()
+    
+    low_memory = stream_output is not None
+    summaries = []
+    preview_tables = []
+    backend_report = []  # Diisi per halaman pada metode auto
+    
+    # Ringkasan dan preview diambil saat tabel lewat, sebelum ditulis/disimpan
+    def observe(tables):
+        for table_df in tables:
+            summaries.append(table_summary(table_df))
+            if len(preview_tables) < 3:
+                preview_tables.append(table_df.head(10) if low_memory else table_df)
+            yield table_df
+    
+    tables = observe(iter_extracted_tables(
+        BytesIO(pdf_bytes),
+        pages,
+        method,
+        store,
+        workers,
+        job.warn,
+        clean_options=clean_options,
+        profiler=profiler,
+        stitch=stitch,
+        infer_types=infer_types,
+        progress_callback=lambda done, total: job.report_progress(done, total, f"Halaman {done} dari {total}"),
+        low_memory=low_memory,
+        memory_guard=MemoryGuard(memory_limit_mb) if low_memory else None,
+        backend_callback=backend_report.append,
+        table_settings=table_settings,
+        ocr=ocr,
+        conversion_cache=conversion_cache
+    ))
+    outputs = {}  # File hasil per format/opsi, dibuat saat pertama diminta
+    try:
+        if low_memory:
+            extension, merge, compress = stream_output
+            fd, tmp_path = tempfile.mkstemp(suffix=f'.{extension}')
+            os.close(fd)
+            try:
+                written = write_tables_streaming(tables, tmp_path, extension, merge=merge, compress=compress)
+                with open(tmp_path, 'rb') as f:
+                    outputs[('stream',) + tuple(stream_output)] = (f.read(), written['info'])
+            finally:
+                os.unlink(tmp_path)
+            tables = None
+        else:
+            tables = list(tables)
+    finally:
+        if profiler.enabled:
+            profiler.stop()
+    
+    return {
+        'tables': tables,  # None pada mode PDF besar
+        'summaries': summaries,
+        'preview_tables': preview_tables,
+        'stream_output': stream_output,
+        'pages': pages,
+        'method': method,
+        'infer_types': infer_types,
+        'backend_report': backend_report,
+        'profiler': profiler,
+        'outputs': outputs,
+        # Kunci file output di conversion cache (isi output hanya bergantung pada ini);
+        # None jika konversi tidak lengkap, sehingga outputnya tidak disimpan di cache
+        'signature': conversion_signature(store.document_id, store.settings_key, pages,
+                                          options_key(clean_options, stitch, infer_types,
+                                                      OCR_SETTINGS_KEY if ocr else None))
+                     if conversion_complete(job.warnings, backend_report) else None
+    }
+
+# Fungsi untuk mengambil file hasil dari job (dibuat sekali per format/opsi, juga lintas job)
+def get_job_output(result, key, build):
     """
-    Mendeteksi halaman yang mengandung tabel dalam PDF
-    Returns: Dictionary {page_number: [table_info]}
+    File output hanya disimpan/diambil dari conversion cache jika konversinya
+    lengkap (result['signature'] tidak None, lihat conversion_complete)
     """
-    tables_by_page = {}
+    outputs = result['outputs']
+    if key not in outputs:
+        cacheable = result['signature'] is not None
+        output = None
+        if cacheable:
+            conversion_cache = get_conversion_cache()
+            cache_key = conversion_cache.output_key(result['signature'], key)
+            output = conversion_cache.get(cache_key)
+        if output is None:
+            with result['profiler'].stage(STAGE_SERIALIZATION, format=key[0]):
+                output = build()
+            if cacheable:
+                conversion_cache.put(cache_key, output)
+        outputs[key] = output
+    return outputs[key]
+
+# Fungsi untuk menampilkan progress job; hanya bagian ini yang diperbarui setiap detik
+@st.fragment(run_every=1.0)
+def render_job_progress(job_id):
+    job_manager = get_job_manager()
+    job = job_manager.get(job_id)
+    if job is None or job.finished:
+        st.rerun()
+    
+    if job.status == JOB_QUEUED:
+        stats = job_manager.stats()
+        st.info(f"⏳ Menunggu giliran (antrian ke-{job_manager.queue_position(job_id)}, "
+                f"{stats['running']} dari {stats['workers']} slot konversi sedang dipakai)")
+    else:
+        st.progress(job.progress, text=f"{job.message or 'Mengkonversi...'} ({job.elapsed:.0f} dtk)")
+    
+    if st.button("⏹️ Batalkan Konversi", key=f"cancel_{job_id}"):
+        job_manager.cancel(job_id)
+        st.rerun()
+
+# Fungsi untuk menampilkan tombol download sesuai format output (dibuat dari tabel yang disimpan)
+def render_table_downloads(result, filename_base):
+    cleaned_tables = result['tables']
+    
+    # Pilihan untuk merge semua tabel (Parquet/Arrow selalu satu file)
+    if len(cleaned_tables) > 1 and output_format in ("Excel (.xlsx)", "CSV (.csv)"):
+        merge_option = st.checkbox("Gabungkan semua tabel menjadi satu sheet", value=True)
+    else:
+        merge_option = False
+    
+    if output_format == "Excel (.xlsx)":
+        def build_excel():
+            if streaming_excel:
+                # Tulis ke file sementara, bukan ke RAM
+                fd, tmp_path = tempfile.mkstemp(suffix='.xlsx')
+                os.close(fd)
+                try:
+                    sheet_info = write_excel_streaming(cleaned_tables, tmp_path, merge=merge_option)
+                    with open(tmp_path, 'rb') as f:
+                        return f.read(), sheet_info
+                finally:
+                    os.unlink(tmp_path)
+            output = BytesIO()
+            sheet_info = write_excel(cleaned_tables, output, merge=merge_option)
+            return output.getvalue(), sheet_info
+        
+        output, sheet_info = get_job_output(result, ('xlsx', merge_option, streaming_excel), build_excel)
+        
+        # Tombol download
+        filename = f"{filename_base}_tables_only.xlsx"
+        
+        st.download_button(
+            label=f"📥 Download Excel File ({sheet_info})",
+            data=output,
+            file_name=filename,
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            type="primary"
+        )
     
-    with pdfplumber.open(pdf_file) as pdf:
-        total_pages = len(pdf.pages)
+    elif output_format == "Parquet (.parquet)":
+        # Satu file, satu row group per tabel
+        def build_parquet():
+            output = BytesIO()
+            write_parquet(cleaned_tables, output)
+            return output.getvalue()
         
-        # Progress bar
-        progress_bar = st.progress(0)
-        status_text = st.empty()
+        st.download_button(
+            label=f"📥 Download Parquet File ({len(cleaned_tables)} row group)",
+            data=get_job_output(result, ('parquet',), build_parquet),
+            file_name=f"{filename_base}_tables_only.parquet",
+            mime="application/vnd.apache.parquet",
+            type="primary"
+        )
+    
+    elif output_format == "Arrow IPC (.arrows)":
+        # Satu file stream, satu record batch per tabel
+        def build_arrow():
+            output = BytesIO()
+            write_arrow(cleaned_tables, output)
+            return output.getvalue()
         
-        for page_num in range(total_pages):
-            status_text.text(f"Menganalisis halaman {page_num + 1} dari {total_pages}...")
-            progress_bar.progress((page_num + 1) / total_pages)
+        st.download_button(
+            label=f"📥 Download Arrow File ({len(cleaned_tables)} batch)",
+            data=get_job_output(result, ('arrows',), build_arrow),
+            file_name=f"{filename_base}_tables_only.arrows",
+            mime="application/vnd.apache.arrow.stream",
+            type="primary"
+        )
+    
+    else:  # CSV
+        if merge_option and len(cleaned_tables) > 1:
+            # Gabungkan dan download sebagai satu CSV
+            def build_merged_csv():
+                merged_df = pd.concat(cleaned_tables, ignore_index=True)
+                return merged_df.to_csv(index=False).encode('utf-8')
             
-            page = pdf.pages[page_num]
+            st.download_button(
+                label="📥 Download Semua Data sebagai CSV",
+                data=get_job_output(result, ('csv', True), build_merged_csv),
+                file_name=f"{filename_base}_all_tables.csv",
+                mime="text/csv",
+                type="primary"
+            )
+        elif len(cleaned_tables) == 1:
+            # Satu tabel: langsung satu file CSV, tanpa arsip ZIP
+            table_df = cleaned_tables[0]
+            halaman = table_df.iloc[0]['PDF_Halaman'] if 'PDF_Halaman' in table_df.columns else 1
             
-            # Ekstrak tabel dari halaman
-            tables = page.extract_tables()
+            def build_single_csv():
+                return table_df.to_csv(index=False).encode('utf-8')
             
-            # Filter tabel yang valid (memiliki baris dan kolom)
-            valid_tables = []
-            for table_idx, table in enumerate(tables):
-                if table and len(table) > 1:  # Minimal ada header dan satu baris data
-                    num_rows = len(table)
-                    num_cols = max(len(row) for row in table) if table else 0
-                    
-                    # Hitung rasio sel yang terisi (sebagai indikator kualitas tabel)
-                    filled_cells = sum(1 for row in table for cell in row if cell and str(cell).strip())
-                    total_cells = num_rows * num_cols if num_cols > 0 else 0
-                    fill_ratio = filled_cells / total_cells if total_cells > 0 else 0
-                    
-                    # Gunakan threshold untuk menentukan apakah ini tabel yang valid
-                    if (num_rows >= threshold and 
-                        num_cols >= 2 and 
-                        fill_ratio > 0.3):  # Minimal 30% sel terisi
-                        
-                        table_info = {
-                            'index': table_idx,
-                            'rows': num_rows,
-                            'cols': num_cols,
-                            'fill_ratio': fill_ratio,
-                            'preview_data': table[:3]  # Preview 3 baris pertama
-                        }
-                        valid_tables.append(table_info)
+            st.download_button(
+                label=f"📥 Download Tabel 1 (Halaman {halaman})",
+                data=get_job_output(result, ('csv', False, 'single'), build_single_csv),
+                file_name=f"{filename_base}_halaman_{halaman}_tabel_1.csv",
+                mime="text/csv",
+                type="primary"
+            )
+        else:
+            # Satu arsip ZIP berisi CSV per tabel (ditulis ke file sementara, bukan ke RAM)
+            compress = st.checkbox("Kompres setiap CSV dengan gzip", value=False)
             
-            if valid_tables:
-                tables_by_page[page_num + 1] = valid_tables
-        
-        progress_bar.empty()
-        status_text.empty()
-    
-    return tables_by_page
+            def build_csv_zip():
+                fd, tmp_path = tempfile.mkstemp(suffix='.zip')
+                os.close(fd)
+                try:
+                    written = write_csv_zip(cleaned_tables, tmp_path, compress=compress)
+                    with open(tmp_path, 'rb') as f:
+                        return f.read(), written['info']
+                finally:
+                    os.unlink(tmp_path)
+            
+            output, zip_info = get_job_output(result, ('csv', False, compress), build_csv_zip)
+            st.download_button(
+                label=f"📥 Download ZIP ({zip_info})",
+                data=output,
+                file_name=f"{filename_base}_tables_csv.zip",
+                mime=ZIP_MIME,
+                type="primary"
+            )
 
-# Fungsi untuk membersihkan nama kolom
-def clean_column_names(columns):
-    cleaned_columns = []
-    seen = {}
-    
-    for i, col in enumerate(columns):
-        if col is None or pd.isna(col):
-            # Untuk kolom None, beri nama generic
-            base_name = f"Column_{i+1}"
-            col_name = base_name
-            counter = 1
-            while col_name in seen:
-                col_name = f"{base_name}_{counter}"
-                counter += 1
-        else:
-            # Bersihkan string
-            col_str = str(col).strip()
-            # Hapus karakter khusus
-            col_str = re.sub(r'[^\w\s]', '_', col_str)
-            # Ganti spasi dengan underscore
-            col_str = re.sub(r'\s+', '_', col_str)
-            # Hapus underscore berlebih di awal/akhir
-            col_str = col_str.strip('_')
-            # Pastikan tidak kosong
-            if not col_str:
-                col_str = f"Column_{i+1}"
+# Fungsi untuk menampilkan hasil job konversi yang sudah selesai
+def render_conversion_result(job, filename_base):
+    result = job.result
+    summaries = result['summaries']
+    
+    for warning in job.warnings:
+        st.warning(warning)
+    
+    if not summaries:
+        st.warning("⚠️ Tidak ada tabel yang berhasil diekstrak dari halaman yang dipilih")
+        return
+    
+    st.success(f"✅ Berhasil mengekstrak {len(summaries)} tabel ({job.elapsed:.1f} detik)")
+    
+    if result['backend_report']:
+        render_backend_report(result['backend_report'])
+    
+    # Laporan kolom yang dikonversi ke angka/tanggal
+    if result['infer_types']:
+        render_type_report(summaries)
+    
+    # Tampilkan preview tabel
+    st.subheader("📊 Preview Data Hasil Konversi")
+    
+    for i, (table_df, summary) in enumerate(zip(result['preview_tables'], summaries)):  # Maksimal 3 tabel pertama
+        with st.expander(f"Tabel {i+1} - Halaman {summary['halaman']}"):
+            # Tampilkan informasi tabel
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Baris", summary['rows'])
+            with col2:
+                st.metric("Kolom", summary['cols'])
+            with col3:
+                st.metric("Halaman PDF", summary['halaman'])
             
-            col_name = col_str
-            counter = 1
-            original_name = col_name
-            while col_name in seen:
-                col_name = f"{original_name}_{counter}"
-                counter += 1
-        
-        cleaned_columns.append(col_name)
-        seen[col_name] = True
+            # Tampilkan dataframe
+            st.dataframe(
+                table_df.head(10), 
+                use_container_width=True,
+                hide_index=True
+            )
     
-    return cleaned_columns
-
-# Fungsi untuk membersihkan DataFrame
-def clean_dataframe(df, clean_columns=True, remove_empty=True, fill_na=True):
-    if df.empty:
-        return df
-    
-    # Buat copy
-    df_clean = df.copy()
-    
-    # 1. Bersihkan nama kolom jika ada duplikat atau None
-    if clean_columns:
-        df_clean.columns = clean_column_names(df_clean.columns)
-    
-    # 2. Hapus kolom yang sepenuhnya kosong
-    if remove_empty:
-        # Hapus kolom yang semua nilainya NaN atau string kosong
-        cols_to_drop = []
-        for col in df_clean.columns:
-            if df_clean[col].dropna().empty:
-                cols_to_drop.append(col)
-            elif df_clean[col].astype(str).str.strip().eq('').all():
-                cols_to_drop.append(col)
-        
-        if cols_to_drop:
-            df_clean = df_clean.drop(columns=cols_to_drop)
+    if len(summaries) > 3:
+        st.info(f"📝 ...dan {len(summaries) - 3} tabel lainnya")
     
-    # 3. Isi nilai NaN dengan string kosong
-    if fill_na:
-        df_clean = df_clean.fillna('')
+    # Konversi ke Excel atau CSV
+    st.subheader("💾 Download Hasil")
     
-    # 4. Hapus baris yang sepenuhnya kosong
-    mask = df_clean.astype(str).apply(lambda x: x.str.strip()).ne('').any(axis=1)
-    df_clean = df_clean[mask].reset_index(drop=True)
+    if result['stream_output'] is not None:
+        # Mode PDF besar: file sudah ditulis saat konversi, tabel tidak disimpan
+        extension = result['stream_output'][0]
+        data, info = result['outputs'][('stream',) + tuple(result['stream_output'])]
+        mime = next((mime for ext, mime in OUTPUT_FILE_TYPES.values() if ext == extension), ZIP_MIME)
+        written_format = "csv" if extension == "zip" else extension  # ZIP berisi CSV per tabel
+        if OUTPUT_FILE_TYPES[output_format][0] != written_format:
+            st.info(f"ℹ️ Hasil mode PDF besar ditulis sebagai .{extension}. "
+                    "Jalankan konversi lagi untuk format lain.")
+        st.download_button(
+            label=f"📥 Download File .{extension} ({info})",
+            data=data,
+            file_name=f"{filename_base}_tables_only.{extension}",
+            mime=mime,
+            type="primary"
+        )
+    else:
+        render_table_downloads(result, filename_base)
     
-    return df_clean
-
-# Fungsi untuk ekstraksi tabel dari halaman tertentu
-def extract_tables_from_pages(pdf_file, pages_to_extract, extraction_method):
-    all_tables = []
-    
-    if extraction_method == "pdfplumber (recommended)":
-        with pdfplumber.open(pdf_file) as pdf:
-            for page_num in pages_to_extract:
-                page_idx = page_num - 1
-                if page_idx < len(pdf.pages):
-                    page = pdf.pages[page_idx]
-                    tables = page.extract_tables()
-                    
-                    for table_idx, table in enumerate(tables):
-                        if table and len(table) > 0:
-                            # Ambil header (baris pertama)
-                            headers = table[0] if table[0] else []
-                            data_rows = table[1:] if len(table) > 1 else []
-                            
-                            if data_rows:
-                                try:
-                                    if headers:
-                                        df = pd.DataFrame(data_rows, columns=headers)
-                                    else:
-                                        num_cols = len(data_rows[0])
-                                        generic_headers = [f"Col_{i+1}" for i in range(num_cols)]
-                                        df = pd.DataFrame(data_rows, columns=generic_headers)
-                                    
-                                    df = clean_dataframe(df)
-                                    if not df.empty:
-                                        df.insert(0, 'PDF_Halaman', page_num)
-                                        df.insert(1, 'PDF_Tabel_Index', table_idx + 1)
-                                        all_tables.append(df)
-                                except Exception as e:
-                                    st.warning(f"Error di halaman {page_num}, tabel {table_idx+1}: {str(e)}")
-    
-    elif extraction_method == "tabula":
-        # Simpan file sementara untuk tabula
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-            tmp_file.write(pdf_file.getvalue())
-            tmp_path = tmp_file.name
-        
-        try:
-            for page_num in pages_to_extract:
-                dfs = tabula.read_pdf(
-                    tmp_path,
-                    pages=page_num,
-                    multiple_tables=True,
-                    lattice=True,
-                    stream=True,
-                    pandas_options={'header': None}
-                )
-                
-                for idx, df in enumerate(dfs):
-                    if not df.empty:
-                        df_clean = clean_dataframe(df)
-                        if not df_clean.empty:
-                            df_clean.insert(0, 'PDF_Halaman', page_num)
-                            df_clean.insert(1, 'PDF_Tabel_Index', idx + 1)
-                            all_tables.append(df_clean)
-        
-        finally:
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+    # Statistik konversi
+    st.info(f"""
+    **📋 Statistik Konversi:**
+    - Halaman diproses: {len(result['pages'])}
+    - Total tabel: {len(summaries)}
+    - Total baris: {sum(summary['rows'] for summary in summaries):,}
+    - Total kolom: {sum(summary['cols'] for summary in summaries):,}
+    - Metode: {result['method']}
+    - Waktu konversi: {job.elapsed:.1f} detik
+    """)
     
-    else:  # PyPDF2
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        for page_num in pages_to_extract:
-            page_idx = page_num - 1
-            if page_idx < len(pdf_reader.pages):
-                page = pdf_reader.pages[page_idx]
-                text = page.extract_text()
-                if text.strip():
-                    lines = text.split('\n')
-                    df = pd.DataFrame(lines, columns=['Konten'])
-                    df.insert(0, 'PDF_Halaman', page_num)
-                    all_tables.append(df)
-    
-    return all_tables
+    if result['profiler'].enabled:
+        render_diagnostics(result['profiler'])
 
 # Area upload file
 uploaded_file = st.file_uploader(
@@ -293,144 +661,209 @@ if uploaded_file is not None:
     file_size = uploaded_file.size / (1024 * 1024)  # Konversi ke MB
     st.info(f"📁 File: {uploaded_file.name} | Ukuran: {file_size:.2f} MB")
     
+    # Hash isi file dihitung sekali per upload, bukan setiap rerun (file_id berganti
+    # setiap kali file diunggah, termasuk file yang sama diunggah ulang)
+    if st.session_state.get('document_upload_id') != uploaded_file.file_id:
+        st.session_state['document_upload_id'] = uploaded_file.file_id
+        st.session_state['document_id'] = get_document_id(uploaded_file)
+    document_id = st.session_state['document_id']
+    
+    # Penyimpanan tabel mentah per dokumen dan per backend (dibuat ulang jika file berganti)
+    # Store pdfplumber per preset tetap disimpan agar preset lain bisa dicoba tanpa kehilangan hasil
+    pdfplumber_key = pdfplumber_settings_key(table_settings)
+    table_stores = st.session_state.get('table_stores', {})
+    for settings_key in [pdfplumber_key, *METHOD_SETTINGS_KEYS.values()]:
+        if settings_key not in table_stores or not table_stores[settings_key].matches(document_id, settings_key):
+            table_stores[settings_key] = TableStore(document_id, settings_key, disk_cache=get_disk_cache())
+    st.session_state['table_stores'] = table_stores
+    table_store = table_stores[pdfplumber_key]
+    
+    # Handle pdfplumber dibuka sekali per sesi dan dipakai ulang di setiap rerun untuk jumlah
+    # halaman dan deteksi. PDF tetap di-parse di dua tempat lain, dengan sengaja:
+    # - preview memakai PagePreviewCache (pypdfium2), karena pdfplumber tidak bisa merender halaman
+    # - job konversi membuka PDF sendiri, karena berjalan di thread worker sementara handle ini
+    #   bisa dipakai deteksi di thread sesi (objek pdfplumber tidak thread-safe); job hanya
+    #   membukanya jika ada halaman yang belum tersimpan di TableStore
+    document_pool = st.session_state.setdefault('document_pool', DocumentPool())
+    pdf_document = document_pool.get(document_id, uploaded_file)
+    
     # Tab untuk navigasi
     tab1, tab2, tab3 = st.tabs(["🔍 Deteksi Tabel", "👁️ Preview PDF", "🔄 Konversi"])
     
     with tab1:
         st.subheader("Deteksi Halaman Berisi Tabel")
         
-        if st.button("🔎 Mulai Deteksi Tabel", type="primary"):
+        # Status deteksi per dokumen; hasil parsial disimpan setiap halaman selesai
+        total_pages = get_total_pages(uploaded_file, table_store, pdf_document)
+        st.session_state['total_pages'] = total_pages
+        detection = st.session_state.get('detection')
+        if detection is None or detection['document_id'] != document_id:
+            detection = {'document_id': document_id, 'threshold': table_threshold, 'done_pages': set()}
+            st.session_state['detection'] = detection
+            st.session_state.pop('tables_by_page', None)
+            st.session_state.pop('selected_pages', None)
+            st.session_state.pop('scanned_pages', None)
+        
+        done_pages = detection['done_pages']
+        is_partial = (0 < len(done_pages) < total_pages and detection['threshold'] == table_threshold
+                      and detection.get('settings_key') == pdfplumber_key)
+        button_label = "▶️ Lanjutkan Deteksi Tabel" if is_partial else "🔎 Mulai Deteksi Tabel"
+        
+        if is_partial:
+            st.info(f"⏸️ Deteksi terhenti: {len(done_pages)} dari {total_pages} halaman sudah dianalisis. "
+                    "Hasil sementara bisa langsung dipilih di bawah.")
+        
+        if st.button(button_label, type="primary"):
+            if not is_partial:
+                # Mulai dari awal (threshold/preset berubah atau deteksi sebelumnya sudah selesai)
+                detection['threshold'] = table_threshold
+                detection['settings_key'] = pdfplumber_key
+                done_pages.clear()
+                st.session_state['tables_by_page'] = {}
+            tables_by_page = st.session_state.setdefault('tables_by_page', {})
+            
+            # Klik tombol ini (atau widget lain) menghentikan deteksi; hasil parsial tetap tersimpan
+            stop_placeholder = st.empty()
+            stop_placeholder.button("⏹️ Hentikan Deteksi", key="stop_detection")
+            
+            profiler = create_profiler('detect', document_id)
+            st.session_state['detection_profiler'] = profiler
             with st.spinner("Mendeteksi tabel dalam PDF..."):
                 try:
-                    # Deteksi tabel
-                    tables_by_page = detect_tables_in_pdf(uploaded_file, table_threshold)
+                    if diagnostics_mode:
+                        profiler.start()
+                    progress_bar = st.progress(len(done_pages) / total_pages)
+                    status_text = st.empty()
                     
-                    # Simpan ke session state
-                    st.session_state['tables_by_page'] = tables_by_page
-                    st.session_state['total_pages'] = len(pdfplumber.open(uploaded_file).pages)
+                    # Hasil ditampilkan bertahap setiap halaman selesai dianalisis
+                    st.subheader("📋 Hasil Deteksi Tabel")
+                    results_container = st.container()
+                    
+                    pages_to_scan = [p for p in range(1, total_pages + 1) if p not in done_pages]
+                    with closing(iter_detect_tables(uploaded_file, table_threshold, table_store,
+                                                    parallel_workers, pages=pages_to_scan,
+                                                    profiler=profiler,
+                                                    document=pdf_document,
+                                                    low_memory=low_memory,
+                                                    memory_guard=MemoryGuard(memory_limit_mb) if low_memory else None,
+                                                    table_settings=table_settings
+                                                    )) as detections:
+                        for page_num, valid_tables in detections:
+                            done_pages.add(page_num)
+                            if valid_tables:
+                                tables_by_page[page_num] = valid_tables
+                                with results_container:
+                                    render_detected_tables(page_num, valid_tables)
+                            
+                            status_text.text(f"Menganalisis halaman {page_num} dari {total_pages}... "
+                                             f"({len(tables_by_page)} halaman berisi tabel)")
+                            progress_bar.progress(len(done_pages) / total_pages)
+                    
+                    progress_bar.empty()
+                    status_text.empty()
+                    stop_placeholder.empty()
                     
                     if not tables_by_page:
                         st.warning("❌ Tidak ada tabel yang terdeteksi dalam PDF.")
                     else:
-                        st.success(f"✅ Ditemukan tabel di {len(tables_by_page)} halaman dari total {st.session_state['total_pages']} halaman")
-                        
-                        # Tampilkan hasil deteksi
-                        st.subheader("📋 Hasil Deteksi Tabel")
-                        
-                        for page_num, tables in tables_by_page.items():
-                            with st.expander(f"Halaman {page_num} - {len(tables)} tabel ditemukan"):
-                                for table_info in tables:
-                                    st.write(f"**Tabel {table_info['index'] + 1}:**")
-                                    col1, col2, col3 = st.columns(3)
-                                    with col1:
-                                        st.metric("Baris", table_info['rows'])
-                                    with col2:
-                                        st.metric("Kolom", table_info['cols'])
-                                    with col3:
-                                        st.metric("Kepadatan", f"{table_info['fill_ratio']*100:.1f}%")
-                                    
-                                    # Tampilkan preview kecil
-                                    if table_info['preview_data']:
-                                        preview_df = pd.DataFrame(table_info['preview_data'][1:], 
-                                                                  columns=table_info['preview_data'][0] if table_info['preview_data'][0] else [])
-                                        st.dataframe(preview_df, height=120, hide_index=True)
-                        
-                        # Pilihan halaman untuk konversi
-                        st.subheader("🎯 Pilih Halaman untuk Konversi")
-                        
-                        if 'tables_by_page' in st.session_state:
-                            # Default pilih semua halaman dengan tabel
-                            default_pages = list(tables_by_page.keys())
-                            
-                            selected_pages = st.multiselect(
-                                "Pilih halaman yang akan dikonversi:",
-                                options=range(1, st.session_state['total_pages'] + 1),
-                                default=default_pages,
-                                format_func=lambda x: f"Halaman {x} {'📊' if x in tables_by_page else '📄'}"
-                            )
-                            
-                            # Simpan ke session state
-                            st.session_state['selected_pages'] = selected_pages
-                            
-                            # Tampilkan statistik
-                            col1, col2 = st.columns(2)
-                            with col1:
-                                st.metric("Halaman dipilih", len(selected_pages))
-                            with col2:
-                                tables_count = sum(len(tables_by_page.get(p, [])) for p in selected_pages)
-                                st.metric("Total tabel", tables_count)
-                            
-                            st.success(f"✅ Siap mengkonversi {len(selected_pages)} halaman yang dipilih")
+                        st.success(f"✅ Ditemukan tabel di {len(tables_by_page)} halaman dari total {total_pages} halaman")
                 
                 except Exception as e:
                     st.error(f"Error saat mendeteksi tabel: {str(e)}")
+                finally:
+                    if diagnostics_mode:
+                        profiler.stop()
         
-        elif 'tables_by_page' in st.session_state:
+        elif 'tables_by_page' in st.session_state and not is_partial:
             # Tampilkan hasil deteksi yang sudah ada
             st.success(f"✅ Hasil deteksi tersedia: {len(st.session_state['tables_by_page'])} halaman berisi tabel")
-            
-            # Pilihan halaman untuk konversi
+        
+        if diagnostics_mode and 'detection_profiler' in st.session_state:
+            render_diagnostics(st.session_state['detection_profiler'])
+        
+        if 'tables_by_page' in st.session_state and done_pages:
+            # Pilihan halaman untuk konversi (juga dari hasil parsial)
             st.subheader("🎯 Pilih Halaman untuk Konversi")
             
             tables_by_page = st.session_state['tables_by_page']
-            total_pages = st.session_state['total_pages']
             
-            # Default pilih semua halaman dengan tabel
-            default_pages = list(tables_by_page.keys())
+            # Halaman hasil scan dicari sekali per dokumen (hanya membaca content stream)
+            scanned_pages = set()
+            if use_ocr:
+                if 'scanned_pages' not in st.session_state:
+                    st.session_state['scanned_pages'] = set(find_scanned_pages(uploaded_file, range(1, total_pages + 1)))
+                scanned_pages = st.session_state['scanned_pages']
+            
+            # Default pilih semua halaman dengan tabel (dan halaman scan jika OCR aktif)
+            default_pages = sorted(set(tables_by_page) | scanned_pages)
             
             selected_pages = st.multiselect(
                 "Pilih halaman yang akan dikonversi:",
                 options=range(1, total_pages + 1),
                 default=default_pages,
-                format_func=lambda x: f"Halaman {x} {'📊' if x in tables_by_page else '📄'}"
+                format_func=lambda x: f"Halaman {x} "
+                                      f"{'📊' if x in tables_by_page else '🖼️' if x in scanned_pages else '📄'}"
             )
+            if scanned_pages:
+                st.caption(f"🖼️ {len(scanned_pages)} halaman hasil scan akan dibaca dengan OCR")
             
             # Simpan ke session state
             st.session_state['selected_pages'] = selected_pages
+            
+            # Tampilkan statistik
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("Halaman dipilih", len(selected_pages))
+            with col2:
+                tables_count = sum(len(tables_by_page.get(p, [])) for p in selected_pages)
+                st.metric("Total tabel", tables_count)
     
     with tab2:
         st.subheader("Preview Konten PDF")
         
+        # Preview dibuat saat diminta dan disimpan per halaman (satu cache per dokumen)
+        preview_cache = st.session_state.get('preview_cache')
+        if preview_cache is None or preview_cache.document_id != document_id:
+            if preview_cache is not None:
+                preview_cache.close()
+            preview_cache = PagePreviewCache(uploaded_file.getvalue(), document_id)
+            st.session_state['preview_cache'] = preview_cache
+        
         # Pilih halaman untuk preview
-        if 'total_pages' in st.session_state:
-            page_to_preview = st.selectbox(
-                "Pilih halaman untuk preview:",
-                options=range(1, st.session_state['total_pages'] + 1),
-                format_func=lambda x: f"Halaman {x}"
-            )
-        else:
-            page_to_preview = 1
+        page_to_preview = st.selectbox(
+            "Pilih halaman untuk preview:",
+            options=range(1, preview_cache.total_pages + 1),
+            format_func=lambda x: f"Halaman {x}"
+        )
         
         # Tampilkan preview halaman
         try:
-            with pdfplumber.open(uploaded_file) as pdf:
-                if page_to_preview <= len(pdf.pages):
-                    page = pdf.pages[page_to_preview - 1]
-                    text_preview = page.extract_text()[:1500]  # Batasi preview
-                    
-                    col1, col2 = st.columns([2, 1])
-                    with col1:
-                        st.text_area(
-                            f"Preview Teks Halaman {page_to_preview}:",
-                            text_preview,
-                            height=400,
-                            disabled=True
-                        )
-                    
-                    with col2:
-                        st.metric("Halaman", page_to_preview)
-                        
-                        # Cek apakah halaman ini ada tabel
-                        if 'tables_by_page' in st.session_state:
-                            tables_in_page = st.session_state['tables_by_page'].get(page_to_preview, [])
-                            st.metric("Tabel terdeteksi", len(tables_in_page))
-                        
-                        # Statistik halaman
-                        words = len(text_preview.split())
-                        lines = len(text_preview.split('\n'))
-                        
-                        col2.metric("Kata", words)
-                        col2.metric("Baris", lines)
+            preview = preview_cache.get(page_to_preview)
+            text_preview = preview['text'][:1500]  # Batasi preview
+            
+            col1, col2, col3 = st.columns([1, 2, 1])
+            with col1:
+                st.image(preview['image'], caption=f"Halaman {page_to_preview}")
+            
+            with col2:
+                st.text_area(
+                    f"Preview Teks Halaman {page_to_preview}:",
+                    text_preview,
+                    height=400,
+                    disabled=True
+                )
+            
+            with col3:
+                st.metric("Halaman", page_to_preview)
+                
+                # Cek apakah halaman ini ada tabel
+                if 'tables_by_page' in st.session_state:
+                    tables_in_page = st.session_state['tables_by_page'].get(page_to_preview, [])
+                    st.metric("Tabel terdeteksi", len(tables_in_page))
+                
+                # Statistik halaman
+                st.metric("Kata", preview['words'])
+                st.metric("Baris", preview['lines'])
         
         except Exception as e:
             st.error(f"Error membaca PDF: {str(e)}")
@@ -450,149 +883,83 @@ if uploaded_file is not None:
                 selected_pages = st.session_state['selected_pages']
                 tables_by_page = st.session_state.get('tables_by_page', {})
                 
+                scanned_pages = st.session_state.get('scanned_pages', set()) if use_ocr else set()
                 for page_num in selected_pages:
+                    if page_num in scanned_pages:
+                        st.write(f"**Halaman {page_num}:** hasil scan (OCR)")
+                        continue
                     tables_count = len(tables_by_page.get(page_num, []))
                     st.write(f"**Halaman {page_num}:** {tables_count} tabel")
             
-            # Tombol konversi
+            # Konversi berjalan sebagai job di background: tidak hilang saat rerun
+            job_manager = get_job_manager()
+            session_owner = st.session_state.setdefault('session_owner', uuid.uuid4().hex)
+            
+            # Mode PDF besar: file output ditulis saat konversi, jadi opsinya dipilih sekarang
+            stream_output = None
+            if low_memory:
+                stream_extension = OUTPUT_FILE_TYPES[output_format][0]
+                stream_merge = output_format in ("Excel (.xlsx)", "CSV (.csv)") and st.checkbox(
+                    "Gabungkan semua tabel menjadi satu sheet" if output_format == "Excel (.xlsx)"
+                    else "Gabungkan semua tabel menjadi satu file CSV",
+                    value=True, key="stream_merge"
+                )
+                stream_gzip = False
+                if output_format == "CSV (.csv)" and not stream_merge:
+                    # Satu CSV per tabel di dalam satu arsip ZIP
+                    stream_extension = "zip"
+                    stream_gzip = st.checkbox("Kompres setiap CSV dengan gzip", value=False, key="stream_gzip")
+                stream_output = (stream_extension, stream_merge, stream_gzip)
+            
             if st.button("🚀 Mulai Konversi", type="primary"):
-                with st.spinner(f"Mengkonversi {len(st.session_state['selected_pages'])} halaman..."):
-                    try:
-                        # Ekstrak tabel dari halaman yang dipilih
-                        tables = extract_tables_from_pages(
-                            uploaded_file,
-                            st.session_state['selected_pages'],
-                            extraction_method
-                        )
-                        
-                        if not tables:
-                            st.warning("⚠️ Tidak ada tabel yang berhasil diekstrak dari halaman yang dipilih")
-                        else:
-                            st.success(f"✅ Berhasil mengekstrak {len(tables)} tabel")
-                            
-                            # Bersihkan semua tabel
-                            cleaned_tables = []
-                            for table_df in tables:
-                                cleaned_df = clean_dataframe(
-                                    table_df, 
-                                    clean_columns=clean_columns,
-                                    remove_empty=remove_empty_columns,
-                                    fill_na=fill_na_values
-                                )
-                                if not cleaned_df.empty:
-                                    cleaned_tables.append(cleaned_df)
-                            
-                            # Tampilkan preview tabel
-                            st.subheader("📊 Preview Data Hasil Konversi")
-                            
-                            for i, table_df in enumerate(cleaned_tables[:3]):  # Batasi preview ke 3 tabel pertama
-                                with st.expander(f"Tabel {i+1} - Halaman {table_df.iloc[0]['PDF_Halaman'] if 'PDF_Halaman' in table_df.columns else 'N/A'}"):
-                                    # Tampilkan informasi tabel
-                                    col1, col2, col3 = st.columns(3)
-                                    with col1:
-                                        st.metric("Baris", len(table_df))
-                                    with col2:
-                                        st.metric("Kolom", len(table_df.columns))
-                                    with col3:
-                                        halaman = table_df.iloc[0]['PDF_Halaman'] if 'PDF_Halaman' in table_df.columns else 'N/A'
-                                        st.metric("Halaman PDF", halaman)
-                                    
-                                    # Tampilkan dataframe
-                                    st.dataframe(
-                                        table_df.head(10), 
-                                        use_container_width=True,
-                                        hide_index=True
-                                    )
-                            
-                            if len(cleaned_tables) > 3:
-                                st.info(f"📝 ...dan {len(cleaned_tables) - 3} tabel lainnya")
-                            
-                            # Konversi ke Excel atau CSV
-                            st.subheader("💾 Download Hasil")
-                            
-                            # Pilihan untuk merge semua tabel
-                            if len(cleaned_tables) > 1:
-                                merge_option = st.checkbox("Gabungkan semua tabel menjadi satu sheet", value=True)
-                            else:
-                                merge_option = False
-                            
-                            filename_base = uploaded_file.name.replace('.pdf', '').replace('.PDF', '')
-                            
-                            if output_format == "Excel (.xlsx)":
-                                # Simpan ke Excel
-                                output = BytesIO()
-                                
-                                with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                                    if merge_option and len(cleaned_tables) > 1:
-                                        # Gabungkan semua tabel
-                                        merged_df = pd.concat(cleaned_tables, ignore_index=True)
-                                        merged_df.to_excel(writer, sheet_name="Data_Terpisah", index=False)
-                                        sheet_info = f"1 sheet (tergabung)"
-                                    else:
-                                        # Simpan setiap tabel di sheet terpisah
-                                        for i, table_df in enumerate(cleaned_tables):
-                                            # Cari halaman untuk nama sheet
-                                            halaman = table_df.iloc[0]['PDF_Halaman'] if 'PDF_Halaman' in table_df.columns else i+1
-                                            sheet_name = f"H{halaman}_T{i+1}"
-                                            sheet_name = re.sub(r'[^\w\s]', '_', sheet_name)
-                                            sheet_name = sheet_name[:31]  # Excel limit
-                                            
-                                            table_df.to_excel(writer, sheet_name=sheet_name, index=False)
-                                        sheet_info = f"{len(cleaned_tables)} sheets"
-                                
-                                output.seek(0)
-                                
-                                # Tombol download
-                                filename = f"{filename_base}_tables_only.xlsx"
-                                
-                                st.download_button(
-                                    label=f"📥 Download Excel File ({sheet_info})",
-                                    data=output,
-                                    file_name=filename,
-                                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                                    type="primary"
-                                )
-                            
-                            else:  # CSV
-                                if merge_option and len(cleaned_tables) > 1:
-                                    # Gabungkan dan download sebagai satu CSV
-                                    merged_df = pd.concat(cleaned_tables, ignore_index=True)
-                                    csv_data = merged_df.to_csv(index=False).encode('utf-8')
-                                    
-                                    st.download_button(
-                                        label="📥 Download Semua Data sebagai CSV",
-                                        data=csv_data,
-                                        file_name=f"{filename_base}_all_tables.csv",
-                                        mime="text/csv",
-                                        type="primary"
-                                    )
-                                else:
-                                    # Download per tabel
-                                    for i, table_df in enumerate(cleaned_tables):
-                                        csv_data = table_df.to_csv(index=False).encode('utf-8')
-                                        halaman = table_df.iloc[0]['PDF_Halaman'] if 'PDF_Halaman' in table_df.columns else i+1
-                                        
-                                        st.download_button(
-                                            label=f"📥 Download Tabel {i+1} (Halaman {halaman})",
-                                            data=csv_data,
-                                            file_name=f"{filename_base}_halaman_{halaman}_tabel_{i+1}.csv",
-                                            mime="text/csv"
-                                        )
-                            
-                            # Statistik konversi
-                            st.info(f"""
-                            **📋 Statistik Konversi:**
-                            - Halaman diproses: {len(st.session_state['selected_pages'])}
-                            - Total tabel: {len(cleaned_tables)}
-                            - Total baris: {sum(len(df) for df in cleaned_tables):,}
-                            - Total kolom: {sum(len(df.columns) for df in cleaned_tables):,}
-                            - Metode: {extraction_method}
-                            """)
-                    
-                    except Exception as e:
-                        st.error(f"❌ Error saat konversi: {str(e)}")
-                        with st.expander("Detail Error"):
-                            st.exception(e)
+                previous_job = st.session_state.get('convert_job')
+                if previous_job is not None:
+                    job_manager.cancel(previous_job['job_id'])
+                
+                job_id = job_manager.submit(
+                    session_owner,
+                    run_conversion_job,
+                    uploaded_file.getvalue(),
+                    list(st.session_state['selected_pages']),
+                    extraction_method,
+                    (table_store if extraction_method == METHOD_PDFPLUMBER
+                     else table_stores[METHOD_SETTINGS_KEYS[extraction_method]]).snapshot(),
+                    # Total proses semua job yang berjalan tidak melebihi jumlah CPU
+                    min(parallel_workers, job_manager.process_budget),
+                    clean_options={
+                        'clean_columns': clean_columns,
+                        'remove_empty': remove_empty_columns,
+                        'fill_na': fill_na_values
+                    },
+                    stitch=stitch_tables,
+                    infer_types=infer_types,
+                    profiler=create_profiler('convert', document_id),
+                    stream_output=stream_output,
+                    memory_limit_mb=memory_limit_mb,
+                    table_settings=table_settings,
+                    ocr=use_ocr,
+                    conversion_cache=None if low_memory else get_conversion_cache(),
+                    description=f"{uploaded_file.name} ({len(st.session_state['selected_pages'])} halaman)"
+                )
+                st.session_state['convert_job'] = {'job_id': job_id, 'document_id': document_id}
+            
+            convert_job = st.session_state.get('convert_job')
+            if convert_job is not None and convert_job['document_id'] == document_id:
+                job = job_manager.get(convert_job['job_id'])
+                filename_base = uploaded_file.name.replace('.pdf', '').replace('.PDF', '')
+                
+                if job is None:
+                    st.info("ℹ️ Hasil konversi sebelumnya sudah dihapus dari server. Jalankan konversi lagi.")
+                elif not job.finished:
+                    render_job_progress(job.job_id)
+                elif job.status == JOB_DONE:
+                    render_conversion_result(job, filename_base)
+                elif job.status == JOB_CANCELLED:
+                    st.warning("⏹️ Konversi dibatalkan")
+                else:
+                    st.error(f"❌ Error saat konversi: {job.error}")
+                    with st.expander("Detail Error"):
+                        st.code(job.error_traceback)
 
 else:
     # Tampilkan petunjuk penggunaan
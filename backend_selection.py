@@ -0,0 +1,63 @@
+from typing import List, Dict
+
+# Nama backend (sama dengan nilai 'backend' di catatan profiler)
+BACKEND_PDFPLUMBER = "pdfplumber"
+BACKEND_TABULA = "tabula"
+BACKEND_PYPDF2 = "PyPDF2"
+
+# Minimal operator garis/kotak (re, l) agar halaman dianggap punya tabel bergaris
+MIN_RULE_OPS = 6
+# Mulai jumlah operator path ini halaman dianggap gambar vektor padat (pdfplumber lambat)
+DENSE_PATH_OPS = 3000
+# Skor kualitas minimal; di bawahnya backend berikutnya dicoba
+MIN_QUALITY = 0.5
+
+
+# Fungsi untuk menilai kualitas tabel mentah satu halaman
+def table_quality(tables: List[List[List]]) -> float:
+    """
+    Skor 0-1: rasio sel terisi (fill_ratio seperti di deteksi) dari tabel dengan
+    minimal 2 baris dan 2 kolom, dibobot jumlah sel. 0 jika tidak ada tabel seperti itu.
+    Tabel yang salah dipotong (kolom/baris hantu) punya banyak sel kosong sehingga skornya rendah.
+    """
+    filled_cells = 0
+    total_cells = 0
+    for table in tables:
+        num_rows = len(table)
+        num_cols = max((len(row) for row in table), default=0)
+        if num_rows < 2 or num_cols < 2:
+            continue
+        filled_cells += sum(1 for row in table for cell in row if cell and str(cell).strip())
+        total_cells += num_rows * num_cols
+    return filled_cells / total_cells if total_cells else 0.0
+
+
+# Fungsi untuk menentukan urutan backend yang dicoba untuk satu halaman
+def plan_backends(features: Dict) -> List[str]:
+    """
+    features: hasil text_layout.content_features (hanya hitungan operator, murah).
+    Backend tercepat yang kemungkinan berhasil didahulukan:
+    - tanpa teks: tidak ada backend (halaman tidak punya tabel teks)
+    - gambar vektor padat: tabula (lattice kuat, pdfplumber lambat), lalu PyPDF2
+    - ada garis tabel: pdfplumber, lalu tabula
+    - tanpa garis: PyPDF2 (posisi teks, paling cepat), lalu tabula (mode stream)
+    """
+    if features["text_ops"] == 0:
+        return []
+    if features["path_ops"] >= DENSE_PATH_OPS:
+        return [BACKEND_TABULA, BACKEND_PYPDF2]
+    if features["rule_ops"] >= MIN_RULE_OPS:
+        return [BACKEND_PDFPLUMBER, BACKEND_TABULA]
+    return [BACKEND_PYPDF2, BACKEND_TABULA]
+
+
+# Fungsi untuk memutuskan apakah backend berikutnya perlu dicoba
+def should_fall_back(score: float, features: Dict) -> bool:
+    """
+    Fallback hanya jika skor di bawah MIN_QUALITY dan halaman memang tampak
+    punya tabel: ada tabel yang kualitasnya rendah, atau ada garis tabel.
+    Halaman teks biasa tanpa tabel tidak memicu backend yang lebih mahal.
+    """
+    if score >= MIN_QUALITY:
+        return False
+    return score > 0 or features["rule_ops"] >= MIN_RULE_OPS
@@ -0,0 +1,207 @@
+"""
+Benchmark tahap-tahap konversi memakai PDF sintetis (dibuat offline).
+
+Mengukur waktu dan puncak memori (tracemalloc) untuk:
+deteksi, ekstraksi per backend, clean_dataframe, dan ekspor Excel/CSV/Parquet.
+
+Contoh:
+    python benchmarks/run_benchmarks.py --suite quick -o hasil.json
+    python benchmarks/run_benchmarks.py --suite full -o baru.json --compare hasil.json
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+import tracemalloc
+from io import BytesIO, StringIO
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+import pdfplumber
+import pyarrow
+
+from converter import (
+    METHOD_PDFPLUMBER,
+    METHOD_AUTO,
+    METHOD_TABULA,
+    METHOD_PYPDF2,
+    detect_tables_in_pdf,
+    extract_tables_from_pages,
+    clean_dataframe,
+    iter_page_tables,
+)
+from exporters import write_excel, write_excel_streaming, write_csv, write_parquet
+from synthetic_pdf import build_pdf, mixed_page_kinds
+
+# Kasus benchmark: jumlah halaman, jenis tabel, rasio halaman bertabel, kepadatan (baris x kolom)
+SUITES = {
+    "quick": [
+        {"name": "ruled_10p_sparse", "pages": 10, "ruled": True, "table_ratio": 1.0, "rows": 15, "cols": 4},
+        {"name": "unruled_10p_sparse", "pages": 10, "ruled": False, "table_ratio": 1.0, "rows": 15, "cols": 4},
+        {"name": "mixed_20p_dense", "pages": 20, "ruled": True, "table_ratio": 0.3, "rows": 50, "cols": 8},
+    ],
+    "full": [
+        {"name": "ruled_50p_sparse", "pages": 50, "ruled": True, "table_ratio": 1.0, "rows": 15, "cols": 4},
+        {"name": "ruled_50p_dense", "pages": 50, "ruled": True, "table_ratio": 1.0, "rows": 50, "cols": 10},
+        {"name": "unruled_50p_dense", "pages": 50, "ruled": False, "table_ratio": 1.0, "rows": 50, "cols": 10},
+        {"name": "mixed_200p_dense", "pages": 200, "ruled": True, "table_ratio": 0.3, "rows": 50, "cols": 8},
+    ],
+}
+
+BACKENDS = {
+    "pdfplumber": METHOD_PDFPLUMBER,
+    "auto": METHOD_AUTO,
+    "tabula": METHOD_TABULA,
+    "pypdf2": METHOD_PYPDF2,
+}
+
+
+def measure(func: Callable, repeat: int) -> Dict:
+    """
+    Menjalankan func beberapa kali untuk waktu (tanpa tracemalloc),
+    lalu sekali lagi dengan tracemalloc untuk puncak memori
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds_min": min(timings),
+        "seconds_median": statistics.median(timings),
+        "peak_mb": peak / (1024 * 1024),
+    }
+
+
+def raw_dataframes(pdf_bytes: bytes) -> List[pd.DataFrame]:
+    """
+    DataFrame mentah (belum dibersihkan) dari semua tabel, sebagai input benchmark clean_dataframe
+    """
+    with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
+        pages = range(1, len(pdf.pages) + 1)
+    frames = []
+    for _, tables, _ in iter_page_tables(BytesIO(pdf_bytes), pages):
+        for table in tables:
+            if len(table) > 1:
+                frames.append(pd.DataFrame(table[1:], columns=table[0]))
+    return frames
+
+
+def run_case(case: Dict, repeat: int, backends: List[str]) -> List[Dict]:
+    kinds = mixed_page_kinds(case["pages"], case["table_ratio"], case["ruled"])
+    pdf_bytes = build_pdf(kinds, rows=case["rows"], cols=case["cols"])
+    all_pages = list(range(1, case["pages"] + 1))
+    results = []
+
+    def record(stage: str, func: Callable):
+        result = {"case": case["name"], "pages": case["pages"], "stage": stage}
+        try:
+            result.update(measure(func, repeat))
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        results.append(result)
+        status = result.get("error") or f"{result['seconds_median']:.3f} dtk, {result['peak_mb']:.1f} MB"
+        print(f"  {stage:<24} {status}")
+
+    print(f"[{case['name']}] {case['pages']} halaman, {case['rows']}x{case['cols']}")
+
+    record("detect", lambda: detect_tables_in_pdf(BytesIO(pdf_bytes), 3))
+    for backend in backends:
+        record(f"extract_{backend}",
+               lambda method=BACKENDS[backend]: extract_tables_from_pages(BytesIO(pdf_bytes), all_pages, method))
+
+    frames = raw_dataframes(pdf_bytes)
+    record("clean_dataframe", lambda: [clean_dataframe(df) for df in frames])
+
+    tables = extract_tables_from_pages(BytesIO(pdf_bytes), all_pages, METHOD_PDFPLUMBER)
+    if tables:
+        record("export_excel", lambda: write_excel(tables, BytesIO(), merge=True))
+
+        def export_excel_streaming():
+            tmp_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".bench_tmp.xlsx")
+            try:
+                write_excel_streaming(tables, tmp_path, merge=True)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+
+        record("export_excel_streaming", export_excel_streaming)
+        record("export_csv", lambda: write_csv(tables, StringIO()))
+        record("export_parquet", lambda: write_parquet(tables, BytesIO()))
+
+    return results
+
+
+def compare(results: List[Dict], baseline_path: str, tolerance: float) -> int:
+    """
+    Membandingkan hasil dengan file baseline. Returns: jumlah tahap yang melambat
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(r["case"], r["stage"]): r for r in json.load(f)["results"] if "error" not in r}
+
+    regressions = 0
+    print(f"\nPerbandingan dengan {baseline_path} (batas {tolerance:.2f}x):")
+    for result in results:
+        old = baseline.get((result["case"], result["stage"]))
+        if old is None or "error" in result:
+            continue
+        ratio = result["seconds_median"] / old["seconds_median"] if old["seconds_median"] > 0 else 1.0
+        flag = "LAMBAT" if ratio > tolerance else ""
+        regressions += bool(flag)
+        print(f"  {result['case']:<22} {result['stage']:<24} {ratio:6.2f}x  "
+              f"mem {result['peak_mb']:.1f}/{old['peak_mb']:.1f} MB {flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark deteksi, ekstraksi, pembersihan dan ekspor")
+    parser.add_argument("--suite", choices=list(SUITES), default="quick")
+    parser.add_argument("--repeat", type=int, default=3, help="Jumlah pengulangan untuk pengukuran waktu")
+    parser.add_argument("--backends", nargs="+", choices=list(BACKENDS), default=list(BACKENDS))
+    parser.add_argument("-o", "--output", default="bench_output.json", help="File JSON hasil benchmark")
+    parser.add_argument("--compare", default=None, help="File JSON baseline untuk dibandingkan")
+    parser.add_argument("--tolerance", type=float, default=1.2, help="Rasio waktu yang dianggap melambat")
+    args = parser.parse_args(argv)
+
+    results = []
+    for case in SUITES[args.suite]:
+        results.extend(run_case(case, args.repeat, args.backends))
+
+    report = {
+        "meta": {
+            "suite": args.suite,
+            "repeat": args.repeat,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pandas": pd.__version__,
+            "pdfplumber": pdfplumber.__version__,
+            "pyarrow": pyarrow.__version__,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nHasil disimpan di {args.output}")
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.tolerance) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Generator PDF sintetis tanpa dependensi tambahan, untuk benchmark.
+
+Setiap halaman berisi salah satu dari:
+- "ruled"   : tabel dengan garis (grid penuh)
+- "unruled" : tabel tanpa garis (kolom teks rata)
+- "prose"   : paragraf teks biasa (tanpa tabel)
+"""
+import random
+from typing import List, Sequence
+
+PAGE_WIDTH = 595   # A4 dalam point
+PAGE_HEIGHT = 842
+MARGIN = 40
+FONT_SIZE = 8
+
+WORDS = ["saldo", "transfer", "debit", "kredit", "biaya", "bunga", "setoran", "tarik", "tunai",
+         "rekening", "pajak", "admin", "pembayaran", "tagihan", "giro", "valas", "kliring"]
+
+
+def escape_text(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _cell_text(rng: random.Random, col: int, row: int) -> str:
+    if col == 0:
+        return f"{(row % 28) + 1:02d}/{(row % 12) + 1:02d}/2024"
+    if col == 1:
+        return f"{rng.choice(WORDS)} {rng.choice(WORDS)}"
+    value = rng.randint(1000, 99999999)
+    return f"{value:,}".replace(",", ".") + f",{rng.randint(0, 99):02d}"
+
+
+def _table_page(rng: random.Random, rows: int, cols: int, ruled: bool) -> str:
+    row_height = FONT_SIZE + 6
+    rows = min(rows, int((PAGE_HEIGHT - 2 * MARGIN) / row_height) - 1)
+    col_width = (PAGE_WIDTH - 2 * MARGIN) / cols
+    top = PAGE_HEIGHT - MARGIN
+    ops = []
+
+    for r in range(rows + 1):
+        y = top - (r + 1) * row_height + 4
+        for c in range(cols):
+            text = f"Kolom {c + 1}" if r == 0 else _cell_text(rng, c, r)
+            ops.append(f"BT /F1 {FONT_SIZE} Tf {MARGIN + c * col_width + 3:.1f} {y:.1f} Td ({escape_text(text)}) Tj ET")
+
+    if ruled:
+        bottom = top - (rows + 1) * row_height
+        for r in range(rows + 2):
+            y = top - r * row_height
+            ops.append(f"{MARGIN} {y:.1f} m {PAGE_WIDTH - MARGIN} {y:.1f} l S")
+        for c in range(cols + 1):
+            x = MARGIN + c * col_width
+            ops.append(f"{x:.1f} {top} m {x:.1f} {bottom:.1f} l S")
+
+    return "\n".join(ops)
+
+
+def _prose_page(rng: random.Random) -> str:
+    ops = []
+    y = PAGE_HEIGHT - MARGIN
+    while y > MARGIN:
+        line = " ".join(rng.choice(WORDS) for _ in range(14))
+        ops.append(f"BT /F1 {FONT_SIZE + 2} Tf {MARGIN} {y:.1f} Td ({escape_text(line)}) Tj ET")
+        y -= FONT_SIZE + 6
+    return "\n".join(ops)
+
+
+def build_pdf(page_kinds: List[str], rows: int = 30, cols: int = 5, seed: int = 0) -> bytes:
+    """
+    Membuat PDF dengan satu halaman per elemen page_kinds
+    ("ruled", "unruled" atau "prose"). Returns: isi file PDF
+    """
+    rng = random.Random(seed)
+    contents = []
+    for kind in page_kinds:
+        if kind == "prose":
+            contents.append(_prose_page(rng))
+        else:
+            contents.append(_table_page(rng, rows, cols, ruled=(kind == "ruled")))
+
+    return write_pdf(contents)
+
+
+def write_pdf(contents: List[str], fonts: Sequence[str] = ("Helvetica",)) -> bytes:
+    """
+    Menyusun file PDF dari content stream per halaman.
+    fonts: nama font standar (Type1) yang tersedia sebagai /F1, /F2, ... di setiap halaman.
+    Returns: isi file PDF
+    """
+    # Objek: 1 catalog, 2 pages, lalu font, lalu (page, content) per halaman
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+    ]
+    font_refs = []
+    for i, font in enumerate(fonts, start=1):
+        objects.append(f"<< /Type /Font /Subtype /Type1 /BaseFont /{font} >>")
+        font_refs.append(f"/F{i} {len(objects)} 0 R")
+
+    page_refs = []
+    for content in contents:
+        page_id = len(objects) + 1
+        content_id = page_id + 1
+        page_refs.append(f"{page_id} 0 R")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+                       f"/Resources << /Font << {' '.join(font_refs)} >> >> /Contents {content_id} 0 R >>")
+        data = content.encode("latin-1")
+        objects.append(f"<< /Length {len(data)} >>\nstream\n{content}\nendstream")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(page_refs)}] /Count {len(page_refs)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+
+    xref_offset = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode("latin-1")
+    return bytes(out)
+
+
+def mixed_page_kinds(num_pages: int, table_ratio: float = 0.3, ruled: bool = True, seed: int = 0) -> List[str]:
+    """
+    Daftar jenis halaman campuran: sekitar table_ratio halaman berisi tabel, sisanya prosa
+    """
+    rng = random.Random(seed)
+    table_kind = "ruled" if ruled else "unruled"
+    return [table_kind if rng.random() < table_ratio else "prose" for _ in range(num_pages)]
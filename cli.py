@@ -0,0 +1,323 @@
+"""
+Konversi PDF ke Excel/CSV/Parquet/Arrow tanpa Streamlit, untuk batch banyak file.
+
+Contoh:
+    python cli.py laporan/ -o hasil/ -f xlsx -j 8
+    python cli.py "statements/2024-*.pdf" -o hasil/ -f parquet --pages all
+"""
+import os
+import sys
+import glob
+import time
+import argparse
+import multiprocessing
+from io import BytesIO
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Optional
+
+from table_cache import TableDiskCache, DEFAULT_CACHE_DIR
+from page_analysis import TABLE_SETTINGS_PRESETS, PRESET_DEFAULT, PRESET_LABELS
+from ocr import find_scanned_pages
+from converter import (
+    METHOD_PDFPLUMBER,
+    METHOD_AUTO,
+    METHOD_TABULA,
+    METHOD_PYPDF2,
+    METHOD_SETTINGS_KEYS,
+    OCR_METHODS,
+    TableStore,
+    get_document_id,
+    get_total_pages,
+    detect_tables_in_pdf,
+    extract_tables_from_pages,
+    iter_extracted_tables,
+    pdfplumber_settings_key,
+)
+from exporters import (
+    write_excel_streaming,
+    write_csv,
+    write_csv_zip,
+    write_parquet,
+    write_arrow,
+    write_tables_streaming,
+)
+from profiling import StageProfiler, NULL_PROFILER, STAGE_SERIALIZATION
+from memory_guard import MemoryGuard, DEFAULT_MEMORY_LIMIT_MB
+
+METHODS = {
+    "pdfplumber": METHOD_PDFPLUMBER,
+    "auto": METHOD_AUTO,
+    "tabula": METHOD_TABULA,
+    "pypdf2": METHOD_PYPDF2,
+}
+OUTPUT_FORMATS = ["xlsx", "csv", "zip", "parquet", "arrows"]
+
+
+# Fungsi untuk mengumpulkan file PDF dari direktori atau pola glob
+def collect_inputs(inputs: List[str]) -> List[str]:
+    pdf_paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            candidates = glob.glob(os.path.join(item, "*.pdf")) + glob.glob(os.path.join(item, "*.PDF"))
+        else:
+            candidates = glob.glob(item, recursive=True)
+        pdf_paths.extend(path for path in sorted(candidates) if os.path.isfile(path))
+
+    # Hapus duplikat dengan tetap menjaga urutan
+    return list(dict.fromkeys(pdf_paths))
+
+
+# Fungsi untuk menentukan nama file output setiap PDF agar tidak saling menimpa
+def output_names(pdf_paths: List[str]) -> Dict[str, str]:
+    """
+    Returns: {path_pdf: nama output tanpa ekstensi, relatif terhadap direktori output}
+    Nama file PDF dipakai jika unik. Jika sama (mis. a/report.pdf dan b/report.pdf),
+    struktur direktori relatif terhadap direktori induk bersama ikut ditiru
+    (a/report, b/report); jika masih sama, diberi akhiran _2, _3, ...
+    """
+    bases = {path: os.path.splitext(os.path.basename(path))[0] for path in pdf_paths}
+    counts = Counter(base.lower() for base in bases.values())
+    try:
+        common_dir = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in pdf_paths])
+    except ValueError:  # Drive berbeda (Windows)
+        common_dir = None
+
+    names = {}
+    used = set()
+    for path in pdf_paths:
+        name = bases[path]
+        if counts[name.lower()] > 1 and common_dir is not None:
+            name = os.path.splitext(os.path.relpath(os.path.abspath(path), common_dir))[0]
+        candidate = name
+        suffix = 2
+        while candidate.lower() in used:
+            candidate = f"{name}_{suffix}"
+            suffix += 1
+        used.add(candidate.lower())
+        names[path] = candidate
+    return names
+
+
+# Fungsi untuk mengkonversi satu file PDF (dijalankan di proses worker)
+def convert_file(pdf_path: str, output_dir: str, output_format: str, method: str,
+                 all_pages: bool, threshold: int, merge: bool, cache_dir: Optional[str],
+                 profile: bool = False, stitch: bool = True, infer_types: bool = False,
+                 low_memory: bool = False, memory_limit_mb: float = 0,
+                 table_settings: Optional[Dict] = None, ocr: bool = False,
+                 output_name: Optional[str] = None) -> Dict:
+    """
+    output_name: nama output tanpa ekstensi, relatif terhadap output_dir (lihat
+    output_names); default nama file PDF
+    ocr: hanya berlaku untuk metode di OCR_METHODS
+    Returns: ringkasan; 'pages' jumlah halaman dokumen (semua dianalisis, oleh
+    deteksi atau karena semua halaman dipilih), 'pages_extracted' jumlah halaman
+    yang tabelnya diekstrak
+    """
+    start = time.perf_counter()
+    ocr = ocr and method in OCR_METHODS
+    # Log JSON per tahap/halaman ditulis ke stderr oleh proses worker
+    profiler = StageProfiler(log_json=True, context={"file": pdf_path}) if profile else NULL_PROFILER
+
+    with open(pdf_path, "rb") as f:
+        pdf_file = BytesIO(f.read())
+
+    document_id = get_document_id(pdf_file)
+    disk_cache = TableDiskCache(cache_dir) if cache_dir else None
+    # Deteksi dan konversi pdfplumber memakai table_settings yang sama (satu store per hash pengaturan)
+    detect_store = TableStore(document_id, pdfplumber_settings_key(table_settings), disk_cache=disk_cache)
+    if method != METHOD_PDFPLUMBER:
+        extract_store = TableStore(document_id, METHOD_SETTINGS_KEYS[method], disk_cache=disk_cache)
+    else:
+        extract_store = detect_store
+    memory_guard = MemoryGuard(memory_limit_mb) if low_memory else None
+    backends: Dict[str, int] = {}  # Jumlah halaman per backend (metode auto)
+    
+    def count_backend(report):
+        name = "cache" if report["cached"] else (report["backend"] or "-")
+        backends[name] = backends.get(name, 0) + 1
+
+    total_pages = get_total_pages(pdf_file, detect_store)
+    if all_pages:
+        pages = list(range(1, total_pages + 1))
+    else:
+        pages = sorted(detect_tables_in_pdf(pdf_file, threshold, detect_store, profiler=profiler,
+                                            table_settings=table_settings,
+                                            low_memory=low_memory, memory_guard=memory_guard))
+        if ocr:
+            # Halaman scan tidak punya tabel terdeteksi, tetapi tetap dibaca dengan OCR
+            pages = sorted(set(pages) | set(find_scanned_pages(pdf_file, range(1, total_pages + 1))))
+
+    filename_base = output_name or os.path.splitext(os.path.basename(pdf_path))[0]
+    if low_memory:
+        # Tabel ditulis langsung ke file output saat dihasilkan
+        output_path = os.path.join(output_dir, f"{filename_base}.{output_format}")
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        summary = {"tables": 0, "rows": 0}
+        if pages:
+            tables = iter_extracted_tables(pdf_file, pages, method, extract_store, profiler=profiler,
+                                           stitch=stitch, infer_types=infer_types, low_memory=True,
+                                           memory_guard=memory_guard, backend_callback=count_backend,
+                                           table_settings=table_settings, ocr=ocr)
+            try:
+                summary = write_tables_streaming(tables, output_path, output_format, merge=merge)
+            except BaseException:
+                if os.path.exists(output_path):
+                    os.unlink(output_path)
+                raise
+        if not summary["tables"]:
+            if os.path.exists(output_path):
+                os.unlink(output_path)
+            output_path = None
+        return {
+            "file": pdf_path,
+            "output": output_path,
+            "pages": total_pages,
+            "pages_extracted": len(pages),
+            "tables": summary["tables"],
+            "rows": summary["rows"],
+            "backends": backends,
+            "seconds": time.perf_counter() - start,
+        }
+
+    if pages:
+        tables = extract_tables_from_pages(pdf_file, pages, method, extract_store, profiler=profiler,
+                                           stitch=stitch, infer_types=infer_types,
+                                           backend_callback=count_backend, table_settings=table_settings,
+                                           ocr=ocr)
+    else:
+        tables = []
+
+    output_path = None
+    if tables:
+        output_path = os.path.join(output_dir, f"{filename_base}.{output_format}")
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with profiler.stage(STAGE_SERIALIZATION, format=output_format):
+            if output_format == "xlsx":
+                write_excel_streaming(tables, output_path, merge=merge)
+            elif output_format == "csv":
+                write_csv(tables, output_path)
+            elif output_format == "zip":
+                write_csv_zip(tables, output_path)
+            elif output_format == "parquet":
+                write_parquet(tables, output_path)
+            else:
+                write_arrow(tables, output_path)
+
+    return {
+        "file": pdf_path,
+        "output": output_path,
+        "pages": total_pages,
+        "pages_extracted": len(pages),
+        "tables": len(tables),
+        "rows": sum(len(df) for df in tables),
+        "backends": backends,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Konversi tabel dari banyak file PDF ke Excel/CSV/Parquet/Arrow")
+    parser.add_argument("inputs", nargs="+", help="Direktori atau pola glob file PDF")
+    parser.add_argument("-o", "--output-dir", default=".", help="Direktori output (default: direktori saat ini)")
+    parser.add_argument("-f", "--format", choices=OUTPUT_FORMATS, default="xlsx",
+                        help="Format output ('zip': satu CSV per tabel dalam arsip ZIP dengan manifest.json)")
+    parser.add_argument("-m", "--method", choices=list(METHODS), default="pdfplumber", help="Metode ekstraksi")
+    parser.add_argument("--preset", choices=list(TABLE_SETTINGS_PRESETS), default=PRESET_DEFAULT,
+                        help="Preset table finder pdfplumber untuk deteksi dan konversi: "
+                             + ", ".join(f"'{key}' = {label}" for key, label in PRESET_LABELS.items()))
+    parser.add_argument("--pages", choices=["detect", "all"], default="detect",
+                        help="'detect': hanya halaman dengan tabel terdeteksi, 'all': semua halaman")
+    parser.add_argument("-t", "--threshold", type=int, default=3, help="Sensitivitas deteksi tabel (1-10)")
+    parser.add_argument("--merge", action="store_true", help="Gabungkan semua tabel dalam satu sheet Excel")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Jumlah file yang diproses bersamaan")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Direktori cache tabel (default: cache bawaan aplikasi)")
+    parser.add_argument("--no-cache", action="store_true", help="Jangan pakai cache tabel di disk")
+    parser.add_argument("--no-stitch", action="store_true",
+                        help="Jangan sambung tabel yang berlanjut ke halaman berikutnya")
+    parser.add_argument("--infer-types", action="store_true",
+                        help="Simpan kolom angka (format 1.234,56) dan tanggal dd/mm/yyyy sebagai angka/tanggal")
+    parser.add_argument("--low-memory", action="store_true",
+                        help="Mode hemat memori untuk PDF besar: layout halaman langsung dilepas dan "
+                             "tabel ditulis ke file output satu per satu")
+    parser.add_argument("--memory-limit", type=int, default=DEFAULT_MEMORY_LIMIT_MB, metavar="MB",
+                        help="Batas RSS per proses (MB) pada mode hemat memori; 0 = tanpa batas")
+    parser.add_argument("--ocr", action="store_true",
+                        help="Baca halaman hasil scan dengan Tesseract (butuh pytesseract dan program tesseract; "
+                             "bahasa dari variabel lingkungan PDF2EXCEL_OCR_LANG, default ind+eng)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Tulis waktu per tahap dan per halaman sebagai log JSON ke stderr")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    pdf_paths = collect_inputs(args.inputs)
+    if not pdf_paths:
+        print("Tidak ada file PDF yang ditemukan.", file=sys.stderr)
+        return 1
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    if args.no_cache:
+        cache_dir = None
+    else:
+        cache_dir = args.cache_dir or DEFAULT_CACHE_DIR
+
+    results = []
+    failures = []
+    start = time.perf_counter()
+
+    # File dengan nama sama dari direktori berbeda tidak boleh saling menimpa
+    names = output_names(pdf_paths)
+
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs),
+                             mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = {
+            executor.submit(
+                convert_file, pdf_path, args.output_dir, args.format, METHODS[args.method],
+                args.pages == "all", args.threshold, args.merge, cache_dir, args.profile,
+                not args.no_stitch, args.infer_types, args.low_memory, args.memory_limit,
+                TABLE_SETTINGS_PRESETS[args.preset], args.ocr, names[pdf_path]
+            ): pdf_path
+            for pdf_path in pdf_paths
+        }
+        for future in as_completed(futures):
+            pdf_path = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                failures.append((pdf_path, str(e)))
+                print(f"GAGAL  {pdf_path}: {e}", file=sys.stderr)
+                continue
+
+            results.append(result)
+            status = "OK    " if result["output"] else "KOSONG"
+            print(f"{status} {pdf_path}: {result['pages']} halaman, {result['tables']} tabel, "
+                  f"{result['rows']} baris ({result['seconds']:.1f} dtk)")
+            if result["backends"]:
+                print("       backend: " + ", ".join(f"{name} {count} halaman"
+                                                    for name, count in sorted(result["backends"].items())))
+
+    elapsed = time.perf_counter() - start
+    # Deteksi menganalisis setiap halaman, jadi kecepatan dihitung dari semua halaman dokumen
+    total_pages = sum(r["pages"] for r in results)
+    extracted_pages = sum(r["pages_extracted"] for r in results)
+
+    print("\nRingkasan:")
+    print(f"- File berhasil: {len(results)} dari {len(pdf_paths)}")
+    print(f"- Total halaman: {total_pages:,} ({extracted_pages:,} diekstrak)")
+    print(f"- Total tabel: {sum(r['tables'] for r in results):,}")
+    print(f"- Waktu: {elapsed:.1f} detik ({total_pages / elapsed if elapsed > 0 else 0:.1f} halaman/detik)")
+    if failures:
+        print(f"- Gagal: {len(failures)}")
+        for pdf_path, error in failures:
+            print(f"  - {pdf_path}: {error}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+import re
+
+import pandas as pd
+
+
+# Fungsi untuk membersihkan nama kolom
+def clean_column_names(columns):
+    cleaned_columns = []
+    seen = {}
+    
+    for i, col in enumerate(columns):
+        if col is None or pd.isna(col):
+            # Untuk kolom None, beri nama generic
+            base_name = f"Column_{i+1}"
+            col_name = base_name
+            counter = 1
+            while col_name in seen:
+                col_name = f"{base_name}_{counter}"
+                counter += 1
+        else:
+            # Bersihkan string
+            col_str = str(col).strip()
+            # Hapus karakter khusus
+            col_str = re.sub(r'[^\w\s]', '_', col_str)
+            # Ganti spasi dengan underscore
+            col_str = re.sub(r'\s+', '_', col_str)
+            # Hapus underscore berlebih di awal/akhir
+            col_str = col_str.strip('_')
+            # Pastikan tidak kosong
+            if not col_str:
+                col_str = f"Column_{i+1}"
+            
+            col_name = col_str
+            counter = 1
+            original_name = col_name
+            while col_name in seen:
+                col_name = f"{original_name}_{counter}"
+                counter += 1
+        
+        cleaned_columns.append(col_name)
+        seen[col_name] = True
+    
+    return cleaned_columns
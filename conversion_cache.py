@@ -0,0 +1,125 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+DEFAULT_MAX_BYTES = int(os.environ.get("PDF2EXCEL_CONVERSION_CACHE_MB", "256")) * 1024 * 1024
+
+# Jenis entri (langkah konversi setelah tabel mentah per halaman di TableStore)
+ENTRY_TABLE = "table"    # DataFrame bersih satu tabel logis
+ENTRY_OUTPUT = "output"  # File hasil serialisasi
+
+
+# Fungsi untuk membuat kunci opsi yang mempengaruhi hasil pembersihan tabel
+def options_key(clean_options: Optional[Dict] = None, stitch: bool = False, infer_types: bool = False,
+                ocr_settings: Optional[str] = None) -> str:
+    """
+    ocr_settings: ocr.OCR_SETTINGS_KEY (bahasa dan resolusi) jika OCR aktif, None jika tidak
+    """
+    payload = json.dumps({
+        "clean": clean_options or {},
+        "stitch": stitch,
+        "infer_types": infer_types,
+        "ocr": ocr_settings,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+# Fungsi untuk membuat hash isi sel tabel mentah (tabel logis hasil stitch_tables)
+def rows_digest(rows: List[List]) -> str:
+    payload = json.dumps(rows, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+# Fungsi untuk membuat tanda tangan satu konversi (menentukan isi file output)
+def conversion_signature(document_id: str, settings_key: str, pages: List[int], options: str) -> str:
+    payload = json.dumps([document_id, settings_key, list(pages), options])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+# Fungsi untuk mengecek apakah hasil konversi lengkap (boleh disimpan sebagai file output di cache)
+def conversion_complete(warnings: List[str], backend_report: Optional[List[Dict]] = None) -> bool:
+    """
+    Konversi yang kehilangan halaman karena gangguan sementara (OCR gagal, tabel gagal
+    diproses, backend gagal lalu diganti backend lain) tidak lengkap: file outputnya
+    tidak boleh dipakai ulang oleh konversi berikutnya dengan tanda tangan yang sama.
+    warnings: peringatan job; backend_report: laporan per halaman metode auto
+    """
+    if warnings:
+        return False
+    return not any(attempt.get('error') for entry in backend_report or [] for attempt in entry.get('attempts', []))
+
+
+# Fungsi untuk memperkirakan ukuran entri cache di memori (byte)
+def _entry_size(value) -> int:
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, tuple):
+        value = value[0]  # (isi_file, info)
+    return len(value) if isinstance(value, (bytes, bytearray)) else 0
+
+
+class ConversionCache:
+    """
+    Cache langkah konversi setelah tabel mentah per halaman (TableStore):
+    tabel mentah -> tabel bersih per set opsi -> file output.
+    - tabel bersih: kunci (dokumen, pengaturan ekstraksi, opsi, grup tabel), sehingga
+      menambah halaman hanya membersihkan tabel halaman baru, dan mengubah opsi
+      pembersihan hanya mengulang pembersihan (tabel mentah diambil dari TableStore)
+    - file output: kunci (conversion_signature, format/opsi output)
+    Satu LRU untuk keduanya dengan batas ukuran total; aman dipakai dari beberapa
+    thread job konversi. DataFrame disimpan dan dikembalikan sebagai salinan,
+    sehingga mengubah tabel hasil konversi tidak mengubah isi cache.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: "OrderedDict[Tuple, Tuple[object, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def table_key(document_id: str, settings_key: str, options: str, group: Dict) -> Tuple:
+        """
+        group: hasil table_stitching.stitch_tables. Tabel logis dikenali dari potongan
+        pertamanya, halaman yang dicakup (berubah jika halaman lanjutan ikut/tidak dipilih)
+        dan hash isi selnya (berubah jika tabel mentah diekstrak ulang dengan hasil lain).
+        """
+        return (ENTRY_TABLE, document_id, settings_key, options,
+                group["page"], group["index"], tuple(group["pages"]), rows_digest(group["rows"]))
+
+    @staticmethod
+    def output_key(signature: str, output_options: Tuple) -> Tuple:
+        return (ENTRY_OUTPUT, signature) + tuple(output_options)
+
+    def get(self, key: Tuple):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            value = entry[0]
+        return value.copy() if isinstance(value, pd.DataFrame) else value
+
+    def put(self, key: Tuple, value):
+        if isinstance(value, pd.DataFrame):
+            value = value.copy()
+        size = _entry_size(value)
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._entries.pop(key)[1]
+            # Entri yang lebih besar dari seluruh batas tidak disimpan
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+
+    def __len__(self) -> int:
+        return len(self._entries)
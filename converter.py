@@ -0,0 +1,926 @@
+import os
+import time
+import json
+import hashlib
+import logging
+import tempfile
+from typing import List, Dict, Tuple, Optional, Iterator, Callable
+
+import numpy as np
+import pandas as pd
+import pdfplumber
+import tabula
+import PyPDF2
+
+from table_cache import TableDiskCache
+from document_pool import PdfDocument
+from memory_guard import MemoryGuard
+from parallel_extract import iter_page_tables_parallel, MIN_PAGES_FOR_PARALLEL
+from page_analysis import extract_page_tables, resolve_table_settings
+from text_layout import page_content, content_features, page_words, extract_text_tables
+from ocr import OCR_SETTINGS_KEY, ocr_available, find_scanned_pages, submit_ocr_pages
+from conversion_cache import ConversionCache, options_key
+from backend_selection import (
+    BACKEND_PDFPLUMBER,
+    BACKEND_PYPDF2,
+    plan_backends,
+    should_fall_back,
+    table_quality,
+)
+from table_stitching import stitch_tables, is_blank_row
+from profiling import (
+    NULL_PROFILER,
+    STAGE_OPEN,
+    STAGE_TABLE_FINDING,
+    STAGE_DATAFRAME,
+    STAGE_CLEANING,
+    STAGE_TYPE_INFERENCE,
+)
+from type_inference import infer_column_types
+from column_names import clean_column_names
+
+logger = logging.getLogger(__name__)
+
+# Metode ekstraksi yang tersedia (label sama dengan pilihan di UI)
+METHOD_PDFPLUMBER = "pdfplumber (recommended)"
+METHOD_TABULA = "tabula"
+METHOD_PYPDF2 = "PyPDF2"
+METHOD_AUTO = "auto (pilih per halaman)"
+EXTRACTION_METHODS = [METHOD_PDFPLUMBER, METHOD_AUTO, METHOD_TABULA, METHOD_PYPDF2]
+# Metode yang membaca halaman hasil scan dengan OCR (tabula membaca PDF langsung)
+OCR_METHODS = (METHOD_PDFPLUMBER, METHOD_AUTO, METHOD_PYPDF2)
+
+# Fungsi untuk membuat ID dokumen dari isi file
+def get_document_id(pdf_file) -> str:
+    """
+    Menghitung hash SHA-256 dari isi file PDF sebagai ID dokumen
+    """
+    return hashlib.sha256(pdf_file.getvalue()).hexdigest()
+
+# Kunci pengaturan ekstraksi untuk setiap backend (bagian dari kunci cache)
+PDFPLUMBER_SETTINGS_KEY = "pdfplumber-default"
+TABULA_SETTINGS_KEY = "tabula-lattice-stream"
+PYPDF2_SETTINGS_KEY = "pypdf2-text-layout"
+AUTO_SETTINGS_KEY = "auto-per-page"
+METHOD_SETTINGS_KEYS = {
+    METHOD_PDFPLUMBER: PDFPLUMBER_SETTINGS_KEY,
+    METHOD_AUTO: AUTO_SETTINGS_KEY,
+    METHOD_TABULA: TABULA_SETTINGS_KEY,
+    METHOD_PYPDF2: PYPDF2_SETTINGS_KEY,
+}
+
+# Fungsi untuk membuat kunci pengaturan pdfplumber dari table_settings (hash pengaturan lengkap)
+def pdfplumber_settings_key(table_settings: Optional[Dict] = None) -> str:
+    """
+    Pengaturan yang setara dengan default pdfplumber memakai PDFPLUMBER_SETTINGS_KEY,
+    sehingga cache yang sudah ada tetap terpakai
+    """
+    resolved = resolve_table_settings(table_settings)
+    if resolved == resolve_table_settings():
+        return PDFPLUMBER_SETTINGS_KEY
+    digest = hashlib.sha256(json.dumps(resolved, sort_keys=True, default=str).encode()).hexdigest()
+    return f"pdfplumber-{digest[:16]}"
+
+# Penyimpanan tabel mentah per dokumen
+class TableStore:
+    """
+    Menyimpan tabel mentah hasil page.extract_tables() untuk satu dokumen,
+    dengan kunci (nomor_halaman, index_tabel).
+    Diisi oleh deteksi tabel dan dibaca ulang oleh konversi pdfplumber,
+    sehingga setiap halaman hanya diekstrak sekali per pengaturan ekstraksi.
+    Jika disk_cache diberikan, halaman juga dibaca/ditulis ke cache di disk.
+    Posisi setiap tabel (layout, untuk menyambung tabel lintas halaman) disimpan
+    dengan kunci yang sama.
+    """
+
+    def __init__(self, document_id: str, settings_key: str = PDFPLUMBER_SETTINGS_KEY,
+                 disk_cache: Optional[TableDiskCache] = None):
+        self.document_id = document_id
+        self.settings_key = settings_key
+        self.disk_cache = disk_cache
+        self.total_pages: Optional[int] = None
+        self.tables: Dict[Tuple[int, int], List[List]] = {}
+        self.layouts: Dict[Tuple[int, int], Optional[Dict]] = {}
+        self.pages_done = set()
+        
+        if disk_cache is not None:
+            self.total_pages = disk_cache.get_total_pages(document_id)
+
+    def matches(self, document_id: str, settings_key: str = PDFPLUMBER_SETTINGS_KEY) -> bool:
+        return self.document_id == document_id and self.settings_key == settings_key
+
+    def has_page(self, page_num: int) -> bool:
+        if page_num in self.pages_done:
+            return True
+        
+        # Coba ambil dari cache disk
+        if self.disk_cache is not None:
+            cached = self.disk_cache.get(self.document_id, self.settings_key, page_num)
+            if cached is not None:
+                self._put_memory(page_num, *cached)
+                return True
+        
+        return False
+
+    def is_stored(self, page_num: int) -> bool:
+        """
+        Seperti has_page, tetapi halaman di cache disk tidak dimuat ke memori
+        """
+        if page_num in self.pages_done:
+            return True
+        return (self.disk_cache is not None and
+                self.disk_cache.contains(self.document_id, self.settings_key, page_num))
+
+    def _put_memory(self, page_num: int, tables: List[List[List]], layouts: Optional[List[Optional[Dict]]] = None):
+        layouts = layouts or []
+        for table_idx, table in enumerate(tables):
+            self.tables[(page_num, table_idx)] = table
+            self.layouts[(page_num, table_idx)] = layouts[table_idx] if table_idx < len(layouts) else None
+        self.pages_done.add(page_num)
+
+    def put_page(self, page_num: int, tables: List[List[List]], layouts: Optional[List[Optional[Dict]]] = None):
+        self._put_memory(page_num, tables, layouts)
+        if self.disk_cache is not None:
+            self.disk_cache.put(self.document_id, self.settings_key, page_num, tables, layouts)
+
+    def release_page(self, page_num: int):
+        """
+        Menghapus tabel satu halaman dari memori (mode hemat memori).
+        Halaman tetap tersedia dari cache disk, jika ada; tanpa cache disk
+        halaman akan diekstrak ulang saat diminta lagi.
+        """
+        if page_num not in self.pages_done:
+            return
+        self.pages_done.discard(page_num)
+        table_idx = 0
+        while (page_num, table_idx) in self.tables:
+            del self.tables[(page_num, table_idx)]
+            self.layouts.pop((page_num, table_idx), None)
+            table_idx += 1
+
+    def snapshot(self) -> "TableStore":
+        """
+        Salinan store untuk job di thread lain: halaman yang sudah ada di memori
+        ikut (tabelnya dipakai bersama, tidak disalin), tetapi halaman yang ditambah
+        atau dilepas job tidak mengubah store asal. Halaman baru tetap ditulis ke
+        cache disk yang sama, sehingga store asal bisa membacanya nanti.
+        Harus dipanggil dari thread pemilik store (bukan saat store sedang diisi).
+        """
+        copy = TableStore.__new__(TableStore)
+        copy.document_id = self.document_id
+        copy.settings_key = self.settings_key
+        copy.disk_cache = self.disk_cache
+        copy.total_pages = self.total_pages
+        copy.tables = dict(self.tables)
+        copy.layouts = dict(self.layouts)
+        copy.pages_done = set(self.pages_done)
+        return copy
+
+    def set_total_pages(self, total_pages: int):
+        self.total_pages = total_pages
+        if self.disk_cache is not None:
+            self.disk_cache.put_total_pages(self.document_id, total_pages)
+
+    def get_page(self, page_num: int) -> List[List[List]]:
+        tables = []
+        table_idx = 0
+        while (page_num, table_idx) in self.tables:
+            tables.append(self.tables[(page_num, table_idx)])
+            table_idx += 1
+        return tables
+
+    def get_layouts(self, page_num: int) -> List[Optional[Dict]]:
+        return [self.layouts.get((page_num, table_idx)) for table_idx in range(len(self.get_page(page_num)))]
+
+# Fungsi untuk menyimpan PDF upload ke file sementara (untuk tabula dan worker paralel)
+def write_temp_pdf(pdf_file) -> str:
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
+        tmp_file.write(pdf_file.getvalue())
+        return tmp_file.name
+
+# Fungsi untuk mengambil tabel mentah per halaman (dari store atau ekstraksi baru)
+def iter_page_tables(pdf_file, page_numbers, table_store: Optional[TableStore] = None,
+                     workers: int = 1, min_rows: Optional[int] = None,
+                     profiler=NULL_PROFILER,
+                     document: Optional[PdfDocument] = None,
+                     low_memory: bool = False,
+                     memory_guard: Optional[MemoryGuard] = None,
+                     table_settings: Optional[Dict] = None
+                     ) -> Iterator[Tuple[int, List[List[List]], List[Optional[Dict]]]]:
+    """
+    Menghasilkan (nomor_halaman, tabel_mentah, layout_tabel) untuk setiap halaman yang diminta.
+    Halaman yang sudah ada di table_store tidak diekstrak ulang; PDF hanya
+    dibuka jika ada halaman yang belum tersimpan.
+    Jika workers > 1, halaman yang belum tersimpan diekstrak dengan process pool
+    dan hasilnya tetap dikirim sesuai urutan halaman.
+    min_rows: jika diisi, halaman yang pasti tidak punya tabel dengan minimal
+    min_rows baris dilewati tanpa table finder (hasil kosong, tidak disimpan).
+    profiler: mencatat waktu buka PDF dan pencarian tabel per halaman.
+    document: handle PDF yang sudah terbuka (lihat DocumentPool); jika tidak
+    diberikan, PDF dibuka sementara dan ditutup setelah selesai.
+    low_memory: objek layout setiap halaman langsung dilepas setelah diproses,
+    dan tabelnya dihapus dari memori table_store jika tersimpan di cache disk.
+    memory_guard: diperiksa sebelum setiap halaman (lihat MemoryGuard)
+    table_settings: pengaturan table finder pdfplumber (None = default);
+    table_store harus memakai pdfplumber_settings_key(table_settings)
+    """
+    page_numbers = list(page_numbers)
+    if low_memory:
+        # has_page() memuat halaman dari cache disk ke memori; cukup cek keberadaannya
+        missing_pages = [p for p in page_numbers if table_store is None or not table_store.is_stored(p)]
+    else:
+        missing_pages = [p for p in page_numbers if table_store is None or not table_store.has_page(p)]
+    
+    def release(page_num):
+        if low_memory and table_store is not None and table_store.disk_cache is not None:
+            table_store.release_page(page_num)
+    
+    if workers > 1 and len(missing_pages) >= MIN_PAGES_FOR_PARALLEL:
+        tmp_path = write_temp_pdf(pdf_file)
+        try:
+            missing_set = set(missing_pages)
+            parallel_results = iter_page_tables_parallel(tmp_path, missing_pages, workers, min_rows, profiler,
+                                                         table_settings)
+            try:
+                for page_num in page_numbers:
+                    if memory_guard is not None:
+                        memory_guard.check(page_num)
+                    if page_num not in missing_set:
+                        table_store.has_page(page_num)  # Muat dari cache disk (mode hemat memori)
+                        yield page_num, table_store.get_page(page_num), table_store.get_layouts(page_num)
+                        release(page_num)
+                        continue
+                    
+                    _, tables, complete, layouts = next(parallel_results)
+                    if tables is None:  # Halaman di luar jangkauan
+                        continue
+                    if table_store is not None and complete:
+                        table_store.put_page(page_num, tables, layouts)
+                    yield page_num, tables, layouts
+                    release(page_num)
+            finally:
+                parallel_results.close()
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+        return
+    
+    opened_document = None
+    try:
+        for page_num in page_numbers:
+            if memory_guard is not None:
+                memory_guard.check(page_num)
+            if table_store is not None and table_store.has_page(page_num):
+                yield page_num, table_store.get_page(page_num), table_store.get_layouts(page_num)
+                release(page_num)
+                continue
+            
+            if document is None:
+                # Dokumen sementara: layout hanya disimpan untuk halaman terakhir
+                with profiler.stage(STAGE_OPEN):
+                    document = opened_document = PdfDocument(pdf_file, max_pages=1)
+            
+            page = document.page(page_num)
+            if page is None:
+                continue
+            
+            with profiler.stage(STAGE_TABLE_FINDING, page_num):
+                tables, complete, layouts = extract_page_tables(page, min_rows, table_settings)
+            if table_store is not None and complete:
+                table_store.put_page(page_num, tables, layouts)
+            if low_memory:
+                document.release_page(page_num)
+            yield page_num, tables, layouts
+            release(page_num)
+    finally:
+        if opened_document is not None:
+            opened_document.close()
+
+# Fungsi untuk menghitung jumlah halaman PDF
+def get_total_pages(pdf_file, table_store: Optional[TableStore] = None,
+                    document: Optional[PdfDocument] = None) -> int:
+    if table_store is not None and table_store.total_pages is not None:
+        return table_store.total_pages
+    
+    if document is not None:
+        total_pages = document.total_pages
+    else:
+        with pdfplumber.open(pdf_file) as pdf:
+            total_pages = len(pdf.pages)
+    
+    if table_store is not None:
+        table_store.set_total_pages(total_pages)
+    return total_pages
+
+# Fungsi untuk memilih tabel yang valid dari satu halaman
+def summarize_page_tables(tables: List[List[List]], threshold: int = 3) -> List[Dict]:
+    """
+    Menyaring tabel mentah satu halaman berdasarkan ukuran dan kepadatan sel
+    Returns: List table_info untuk tabel yang valid
+    """
+    valid_tables = []
+    for table_idx, table in enumerate(tables):
+        if table and len(table) > 1:  # Minimal ada header dan satu baris data
+            num_rows = len(table)
+            num_cols = max(len(row) for row in table) if table else 0
+            
+            # Hitung rasio sel yang terisi (sebagai indikator kualitas tabel)
+            filled_cells = sum(1 for row in table for cell in row if cell and str(cell).strip())
+            total_cells = num_rows * num_cols if num_cols > 0 else 0
+            fill_ratio = filled_cells / total_cells if total_cells > 0 else 0
+            
+            # Gunakan threshold untuk menentukan apakah ini tabel yang valid
+            if (num_rows >= threshold and 
+                num_cols >= 2 and 
+                fill_ratio > 0.3):  # Minimal 30% sel terisi
+                
+                table_info = {
+                    'index': table_idx,
+                    'rows': num_rows,
+                    'cols': num_cols,
+                    'fill_ratio': fill_ratio,
+                    'preview_data': table[:3]  # Preview 3 baris pertama
+                }
+                valid_tables.append(table_info)
+    
+    return valid_tables
+
+# Fungsi untuk mendeteksi tabel halaman demi halaman
+def iter_detect_tables(pdf_file, threshold: int = 3, table_store: Optional[TableStore] = None,
+                       workers: int = 1, pages: Optional[List[int]] = None,
+                       profiler=NULL_PROFILER,
+                       document: Optional[PdfDocument] = None,
+                       low_memory: bool = False,
+                       memory_guard: Optional[MemoryGuard] = None,
+                       table_settings: Optional[Dict] = None) -> Iterator[Tuple[int, List[Dict]]]:
+    """
+    Versi generator dari detect_tables_in_pdf: menghasilkan
+    (nomor_halaman, [table_info]) segera setelah setiap halaman dianalisis,
+    termasuk halaman tanpa tabel (list kosong).
+    pages: halaman yang dianalisis (default: semua halaman)
+    low_memory, memory_guard, table_settings: lihat iter_page_tables
+    """
+    if pages is None:
+        pages = range(1, get_total_pages(pdf_file, table_store, document) + 1)
+    
+    # Pre-filter: halaman yang tidak mungkin punya tabel >= threshold baris dilewati
+    for page_num, tables, _ in iter_page_tables(pdf_file, pages, table_store, workers, min_rows=threshold,
+                                                profiler=profiler, document=document,
+                                                low_memory=low_memory, memory_guard=memory_guard,
+                                                table_settings=table_settings):
+        yield page_num, summarize_page_tables(tables, threshold)
+
+# Fungsi untuk mendeteksi halaman yang mengandung tabel
+def detect_tables_in_pdf(pdf_file, threshold: int = 3, table_store: Optional[TableStore] = None,
+                         workers: int = 1,
+                         progress_callback: Optional[Callable[[int, int], None]] = None,
+                         profiler=NULL_PROFILER,
+                         document: Optional[PdfDocument] = None,
+                         low_memory: bool = False,
+                         memory_guard: Optional[MemoryGuard] = None,
+                         table_settings: Optional[Dict] = None) -> Dict[int, List[Dict]]:
+    """
+    Mendeteksi halaman yang mengandung tabel dalam PDF
+    Tabel mentah setiap halaman disimpan ke table_store (jika diberikan)
+    agar bisa dipakai ulang saat konversi.
+    progress_callback(halaman, total_halaman) dipanggil setelah setiap halaman.
+    table_settings: pengaturan table finder pdfplumber (lihat iter_page_tables)
+    Returns: Dictionary {page_number: [table_info]}
+    """
+    tables_by_page = {}
+    
+    total_pages = get_total_pages(pdf_file, table_store, document)
+    
+    for page_num, valid_tables in iter_detect_tables(pdf_file, threshold, table_store, workers,
+                                                     profiler=profiler, document=document,
+                                                     low_memory=low_memory, memory_guard=memory_guard,
+                                                     table_settings=table_settings):
+        if progress_callback is not None:
+            progress_callback(page_num, total_pages)
+        
+        if valid_tables:
+            tables_by_page[page_num] = valid_tables
+    
+    return tables_by_page
+
+# Fungsi untuk menandai sel kosong (NaN/None atau string berisi spasi saja)
+def empty_cell_mask(df: pd.DataFrame) -> np.ndarray:
+    """
+    Membuat mask boolean (baris x kolom) sel kosong dalam satu operasi vektor
+    """
+    values = df.to_numpy(dtype=object)
+    flat = pd.Series(values.ravel(), dtype=object)
+    is_blank = flat.astype(str).str.strip().eq('').to_numpy(dtype=bool, na_value=False)
+    mask = pd.isna(values) | is_blank.reshape(values.shape)
+    return mask
+
+# Fungsi untuk membersihkan DataFrame
+def clean_dataframe(df, clean_columns=True, remove_empty=True, fill_na=True):
+    if df.empty:
+        return df
+    
+    # Mask sel kosong dihitung sekali, dipakai untuk kolom dan baris
+    empty = empty_cell_mask(df)
+    
+    # 1. Kolom yang sepenuhnya kosong (NaN atau string kosong)
+    if remove_empty:
+        keep_cols = ~empty.all(axis=0)
+    else:
+        keep_cols = np.ones(df.shape[1], dtype=bool)
+    
+    # 2. Baris yang sepenuhnya kosong (dihitung dari kolom yang tersisa)
+    keep_rows = ~empty[:, keep_cols].all(axis=1)
+    
+    # Satu kali seleksi (dan satu kali copy) untuk baris dan kolom
+    df_clean = df.iloc[keep_rows, keep_cols].reset_index(drop=True)
+    
+    # 3. Bersihkan nama kolom jika ada duplikat atau None
+    # (nama dibuat dari posisi kolom asli agar sama seperti sebelum kolom dihapus)
+    if clean_columns:
+        cleaned_names = clean_column_names(df.columns)
+        df_clean.columns = [name for name, keep in zip(cleaned_names, keep_cols) if keep]
+    
+    # 4. Isi nilai NaN dengan string kosong
+    if fill_na:
+        df_clean = df_clean.fillna('')
+    
+    return df_clean
+
+# Fungsi untuk mengambil posisi tabel dari output JSON tabula
+def tabula_table_layout(raw_table: Dict) -> Optional[Dict]:
+    """
+    Batas kolom diambil dari posisi kiri sel yang tidak kosong di setiap kolom.
+    tabula tidak memberi tinggi halaman, jadi layout ini tanpa 'page_height'.
+    Returns: None jika ada kolom tanpa posisi
+    """
+    num_cols = max(len(row) for row in raw_table["data"])
+    lefts: List[Optional[float]] = [None] * num_cols
+    right = None
+    for row in raw_table["data"]:
+        for col_idx, cell in enumerate(row):
+            if not cell.get("width"):
+                continue  # Sel kosong dari tabula tidak punya posisi
+            left = cell["left"]
+            lefts[col_idx] = left if lefts[col_idx] is None else min(lefts[col_idx], left)
+            right = max(right or 0.0, left + cell["width"])
+    
+    if right is None or any(left is None for left in lefts):
+        return None
+    return {
+        "bbox": [raw_table.get("left"), raw_table.get("top"), raw_table.get("right"), raw_table.get("bottom")],
+        "columns": [round(left, 2) for left in lefts] + [round(right, 2)],
+    }
+
+# Fungsi untuk membaca tabel mentah satu halaman dengan tabula
+def read_tabula_page(pdf_path: str, page_num: int) -> Tuple[List[List[List]], List[Optional[Dict]]]:
+    """
+    Output JSON tabula dipakai langsung sebagai tabel mentah.
+    Returns: (tabel_mentah, layout_tabel)
+    """
+    raw_tables = tabula.read_pdf(
+        pdf_path,
+        pages=page_num,
+        output_format="json",
+        lattice=True,
+        stream=True,
+        force_subprocess=False
+    )
+    raw_tables = [raw_table for raw_table in raw_tables if raw_table["data"]]
+    tables = [
+        [[cell["text"] or None for cell in row] for row in raw_table["data"]]
+        for raw_table in raw_tables
+    ]
+    layouts = [tabula_table_layout(raw_table) for raw_table in raw_tables]
+    return tables, layouts
+
+# Fungsi untuk mengambil tabel mentah per halaman dengan tabula
+def iter_tabula_page_tables(pdf_file, page_numbers, table_store: Optional[TableStore] = None,
+                            profiler=NULL_PROFILER,
+                            memory_guard: Optional[MemoryGuard] = None
+                            ) -> Iterator[Tuple[int, List[List[List]], List[Optional[Dict]]]]:
+    """
+    Menghasilkan (nomor_halaman, tabel_mentah, layout_tabel) memakai tabula.
+    Semua panggilan memakai satu file sementara dan satu sesi JVM (mode jpype
+    tabula-py), sehingga JVM tidak distart ulang untuk setiap halaman.
+    Output JSON tabula dipakai langsung sebagai tabel mentah, jadi hasilnya
+    bisa disimpan di table_store/cache disk seperti pdfplumber.
+    """
+    tmp_path = None
+    try:
+        for page_num in page_numbers:
+            if memory_guard is not None:
+                memory_guard.check(page_num)
+            if table_store is not None and table_store.has_page(page_num):
+                yield page_num, table_store.get_page(page_num), table_store.get_layouts(page_num)
+                continue
+            
+            # Simpan file sementara untuk tabula (sekali untuk semua halaman)
+            if tmp_path is None:
+                tmp_path = write_temp_pdf(pdf_file)
+            
+            with profiler.stage(STAGE_TABLE_FINDING, page_num, backend="tabula"):
+                tables, layouts = read_tabula_page(tmp_path, page_num)
+            
+            if table_store is not None:
+                table_store.put_page(page_num, tables, layouts)
+            yield page_num, tables, layouts
+    finally:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+# Fungsi untuk mengambil tabel mentah per halaman dari posisi teks (PyPDF2)
+def iter_pypdf2_page_tables(pdf_file, page_numbers, table_store: Optional[TableStore] = None,
+                            profiler=NULL_PROFILER,
+                            memory_guard: Optional[MemoryGuard] = None
+                            ) -> Iterator[Tuple[int, List[List[List]], List[Optional[Dict]]]]:
+    """
+    Menghasilkan (nomor_halaman, tabel_mentah, layout_tabel) dari posisi kata
+    di content stream (lihat text_layout.extract_text_tables), tanpa pdfminer.
+    Cocok untuk tabel tanpa garis; hasilnya bisa disimpan di table_store/cache
+    disk seperti pdfplumber.
+    """
+    pdf_reader = None
+    for page_num in page_numbers:
+        if memory_guard is not None:
+            memory_guard.check(page_num)
+        if table_store is not None and table_store.has_page(page_num):
+            yield page_num, table_store.get_page(page_num), table_store.get_layouts(page_num)
+            continue
+        
+        if pdf_reader is None:
+            with profiler.stage(STAGE_OPEN, backend="PyPDF2"):
+                pdf_reader = PyPDF2.PdfReader(pdf_file)
+        if page_num > len(pdf_reader.pages):
+            continue
+        
+        with profiler.stage(STAGE_TABLE_FINDING, page_num, backend="PyPDF2"):
+            words, page_width, page_height = page_words(pdf_reader.pages[page_num - 1])
+            tables, layouts = extract_text_tables(words, page_width, page_height)
+        
+        if table_store is not None:
+            table_store.put_page(page_num, tables, layouts)
+        yield page_num, tables, layouts
+
+# Fungsi untuk mengambil tabel mentah per halaman dengan backend yang dipilih otomatis
+def iter_auto_page_tables(pdf_file, page_numbers, table_store: Optional[TableStore] = None,
+                          profiler=NULL_PROFILER,
+                          document: Optional[PdfDocument] = None,
+                          low_memory: bool = False,
+                          memory_guard: Optional[MemoryGuard] = None,
+                          backend_callback: Optional[Callable[[Dict], None]] = None
+                          ) -> Iterator[Tuple[int, List[List[List]], List[Optional[Dict]]]]:
+    """
+    Menghasilkan (nomor_halaman, tabel_mentah, layout_tabel) dengan backend
+    yang dipilih per halaman dari fitur murah content stream (plan_backends).
+    Backend berikutnya hanya dicoba jika skor kualitas (table_quality) terlalu
+    rendah; hasil dengan skor tertinggi yang dipakai. Backend yang gagal
+    (mis. tabula tanpa Java) tidak dicoba lagi untuk halaman berikutnya, dan hasil
+    halaman itu tidak disimpan di cache.
+    backend_callback(laporan) dipanggil per halaman dengan laporan
+    {'page', 'backend', 'seconds', 'score', 'cached', 'attempts': [{'backend',
+    'seconds', 'score', 'error'}]}; backend None jika tidak ada backend yang dipakai.
+    document, low_memory, memory_guard: lihat iter_page_tables
+    """
+    pdf_reader = None
+    tmp_path = None
+    opened_document = None
+    failed_backends = set()
+    try:
+        for page_num in page_numbers:
+            if memory_guard is not None:
+                memory_guard.check(page_num)
+            if table_store is not None and table_store.has_page(page_num):
+                tables = table_store.get_page(page_num)
+                if backend_callback is not None:
+                    backend_callback({'page': page_num, 'backend': None, 'seconds': 0.0,
+                                      'score': table_quality(tables), 'cached': True, 'attempts': []})
+                yield page_num, tables, table_store.get_layouts(page_num)
+                continue
+            
+            if pdf_reader is None:
+                with profiler.stage(STAGE_OPEN, backend="PyPDF2"):
+                    pdf_reader = PyPDF2.PdfReader(pdf_file)
+            if page_num > len(pdf_reader.pages):
+                continue
+            
+            page = pdf_reader.pages[page_num - 1]
+            content = page_content(page)
+            features = content_features(content)
+            best = ([], [], 0.0, None)  # (tabel, layout, skor, backend)
+            attempts = []
+            for backend in plan_backends(features):
+                if backend in failed_backends:
+                    attempts.append({'backend': backend, 'seconds': 0.0, 'score': None,
+                                     'error': "dilewati (gagal di halaman sebelumnya)"})
+                    continue
+                # Siapkan sumber backend di luar tahap profiler (tahap tidak boleh bersarang)
+                if backend == BACKEND_PDFPLUMBER and document is None:
+                    with profiler.stage(STAGE_OPEN):
+                        document = opened_document = PdfDocument(pdf_file, max_pages=1)
+                elif backend not in (BACKEND_PDFPLUMBER, BACKEND_PYPDF2) and tmp_path is None:
+                    tmp_path = write_temp_pdf(pdf_file)
+                
+                start = time.perf_counter()
+                try:
+                    with profiler.stage(STAGE_TABLE_FINDING, page_num, backend=backend):
+                        if backend == BACKEND_PYPDF2:
+                            words, page_width, page_height = page_words(page, content)
+                            tables, layouts = extract_text_tables(words, page_width, page_height)
+                        elif backend == BACKEND_PDFPLUMBER:
+                            tables, _, layouts = extract_page_tables(document.page(page_num))
+                        else:
+                            tables, layouts = read_tabula_page(tmp_path, page_num)
+                except Exception as e:
+                    logger.warning("Backend %s gagal di halaman %s: %s", backend, page_num, e)
+                    failed_backends.add(backend)
+                    attempts.append({'backend': backend, 'seconds': time.perf_counter() - start,
+                                     'score': None, 'error': str(e)})
+                    continue
+                
+                score = table_quality(tables)
+                attempts.append({'backend': backend, 'seconds': time.perf_counter() - start,
+                                 'score': score, 'error': None})
+                if best[3] is None or score > best[2]:
+                    best = (tables, layouts, score, backend)
+                if not should_fall_back(score, features):
+                    break
+            
+            tables, layouts, score, backend = best
+            if low_memory and document is not None:
+                document.release_page(page_num)
+            if table_store is not None and not any(attempt['error'] for attempt in attempts):
+                table_store.put_page(page_num, tables, layouts)
+            if backend_callback is not None:
+                backend_callback({'page': page_num, 'backend': backend,
+                                  'seconds': sum(attempt['seconds'] for attempt in attempts),
+                                  'score': score, 'cached': False, 'attempts': attempts})
+            yield page_num, tables, layouts
+    finally:
+        if opened_document is not None:
+            opened_document.close()
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+# Fungsi untuk menyisipkan hasil OCR halaman scan ke urutan halaman hasil ekstraksi digital
+def iter_with_ocr_pages(page_tables, page_numbers, pdf_file, scanned_pages: List[int],
+                        table_store: Optional[TableStore] = None, workers: int = 1,
+                        profiler=NULL_PROFILER,
+                        warning_callback: Optional[Callable[[str], None]] = None
+                        ) -> Iterator[Tuple[int, List[List[List]], List[Optional[Dict]]]]:
+    """
+    Menghasilkan (nomor_halaman, tabel_mentah, layout_tabel) sesuai urutan page_numbers.
+    page_tables: hasil backend digital untuk halaman selain scanned_pages.
+    Halaman scan di-OCR di process pool terpisah (lihat ocr.submit_ocr_pages) yang
+    dimulai sebelum halaman digital pertama diambil, sehingga keduanya berjalan
+    bersamaan. Hasil OCR disimpan di cache disk table_store dengan OCR_SETTINGS_KEY.
+    Halaman yang gagal di-OCR dilaporkan lewat warning_callback dan tidak disimpan.
+    """
+    if warning_callback is None:
+        warning_callback = logger.warning
+    ocr_store = None
+    if table_store is not None:
+        ocr_store = TableStore(table_store.document_id, OCR_SETTINGS_KEY, disk_cache=table_store.disk_cache)
+    pending = [page_num for page_num in scanned_pages if ocr_store is None or not ocr_store.has_page(page_num)]
+    
+    executor, futures, tmp_path = None, {}, None
+    if pending:
+        tmp_path = write_temp_pdf(pdf_file)
+        executor, futures = submit_ocr_pages(tmp_path, pending, workers)
+    
+    scanned = set(scanned_pages)
+    digital = iter(page_tables)
+    next_digital = next(digital, None)
+    try:
+        for page_num in page_numbers:
+            if page_num in futures:
+                try:
+                    tables, layouts, seconds = futures.pop(page_num).result()
+                except Exception as e:
+                    warning_callback(f"OCR gagal di halaman {page_num}: {str(e)}")
+                    continue
+                profiler.add_record({"stage": STAGE_TABLE_FINDING, "page": page_num, "seconds": seconds,
+                                     "backend": "ocr", "worker": True})
+                if ocr_store is not None:
+                    ocr_store.put_page(page_num, tables, layouts)
+                yield page_num, tables, layouts
+            elif page_num in scanned:
+                yield page_num, ocr_store.get_page(page_num), ocr_store.get_layouts(page_num)
+            elif next_digital is not None and next_digital[0] == page_num:
+                yield next_digital
+                next_digital = next(digital, None)
+    finally:
+        if hasattr(digital, 'close'):
+            digital.close()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+# Fungsi untuk mengambil baris data dan halaman asalnya dari tabel logis (hasil stitch_tables)
+def table_group_rows(group: Dict, skip_header: bool) -> Tuple[List[List], object]:
+    """
+    Returns: (baris_data, halaman) dengan halaman berupa satu nomor untuk tabel
+    satu halaman, atau list nomor halaman per baris untuk tabel yang disambung
+    """
+    rows = group['rows'][1:] if skip_header else group['rows']
+    if len(group['pages']) == 1:
+        return rows, group['page']
+    
+    # Baris kosong dibuang di sini (clean_dataframe juga membuangnya)
+    # agar halaman asal tetap sejajar dengan baris hasil pembersihan
+    row_pages = group['row_pages'][1:] if skip_header else group['row_pages']
+    kept = [(row, page_num) for row, page_num in zip(rows, row_pages) if not is_blank_row(row)]
+    return [row for row, _ in kept], [page_num for _, page_num in kept]
+
+# Fungsi untuk melaporkan progress setiap kali satu halaman selesai diambil
+def iter_with_progress(page_iter, total: int, progress_callback: Optional[Callable[[int, int], None]] = None):
+    try:
+        for done, item in enumerate(page_iter, start=1):
+            if progress_callback is not None:
+                progress_callback(done, total)
+            yield item
+    finally:
+        # Tutup generator sumber (mis. process pool) jika dihentikan lebih awal
+        if hasattr(page_iter, 'close'):
+            page_iter.close()
+
+# Fungsi untuk ekstraksi tabel dari halaman tertentu, satu DataFrame setiap kali tabel selesai
+def iter_extracted_tables(pdf_file, pages_to_extract, extraction_method, table_store: Optional[TableStore] = None,
+                          workers: int = 1,
+                          warning_callback: Optional[Callable[[str], None]] = None,
+                          clean_options: Optional[Dict] = None,
+                          profiler=NULL_PROFILER,
+                          document: Optional[PdfDocument] = None,
+                          stitch: bool = False,
+                          infer_types: bool = False,
+                          progress_callback: Optional[Callable[[int, int], None]] = None,
+                          low_memory: bool = False,
+                          memory_guard: Optional[MemoryGuard] = None,
+                          backend_callback: Optional[Callable[[Dict], None]] = None,
+                          table_settings: Optional[Dict] = None,
+                          ocr: bool = False,
+                          conversion_cache: Optional[ConversionCache] = None) -> Iterator[pd.DataFrame]:
+    """
+    Mengekstrak tabel dari halaman yang dipilih menjadi DataFrame
+    dengan kolom metadata PDF_Halaman dan PDF_Tabel_Index.
+    Tabel dihasilkan satu per satu (urutan halaman), sehingga bisa langsung
+    ditulis ke file output tanpa menyimpan semua tabel di memori.
+    Setiap tabel dibersihkan sekali dengan clean_options (argumen untuk
+    clean_dataframe); hasilnya tidak perlu dibersihkan ulang.
+    warning_callback(pesan) dipanggil untuk tabel yang gagal diproses
+    (default: ditulis ke log).
+    document: handle PDF terbuka untuk backend pdfplumber (opsional)
+    stitch: sambung tabel yang berlanjut ke halaman berikutnya menjadi satu
+    DataFrame (lihat stitch_tables); PDF_Halaman berisi halaman asal setiap baris
+    infer_types: ubah kolom angka/tanggal menjadi dtype numerik/datetime setelah
+    pembersihan (lihat infer_column_types); laporan per kolom disimpan di
+    df.attrs['type_report']
+    progress_callback(halaman_selesai, total_halaman) dipanggil setelah setiap
+    halaman diambil; exception dari callback menghentikan ekstraksi
+    low_memory, memory_guard: lihat iter_page_tables; memory_guard juga
+    diperiksa untuk backend tabula dan PyPDF2
+    table_store harus memakai kunci pengaturan backend yang dipilih
+    (METHOD_SETTINGS_KEYS[extraction_method]; untuk pdfplumber lihat table_settings)
+    backend_callback: laporan backend per halaman untuk METHOD_AUTO
+    (lihat iter_auto_page_tables)
+    table_settings: pengaturan table finder untuk METHOD_PDFPLUMBER; table_store
+    memakai pdfplumber_settings_key(table_settings)
+    ocr: halaman hasil scan (lihat ocr.is_scanned_page) tidak dikirim ke backend
+    digital, tetapi di-OCR dengan Tesseract di process pool terpisah (max(1, workers)
+    proses, lihat iter_with_ocr_pages). Tidak berlaku untuk METHOD_TABULA. Jika
+    Tesseract tidak terpasang, halaman scan dilewati dengan peringatan.
+    conversion_cache: tabel bersih diambil dari cache jika tabel mentah (table_store)
+    dan opsinya sama; hanya tabel baru atau dengan opsi baru yang dibangun dan
+    dibersihkan (butuh table_store). DataFrame dari cache dipakai bersama.
+    """
+    if warning_callback is None:
+        warning_callback = logger.warning
+    if clean_options is None:
+        clean_options = {}
+    if table_store is None:
+        conversion_cache = None
+    options = options_key(clean_options, stitch, infer_types, OCR_SETTINGS_KEY if ocr else None)
+    
+    # Fungsi untuk mengambil tabel bersih dari cache (kunci None jika cache tidak dipakai)
+    def cached_table(group) -> Tuple[Optional[Tuple], Optional[pd.DataFrame]]:
+        if conversion_cache is None:
+            return None, None
+        key = conversion_cache.table_key(table_store.document_id, table_store.settings_key, options, group)
+        return key, conversion_cache.get(key)
+    
+    if extraction_method in OCR_METHODS:
+        scanned_pages = find_scanned_pages(pdf_file, pages_to_extract) if ocr else []
+        if scanned_pages and not ocr_available():
+            warning_callback(f"{len(scanned_pages)} halaman hasil scan dilewati: "
+                             "OCR butuh paket pytesseract dan program tesseract")
+            scanned_pages = []
+        scanned = set(scanned_pages)
+        digital_pages = [page_num for page_num in pages_to_extract if page_num not in scanned]
+        
+        if extraction_method == METHOD_PDFPLUMBER:
+            # Halaman yang sudah dianalisis saat deteksi diambil dari table_store
+            source = iter_page_tables(pdf_file, digital_pages, table_store, workers, profiler=profiler,
+                                      document=document, low_memory=low_memory, memory_guard=memory_guard,
+                                      table_settings=table_settings)
+        elif extraction_method == METHOD_AUTO:
+            source = iter_auto_page_tables(pdf_file, digital_pages, table_store, profiler, document,
+                                           low_memory, memory_guard, backend_callback)
+        else:
+            source = iter_pypdf2_page_tables(pdf_file, digital_pages, table_store, profiler, memory_guard)
+        if scanned_pages:
+            source = iter_with_ocr_pages(source, pages_to_extract, pdf_file, scanned_pages, table_store,
+                                         workers, profiler, warning_callback)
+        page_tables = iter_with_progress(source, len(pages_to_extract), progress_callback)
+        for group in stitch_tables(page_tables, enabled=stitch):
+            cache_key, df = cached_table(group)
+            if df is not None:
+                if not df.empty:
+                    yield df
+                continue
+            page_num, table_idx = group['page'], group['index']
+            table = group['rows']
+            # Ambil header (baris pertama)
+            headers = table[0] if table[0] else []
+            data_rows, row_pages = table_group_rows(group, skip_header=True)
+            
+            if data_rows:
+                try:
+                    with profiler.stage(STAGE_DATAFRAME, page_num):
+                        if headers:
+                            df = pd.DataFrame(data_rows, columns=headers)
+                        else:
+                            num_cols = len(data_rows[0])
+                            generic_headers = [f"Col_{i+1}" for i in range(num_cols)]
+                            df = pd.DataFrame(data_rows, columns=generic_headers)
+                    
+                    with profiler.stage(STAGE_CLEANING, page_num):
+                        df = clean_dataframe(df, **clean_options)
+                    if infer_types and not df.empty:
+                        with profiler.stage(STAGE_TYPE_INFERENCE, page_num):
+                            df, type_report = infer_column_types(df)
+                        df.attrs['type_report'] = type_report
+                    if not df.empty:
+                        df.insert(0, 'PDF_Halaman', row_pages)
+                        df.insert(1, 'PDF_Tabel_Index', table_idx + 1)
+                except Exception as e:
+                    warning_callback(f"Error di halaman {page_num}, tabel {table_idx+1}: {str(e)}")
+                    continue
+                if cache_key is not None:
+                    conversion_cache.put(cache_key, df)
+                if not df.empty:
+                    yield df
+    
+    elif extraction_method == METHOD_TABULA:
+        page_tables = iter_with_progress(
+            iter_tabula_page_tables(pdf_file, pages_to_extract, table_store, profiler, memory_guard),
+            len(pages_to_extract), progress_callback
+        )
+        for group in stitch_tables(page_tables, enabled=stitch):
+            cache_key, df_clean = cached_table(group)
+            if df_clean is not None:
+                if not df_clean.empty:
+                    yield df_clean
+                continue
+            page_num, idx = group['page'], group['index']
+            rows, row_pages = table_group_rows(group, skip_header=False)
+            with profiler.stage(STAGE_DATAFRAME, page_num):
+                df = pd.DataFrame(rows)
+            if not df.empty:
+                with profiler.stage(STAGE_CLEANING, page_num):
+                    df_clean = clean_dataframe(df, **clean_options)
+                if infer_types and not df_clean.empty:
+                    with profiler.stage(STAGE_TYPE_INFERENCE, page_num):
+                        df_clean, type_report = infer_column_types(df_clean)
+                    df_clean.attrs['type_report'] = type_report
+                if not df_clean.empty:
+                    df_clean.insert(0, 'PDF_Halaman', row_pages)
+                    df_clean.insert(1, 'PDF_Tabel_Index', idx + 1)
+            else:
+                df_clean = df
+            if cache_key is not None:
+                conversion_cache.put(cache_key, df_clean)
+            if not df_clean.empty:
+                yield df_clean
+
+# Fungsi untuk ekstraksi tabel dari halaman tertentu
+def extract_tables_from_pages(pdf_file, pages_to_extract, extraction_method, table_store: Optional[TableStore] = None,
+                              workers: int = 1,
+                              warning_callback: Optional[Callable[[str], None]] = None,
+                              clean_options: Optional[Dict] = None,
+                              profiler=NULL_PROFILER,
+                              document: Optional[PdfDocument] = None,
+                              stitch: bool = False,
+                              infer_types: bool = False,
+                              progress_callback: Optional[Callable[[int, int], None]] = None,
+                              backend_callback: Optional[Callable[[Dict], None]] = None,
+                              table_settings: Optional[Dict] = None,
+                              ocr: bool = False,
+                              conversion_cache: Optional[ConversionCache] = None) -> List[pd.DataFrame]:
+    """
+    Sama seperti iter_extracted_tables, tetapi mengembalikan semua tabel sebagai list
+    """
+    return list(iter_extracted_tables(pdf_file, pages_to_extract, extraction_method, table_store, workers,
+                                      warning_callback, clean_options, profiler, document, stitch,
+                                      infer_types, progress_callback, backend_callback=backend_callback,
+                                      table_settings=table_settings, ocr=ocr,
+                                      conversion_cache=conversion_cache))
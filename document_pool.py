@@ -0,0 +1,112 @@
+import threading
+from io import BytesIO
+from collections import OrderedDict
+from typing import Optional
+
+import pdfplumber
+
+# Jumlah dokumen yang tetap terbuka per sesi
+DEFAULT_MAX_DOCUMENTS = 2
+# Jumlah halaman yang objek layout-nya tetap disimpan per dokumen
+DEFAULT_MAX_PAGES = 16
+
+
+class PdfDocument:
+    """
+    Handle pdfplumber yang tetap terbuka selama dipakai (dari satu thread saja).
+    Objek layout halaman (hasil parsing pdfminer) disimpan untuk max_pages
+    halaman terakhir yang dipakai; halaman yang lebih lama di-page.close()
+    agar memori tidak terus bertambah pada PDF besar.
+    """
+
+    def __init__(self, pdf_file, document_id: Optional[str] = None, max_pages: int = DEFAULT_MAX_PAGES):
+        self.document_id = document_id
+        self.max_pages = max(1, max_pages)
+        self.pdf = pdfplumber.open(pdf_file)
+        self._pages: "OrderedDict[int, object]" = OrderedDict()
+        self.closed = False
+
+    @property
+    def total_pages(self) -> int:
+        return len(self.pdf.pages)
+
+    def page(self, page_num: int):
+        """
+        Mengambil halaman (1-based). Returns: None jika halaman tidak ada
+        """
+        if page_num < 1 or page_num > len(self.pdf.pages):
+            return None
+
+        page = self.pdf.pages[page_num - 1]
+        self._pages[page_num] = page
+        self._pages.move_to_end(page_num)
+        while len(self._pages) > self.max_pages:
+            _, old_page = self._pages.popitem(last=False)
+            old_page.close()
+        return page
+
+    def release_page(self, page_num: int):
+        """
+        Melepas objek layout satu halaman sekarang juga (mode hemat memori)
+        """
+        page = self._pages.pop(page_num, None)
+        if page is not None:
+            page.close()
+
+    def close(self):
+        if self.closed:
+            return
+        for page in self._pages.values():
+            page.close()
+        self._pages.clear()
+        self.pdf.close()
+        self.closed = True
+
+
+class DocumentPool:
+    """
+    Menyimpan PdfDocument yang sudah dibuka, dengan kunci ID dokumen (hash isi file),
+    supaya PDF yang sama tidak di-parse ulang pada setiap rerun.
+    Di aplikasi, handle ini hanya dipakai di thread sesi: jumlah halaman dan
+    deteksi tabel. Preview halaman memakai page_preview.PagePreviewCache
+    (pypdfium2), dan job konversi membuka PDF sendiri di thread worker, karena
+    PdfDocument (dan objek pdfplumber di dalamnya) tidak aman dipakai bersamaan
+    dari beberapa thread. Lock di sini hanya melindungi isi pool.
+    Dokumen yang paling lama tidak dipakai ditutup jika jumlahnya melebihi max_documents.
+    """
+
+    def __init__(self, max_documents: int = DEFAULT_MAX_DOCUMENTS, max_pages: int = DEFAULT_MAX_PAGES):
+        self.max_documents = max(1, max_documents)
+        self.max_pages = max_pages
+        self._documents: "OrderedDict[str, PdfDocument]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, document_id: str, pdf_file) -> PdfDocument:
+        with self._lock:
+            document = self._documents.get(document_id)
+            if document is None or document.closed:
+                # Salinan sendiri, agar posisi baca file upload tidak dipakai bersama
+                document = PdfDocument(BytesIO(pdf_file.getvalue()), document_id, self.max_pages)
+                self._documents[document_id] = document
+            self._documents.move_to_end(document_id)
+
+            while len(self._documents) > self.max_documents:
+                _, old_document = self._documents.popitem(last=False)
+                old_document.close()
+            return document
+
+    def evict(self, document_id: str):
+        with self._lock:
+            document = self._documents.pop(document_id, None)
+        if document is not None:
+            document.close()
+
+    def close(self):
+        with self._lock:
+            documents = list(self._documents.values())
+            self._documents.clear()
+        for document in documents:
+            document.close()
+
+    def __len__(self) -> int:
+        return len(self._documents)
@@ -0,0 +1,466 @@
+import io
+import os
+import re
+import gzip
+import json
+import time
+import pickle
+import zipfile
+import tempfile
+from typing import List, Optional, Dict, Iterable, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import xlsxwriter
+
+from column_names import clean_column_names
+
+# Batas jumlah baris per sheet Excel (termasuk baris header)
+EXCEL_MAX_ROWS = 1048576
+# Jumlah baris yang diformat sekaligus saat menulis CSV ke arsip ZIP
+CSV_CHUNK_ROWS = 50000
+
+
+# Fungsi untuk membuat nama sheet Excel dari halaman dan urutan tabel
+def table_sheet_name(table_df: pd.DataFrame, i: int) -> str:
+    halaman = table_df.iloc[0]['PDF_Halaman'] if 'PDF_Halaman' in table_df.columns else i+1
+    sheet_name = f"H{halaman}_T{i+1}"
+    sheet_name = re.sub(r'[^\w\s]', '_', sheet_name)
+    return sheet_name[:31]  # Excel limit
+
+
+# Fungsi untuk menulis tabel ke file Excel
+def write_excel(tables: List[pd.DataFrame], output, merge: bool = False) -> str:
+    """
+    Menulis tabel ke Excel (path atau file-like object).
+    Jika merge=True dan ada lebih dari satu tabel, semua tabel digabung dalam satu sheet.
+    Returns: Keterangan jumlah sheet
+    """
+    with pd.ExcelWriter(output, engine='openpyxl', date_format='dd/mm/yyyy', datetime_format='dd/mm/yyyy') as writer:
+        if merge and len(tables) > 1:
+            # Gabungkan semua tabel
+            merged_df = pd.concat(tables, ignore_index=True)
+            merged_df.to_excel(writer, sheet_name="Data_Terpisah", index=False)
+            sheet_info = "1 sheet (tergabung)"
+        else:
+            # Simpan setiap tabel di sheet terpisah
+            for i, table_df in enumerate(tables):
+                table_df.to_excel(writer, sheet_name=table_sheet_name(table_df, i), index=False)
+            sheet_info = f"{len(tables)} sheets"
+
+    return sheet_info
+
+
+# Fungsi untuk menyamakan nama kolom kosong (None/NaN) agar bisa dipakai sebagai kunci
+def _column_key(col):
+    return None if col is None or (isinstance(col, float) and pd.isna(col)) else col
+
+
+# Penulis Excel streaming untuk output besar
+class StreamingExcelWriter:
+    """
+    Menulis tabel ke file .xlsx baris demi baris memakai mode constant_memory
+    xlsxwriter: setiap baris langsung di-flush ke file sementara di disk,
+    sehingga memori tidak bertambah seiring jumlah baris.
+    Jika sebuah sheet mencapai batas baris Excel, penulisan dilanjutkan ke
+    sheet baru dengan header yang sama.
+    Pada mode merge, tabel dengan kolom yang sama (atau subset) ditulis ke
+    sheet yang sama; tabel dengan kolom baru memulai sheet baru, karena header
+    tidak bisa diubah setelah ditulis.
+    """
+
+    def __init__(self, path: str, merge: bool = False, max_rows: int = EXCEL_MAX_ROWS):
+        self.workbook = xlsxwriter.Workbook(path, {
+            'constant_memory': True,
+            'default_date_format': 'dd/mm/yyyy',
+        })
+        self.merge = merge
+        self.max_rows = max_rows
+        self.table_count = 0
+        self.sheet_names = set()
+        self._sheet = None
+        self._sheet_base = ""
+        self._closed = False
+        self._columns: List = []
+        self._column_positions: Dict = {}  # Nama kolom -> posisi di sheet (lebih dari satu jika nama kembar)
+        self._row = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _unique_sheet_name(self, base: str) -> str:
+        base = base[:31]
+        name = base
+        counter = 2
+        while name.lower() in self.sheet_names:
+            suffix = f"_{counter}"
+            name = base[:31 - len(suffix)] + suffix
+            counter += 1
+        self.sheet_names.add(name.lower())
+        return name
+
+    def _start_sheet(self, base_name: str, columns: List):
+        self._sheet = self.workbook.add_worksheet(self._unique_sheet_name(base_name))
+        self._sheet_base = base_name
+        self._columns = list(columns)
+        self._column_positions = {}
+        for i, col in enumerate(self._columns):
+            self._column_positions.setdefault(_column_key(col), []).append(i)
+        self._sheet.write_row(0, 0, ["" if _column_key(col) is None else str(col) for col in self._columns])
+        self._row = 1
+
+    def _table_positions(self, columns: List) -> Optional[List[int]]:
+        """
+        Posisi setiap kolom tabel di sheet aktif; kolom dengan nama kembar
+        dipasangkan sesuai urutan kemunculannya.
+        Returns: None jika ada kolom yang tidak ada di sheet aktif
+        """
+        used: Dict = {}
+        positions = []
+        for col in columns:
+            key = _column_key(col)
+            occurrence = used.get(key, 0)
+            used[key] = occurrence + 1
+            slots = self._column_positions.get(key, [])
+            if occurrence >= len(slots):
+                return None
+            positions.append(slots[occurrence])
+        return positions
+
+    def add_table(self, table_df: pd.DataFrame, sheet_name: Optional[str] = None):
+        """
+        Menambahkan satu tabel ke workbook
+        """
+        if sheet_name is None:
+            sheet_name = "Data_Terpisah" if self.merge else table_sheet_name(table_df, self.table_count)
+        self.table_count += 1
+
+        columns = list(table_df.columns)
+        # Posisi kolom tabel ini di sheet aktif (bisa berbeda urutan pada mode merge)
+        positions = self._table_positions(columns) if self.merge and self._sheet is not None else None
+        if positions is None:
+            self._start_sheet(sheet_name, columns)
+            positions = list(range(len(columns)))
+        contiguous = positions == list(range(len(positions)))
+
+        # Ubah NaN/None/NaT menjadi None agar ditulis sebagai sel kosong
+        values = table_df.astype(object).where(table_df.notna(), None)
+
+        for row in values.itertuples(index=False, name=None):
+            if self._row >= self.max_rows:
+                self._start_sheet(self._sheet_base, self._columns)
+
+            if contiguous:
+                self._sheet.write_row(self._row, 0, row)
+            else:
+                for col_pos, value in zip(positions, row):
+                    if value is not None:
+                        self._sheet.write(self._row, col_pos, value)
+            self._row += 1
+
+    def close(self) -> str:
+        """
+        Menutup workbook. Returns: Keterangan jumlah sheet
+        """
+        if not self._closed:
+            if self._sheet is None:
+                # Workbook xlsx harus punya minimal satu sheet
+                self._start_sheet("Data_Terpisah", [])
+            self.workbook.close()
+            self._closed = True
+        return f"{len(self.sheet_names)} sheets"
+
+
+# Fungsi untuk menulis tabel ke file Excel secara streaming
+def write_excel_streaming(tables, path: str, merge: bool = False) -> str:
+    """
+    Sama seperti write_excel, tetapi memakai StreamingExcelWriter.
+    tables boleh berupa generator sehingga tabel bisa ditulis saat dihasilkan.
+    Returns: Keterangan jumlah sheet
+    """
+    writer = StreamingExcelWriter(path, merge=merge)
+    for table_df in tables:
+        writer.add_table(table_df)
+    return writer.close()
+
+
+# Fungsi untuk menulis semua tabel ke satu file CSV
+def write_csv(tables: List[pd.DataFrame], output):
+    merged_df = pd.concat(tables, ignore_index=True) if len(tables) > 1 else tables[0]
+    merged_df.to_csv(output, index=False)
+
+
+# Kolom metadata yang disimpan dengan dictionary encoding di Parquet/Arrow
+DICTIONARY_COLUMNS = ('PDF_Halaman', 'PDF_Tabel_Index')
+
+
+# Fungsi untuk memastikan nama kolom berupa string unik (syarat Parquet/Arrow)
+def _arrow_column_names(table_df: pd.DataFrame) -> List[str]:
+    names = [str(col) for col in table_df.columns]
+    if len(set(names)) != len(names):
+        names = clean_column_names(table_df.columns)
+    return names
+
+
+# Fungsi untuk menentukan satu tipe Arrow dari beberapa tabel
+def _merge_arrow_types(types) -> pa.DataType:
+    types = {pa.string() if pa.types.is_large_string(t) else t for t in types if not pa.types.is_null(t)}
+    if not types:
+        return pa.string()
+    if len(types) == 1:
+        return types.pop()
+    if all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in types):
+        return pa.float64()
+    return pa.string()
+
+
+# Fungsi untuk mengambil nama dan tipe Arrow setiap kolom satu tabel
+def table_arrow_types(table_df: pd.DataFrame) -> List[Tuple[str, pa.DataType]]:
+    # Nama kolom dibuat unik dulu: from_pandas menolak nama kembar
+    names = _arrow_column_names(table_df)
+    table_schema = pa.Schema.from_pandas(table_df.set_axis(names, axis=1), preserve_index=False)
+    return [(field.name, field.type) for field in table_schema]
+
+
+# Fungsi untuk membuat skema gabungan dari semua tabel
+def build_arrow_schema(tables: List[pd.DataFrame]) -> pa.Schema:
+    """
+    Menggabungkan kolom semua tabel (urutan kemunculan pertama) menjadi satu skema.
+    Kolom dengan tipe berbeda antar tabel disimpan sebagai string; kolom
+    metadata halaman/tabel disimpan dengan dictionary encoding.
+    """
+    return merge_arrow_types(table_arrow_types(table_df) for table_df in tables)
+
+
+# Fungsi untuk membuat skema gabungan dari tipe kolom per tabel (lihat table_arrow_types)
+def merge_arrow_types(tables_types: Iterable[List[Tuple[str, pa.DataType]]]) -> pa.Schema:
+    column_types: Dict[str, list] = {}
+    for table_types in tables_types:
+        for name, field_type in table_types:
+            column_types.setdefault(name, []).append(field_type)
+
+    fields = []
+    for name, types in column_types.items():
+        if name in DICTIONARY_COLUMNS:
+            fields.append(pa.field(name, pa.dictionary(pa.int32(), pa.int64())))
+        else:
+            fields.append(pa.field(name, _merge_arrow_types(types)))
+    return pa.schema(fields)
+
+
+# Fungsi untuk mengubah satu tabel menjadi record batch sesuai skema gabungan
+def table_to_record_batch(table_df: pd.DataFrame, schema: pa.Schema) -> pa.RecordBatch:
+    columns = dict(zip(_arrow_column_names(table_df), (table_df.iloc[:, i] for i in range(table_df.shape[1]))))
+    num_rows = len(table_df)
+
+    arrays = []
+    for field in schema:
+        if field.name not in columns:
+            arrays.append(pa.nulls(num_rows, field.type))
+        elif pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(columns[field.name], type=pa.int64(), from_pandas=True).dictionary_encode())
+        else:
+            array = pa.array(columns[field.name], from_pandas=True)
+            if array.type != field.type:
+                array = array.cast(field.type)
+            arrays.append(array)
+
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+# Fungsi untuk menulis semua tabel ke satu file Parquet
+def write_parquet(tables: Iterable[pd.DataFrame], output, schema: Optional[pa.Schema] = None):
+    """
+    Menulis semua tabel ke satu file Parquet tanpa pd.concat:
+    setiap tabel menjadi satu row group.
+    schema: skema gabungan yang sudah dihitung (mis. dari TableSpool); jika
+    diberikan, tables cukup dibaca sekali. Tanpa schema, tables (mis. generator)
+    disimpan dulu sebagai list karena dibaca dua kali.
+    """
+    if schema is None:
+        tables = list(tables)
+        schema = build_arrow_schema(tables)
+    with pq.ParquetWriter(output, schema) as writer:
+        for table_df in tables:
+            if len(table_df):
+                batch = table_to_record_batch(table_df, schema)
+                writer.write_table(pa.Table.from_batches([batch]), row_group_size=batch.num_rows)
+
+
+# Fungsi untuk menulis semua tabel ke satu file Arrow IPC
+def write_arrow(tables: Iterable[pd.DataFrame], output, schema: Optional[pa.Schema] = None):
+    """
+    Menulis semua tabel ke satu file Arrow IPC (format stream):
+    setiap tabel menjadi satu record batch.
+    schema: lihat write_parquet
+    """
+    if schema is None:
+        tables = list(tables)
+        schema = build_arrow_schema(tables)
+    with pa.ipc.new_stream(output, schema) as writer:
+        for table_df in tables:
+            if len(table_df):
+                writer.write_batch(table_to_record_batch(table_df, schema))
+
+
+# Penampung tabel sementara di disk (untuk output yang butuh semua kolom sebelum ditulis)
+class TableSpool:
+    """
+    Menyimpan DataFrame satu per satu ke file sementara (pickle) dan hanya
+    mengingat nama/tipe kolomnya. CSV gabungan, Parquet dan Arrow butuh kolom
+    atau skema dari semua tabel sebelum baris pertama ditulis; dengan spool
+    tabel bisa dilepas dari memori segera setelah diekstrak, lalu dibaca
+    ulang satu per satu saat menulis output.
+    """
+
+    def __init__(self, tmp_dir: Optional[str] = None):
+        self._file = tempfile.TemporaryFile(dir=tmp_dir, suffix=".spool")
+        self.columns: Dict = {}  # Gabungan kolom semua tabel (urutan kemunculan pertama)
+        self.arrow_types: List[List[Tuple[str, pa.DataType]]] = []
+        self.table_count = 0
+        self.row_count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def add(self, table_df: pd.DataFrame):
+        self._file.seek(0, os.SEEK_END)
+        pickle.dump(table_df, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.columns.update(dict.fromkeys(table_df.columns))
+        self.arrow_types.append(table_arrow_types(table_df))
+        self.table_count += 1
+        self.row_count += len(table_df)
+
+    def arrow_schema(self) -> pa.Schema:
+        return merge_arrow_types(self.arrow_types)
+
+    def __iter__(self):
+        self._file.seek(0)
+        for _ in range(self.table_count):
+            yield pickle.load(self._file)
+
+    def __len__(self) -> int:
+        return self.table_count
+
+    def close(self):
+        self._file.close()
+
+
+# Fungsi untuk menulis semua tabel ke satu file CSV, satu tabel setiap kali
+def write_csv_streaming(tables: Iterable[pd.DataFrame], path: str, columns: List):
+    """
+    Hasilnya sama seperti write_csv (kolom gabungan, sel kosong untuk kolom
+    yang tidak ada di sebuah tabel), tetapi tanpa pd.concat.
+    columns: gabungan kolom semua tabel (lihat TableSpool.columns)
+    """
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        pd.DataFrame(columns=columns).to_csv(f, index=False)
+        for table_df in tables:
+            table_df.reindex(columns=columns).to_csv(f, header=False, index=False)
+
+
+# Fungsi untuk mengambil daftar halaman asal sebuah tabel (tabel sambungan bisa lebih dari satu halaman)
+def table_pages(table_df: pd.DataFrame) -> List[int]:
+    if 'PDF_Halaman' not in table_df.columns or table_df.empty:
+        return []
+    return sorted({int(page) for page in table_df['PDF_Halaman']})
+
+
+# Fungsi untuk menulis setiap tabel sebagai file CSV terpisah di dalam satu arsip ZIP
+def write_csv_zip(tables: Iterable[pd.DataFrame], output, compress: bool = False) -> Dict:
+    """
+    Setiap tabel ditulis langsung ke entri ZIP saat dihasilkan, per CSV_CHUNK_ROWS
+    baris, sehingga CSV lengkap tidak pernah ada di memori.
+    compress=True: setiap entri berupa .csv.gz (disimpan tanpa kompresi ZIP lagi)
+    agar bisa dibaca langsung dengan pd.read_csv; default entri .csv dengan deflate.
+    Arsip juga berisi manifest.json: file, halaman, indeks tabel, baris dan kolom.
+    output: path atau file-like object yang bisa di-seek.
+    Returns: {'tables', 'rows', 'info'}
+    """
+    manifest = []
+    row_count = 0
+    member_compression = zipfile.ZIP_STORED if compress else zipfile.ZIP_DEFLATED
+    with zipfile.ZipFile(output, "w", compression=member_compression) as archive:
+        for i, table_df in enumerate(tables):
+            pages = table_pages(table_df)
+            halaman = pages[0] if pages else i + 1
+            name = f"halaman_{halaman}_tabel_{i+1}.csv" + (".gz" if compress else "")
+            table_index = (int(table_df['PDF_Tabel_Index'].iloc[0])
+                           if 'PDF_Tabel_Index' in table_df.columns and not table_df.empty else None)
+            
+            # ZipInfo eksplisit agar entri punya waktu pembuatan (default archive.open: 1980)
+            member_info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+            member_info.compress_type = member_compression
+            with archive.open(member_info, "w", force_zip64=True) as member:
+                raw = gzip.GzipFile(fileobj=member, mode="wb") if compress else member
+                with io.TextIOWrapper(raw, encoding="utf-8", newline="") as text:
+                    table_df.to_csv(text, index=False, chunksize=CSV_CHUNK_ROWS)
+                if compress:
+                    raw.close()  # TextIOWrapper menutup GzipFile, tapi GzipFile tidak menutup member
+            
+            manifest.append({
+                "file": name,
+                "halaman": pages,
+                "tabel": i + 1,
+                "pdf_tabel_index": table_index,
+                "baris": len(table_df),
+                "kolom": [str(column) for column in table_df.columns],
+            })
+            row_count += len(table_df)
+        
+        archive.writestr("manifest.json", json.dumps(manifest, ensure_ascii=False, indent=2),
+                         compress_type=zipfile.ZIP_DEFLATED)
+    
+    info = f"{len(manifest)} file CSV{' (gzip)' if compress else ''} dalam ZIP"
+    return {"tables": len(manifest), "rows": row_count, "info": info}
+
+
+# Fungsi untuk menulis tabel dari generator langsung ke file output
+def write_tables_streaming(tables: Iterable[pd.DataFrame], path: str, output_format: str,
+                           merge: bool = False, compress: bool = False) -> Dict:
+    """
+    Menulis tabel saat dihasilkan (mis. dari iter_extracted_tables) tanpa
+    menyimpan semuanya di memori.
+    output_format: 'xlsx', 'csv' (selalu satu file gabungan), 'zip' (satu CSV
+    per tabel, lihat write_csv_zip; compress untuk entri .csv.gz), 'parquet' atau 'arrows'.
+    xlsx dan zip ditulis langsung; format lain ditampung dulu di TableSpool
+    (disk) lalu ditulis dengan skema/kolom gabungan.
+    Returns: {'tables', 'rows', 'info'}
+    """
+    if output_format == "zip":
+        return write_csv_zip(tables, path, compress=compress)
+
+    if output_format == "xlsx":
+        table_count = row_count = 0
+        with StreamingExcelWriter(path, merge=merge) as writer:
+            for table_df in tables:
+                writer.add_table(table_df)
+                table_count += 1
+                row_count += len(table_df)
+            info = writer.close()
+        return {"tables": table_count, "rows": row_count, "info": info}
+
+    with TableSpool(tmp_dir=os.path.dirname(os.path.abspath(path))) as spool:
+        for table_df in tables:
+            spool.add(table_df)
+
+        if spool.table_count:
+            if output_format == "csv":
+                write_csv_streaming(spool, path, list(spool.columns))
+                info = "1 file CSV (tergabung)"
+            elif output_format == "parquet":
+                write_parquet(spool, path, schema=spool.arrow_schema())
+                info = f"{spool.table_count} row group"
+            else:
+                write_arrow(spool, path, schema=spool.arrow_schema())
+                info = f"{spool.table_count} batch"
+        else:
+            info = "tidak ada tabel"
+        return {"tables": spool.table_count, "rows": spool.row_count, "info": info}
@@ -0,0 +1,250 @@
+import os
+import time
+import uuid
+import logging
+import threading
+import traceback
+from collections import OrderedDict, deque
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Status job
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATES = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+# Jumlah job yang berjalan bersamaan (dibagi untuk semua pengguna)
+DEFAULT_MAX_WORKERS = int(os.environ.get("PDF2EXCEL_JOB_WORKERS", str(max(1, min(4, os.cpu_count() or 1)))))
+# Lama hasil job disimpan setelah selesai (detik)
+DEFAULT_RESULT_TTL = int(os.environ.get("PDF2EXCEL_JOB_TTL_MIN", "60")) * 60
+# Jumlah job selesai yang disimpan per pemilik (sesi)
+MAX_FINISHED_PER_OWNER = 3
+
+
+# Fungsi untuk menghitung jumlah proses ekstraksi paralel maksimal per job
+def job_process_budget(max_workers: int = DEFAULT_MAX_WORKERS) -> int:
+    """
+    CPU dibagi rata untuk job yang bisa berjalan bersamaan, sehingga semua job
+    yang berjalan tidak memakai lebih dari os.cpu_count() proses sekaligus.
+    """
+    return max(1, (os.cpu_count() or 1) // max(1, max_workers))
+
+
+class JobCancelled(Exception):
+    """
+    Dilempar dari dalam job (lewat report_progress) jika job dibatalkan
+    """
+
+
+class Job:
+    """
+    Satu pekerjaan di JobManager. Fungsi job menerima objek ini sebagai argumen
+    pertama untuk melaporkan progress (report_progress) dan peringatan (warn).
+    """
+
+    def __init__(self, job_id: str, owner: str, func: Callable, args: tuple, kwargs: dict, description: str = ""):
+        self.job_id = job_id
+        self.owner = owner
+        self.description = description
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.status = JOB_QUEUED
+        self.done = 0
+        self.total = 0
+        self.message = ""
+        self.warnings: List[str] = []
+        self.result = None
+        self.error: Optional[str] = None
+        self.error_traceback: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._cancel_event = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_event.is_set()
+
+    @property
+    def progress(self) -> float:
+        return min(1.0, self.done / self.total) if self.total else 0.0
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def report_progress(self, done: int, total: int, message: str = ""):
+        """
+        Dipanggil oleh fungsi job; sekaligus titik pembatalan
+        """
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+        self.done = done
+        self.total = total
+        if message:
+            self.message = message
+
+    def warn(self, message: str):
+        self.warnings.append(message)
+
+    def cancel(self):
+        self._cancel_event.set()
+
+
+class JobManager:
+    """
+    Antrian job lokal dengan sejumlah thread worker yang dipakai bersama semua sesi.
+    Job dipilih secara adil: pemilik dengan job berjalan paling sedikit didahulukan,
+    dan antar pemilik bergiliran (round-robin), sehingga satu pengguna dengan
+    banyak job tidak menahan pengguna lain.
+    Hasil job disimpan sampai result_ttl detik setelah selesai.
+    Fungsi job yang memakai process pool harus membatasi jumlah prosesnya dengan
+    process_budget agar total proses semua job tidak melebihi jumlah CPU.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, result_ttl: float = DEFAULT_RESULT_TTL):
+        self.max_workers = max(1, max_workers)
+        self.result_ttl = result_ttl
+        self._jobs: Dict[str, Job] = {}
+        self._queues: "OrderedDict[str, deque]" = OrderedDict()  # pemilik -> antrian job
+        self._running: Dict[str, int] = {}  # pemilik -> jumlah job berjalan
+        self._condition = threading.Condition()
+        self._threads = []
+        for i in range(self.max_workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"pdf2excel-job-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, owner: str, func: Callable, *args, description: str = "", **kwargs) -> str:
+        """
+        Menambahkan job ke antrian. func(job, *args, **kwargs) dijalankan di thread worker.
+        Returns: ID job
+        """
+        job = Job(uuid.uuid4().hex[:12], owner, func, args, kwargs, description)
+        with self._condition:
+            self._cleanup()
+            self._jobs[job.job_id] = job
+            self._queues.setdefault(owner, deque()).append(job)
+            self._condition.notify()
+        return job.job_id
+
+    @property
+    def process_budget(self) -> int:
+        return job_process_budget(self.max_workers)
+
+    def get(self, job_id: Optional[str]) -> Optional[Job]:
+        with self._condition:
+            self._cleanup()
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str):
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return
+            job.cancel()
+            queue = self._queues.get(job.owner)
+            if job.status == JOB_QUEUED and queue is not None and job in queue:
+                queue.remove(job)
+                job.finished_at = time.time()
+                job.status = JOB_CANCELLED
+
+    def queue_position(self, job_id: str) -> int:
+        """
+        Perkiraan posisi job di antrian (1 = berikutnya), 0 jika tidak menunggu
+        """
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != JOB_QUEUED:
+                return 0
+            # Simulasi giliran round-robin (urutan pemilik di self._queues)
+            queues = [list(queue) for queue in self._queues.values() if queue]
+            position = 0
+            while any(queues):
+                for queue in queues:
+                    if queue:
+                        position += 1
+                        if queue.pop(0) is job:
+                            return position
+            return 0
+
+    def stats(self) -> Dict:
+        with self._condition:
+            return {
+                "workers": self.max_workers,
+                "running": sum(self._running.values()),
+                "queued": sum(len(queue) for queue in self._queues.values()),
+            }
+
+    def _next_job(self) -> Optional[Job]:
+        # Dipanggil dengan self._condition terkunci
+        candidates = [owner for owner, queue in self._queues.items() if queue]
+        if not candidates:
+            return None
+        owner = min(candidates, key=lambda o: self._running.get(o, 0))  # min() stabil: urutan giliran
+        self._queues.move_to_end(owner)
+        return self._queues[owner].popleft()
+
+    def _worker_loop(self):
+        while True:
+            with self._condition:
+                job = self._next_job()
+                while job is None:
+                    self._condition.wait()
+                    job = self._next_job()
+                job.status = JOB_RUNNING
+                job.started_at = time.time()
+                self._running[job.owner] = self._running.get(job.owner, 0) + 1
+
+            # Hasil dan status ditulis bersama finished_at di bawah kunci, sehingga
+            # job yang terlihat selesai selalu punya finished_at (dipakai _cleanup)
+            status, result, error, error_traceback = JOB_FAILED, None, None, None
+            try:
+                result = job.func(job, *job.args, **job.kwargs)
+                status = JOB_DONE
+            except JobCancelled:
+                status = JOB_CANCELLED
+            except Exception as e:
+                logger.exception("Job %s gagal", job.job_id)
+                error = str(e)
+                error_traceback = traceback.format_exc()
+            finally:
+                with self._condition:
+                    job.result = result
+                    job.error = error
+                    job.error_traceback = error_traceback
+                    job.finished_at = time.time()
+                    job.status = status
+                    self._running[job.owner] -= 1
+                    if not self._running[job.owner]:
+                        del self._running[job.owner]
+                    if not self._queues.get(job.owner, True):
+                        del self._queues[job.owner]
+
+    def _cleanup(self):
+        # Dipanggil dengan self._condition terkunci: hapus hasil yang kedaluwarsa
+        now = time.time()
+        finished_by_owner: Dict[str, List[Job]] = {}
+        for job in list(self._jobs.values()):
+            if not job.finished or job.finished_at is None:
+                continue
+            if now - job.finished_at > self.result_ttl:
+                del self._jobs[job.job_id]
+            else:
+                finished_by_owner.setdefault(job.owner, []).append(job)
+
+        for jobs in finished_by_owner.values():
+            jobs.sort(key=lambda job: job.finished_at, reverse=True)
+            for job in jobs[MAX_FINISHED_PER_OWNER:]:
+                del self._jobs[job.job_id]
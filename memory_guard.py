@@ -0,0 +1,87 @@
+import gc
+import os
+import time
+import logging
+from typing import Optional
+
+try:
+    import psutil
+except ImportError:  # Tanpa psutil (lihat requirements.txt) RSS dibaca dari /proc, hanya di Linux
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+# Batas RSS proses dalam MB (0 = tanpa batas)
+DEFAULT_MEMORY_LIMIT_MB = int(os.environ.get("PDF2EXCEL_MEMORY_LIMIT_MB", "0"))
+# Jeda menunggu memori turun sebelum menyerah (detik, berlipat dua setiap percobaan)
+BACKOFF_DELAYS = (0.5, 1.0, 2.0)
+
+
+class MemoryLimitError(Exception):
+    """
+    Dilempar jika pemakaian memori tetap di atas batas setelah back-off
+    """
+
+
+# Fungsi untuk membaca RSS (resident set size) proses saat ini
+def current_rss_mb() -> Optional[float]:
+    """
+    Returns: RSS dalam MB, atau None jika tidak bisa dibaca di platform ini
+    """
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024  # Nilai dalam kB
+    except OSError:
+        pass
+    return None
+
+
+class MemoryGuard:
+    """
+    Memeriksa RSS proses di antara halaman. Jika melewati limit_mb, guard
+    mundur dulu (garbage collection, lalu menunggu sebentar agar job lain di
+    proses yang sama selesai melepas memori) dan baru melempar MemoryLimitError
+    jika memori tetap di atas batas. Dengan begitu konversi berhenti dengan
+    pesan yang jelas, bukan dimatikan oleh OOM killer.
+    limit_mb <= 0 atau RSS yang tidak bisa dibaca (tanpa psutil di luar Linux):
+    guard tidak melakukan apa-apa.
+    """
+
+    def __init__(self, limit_mb: float = DEFAULT_MEMORY_LIMIT_MB):
+        self.limit_mb = limit_mb
+        self.peak_mb = 0.0
+        self.backoffs = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.limit_mb > 0
+
+    def check(self, page_num: Optional[int] = None):
+        if not self.enabled:
+            return
+        rss = current_rss_mb()
+        if rss is None:
+            return
+        self.peak_mb = max(self.peak_mb, rss)
+        if rss <= self.limit_mb:
+            return
+
+        self.backoffs += 1
+        logger.warning("RSS %.0f MB melebihi batas %.0f MB (halaman %s), menunggu memori dilepas",
+                       rss, self.limit_mb, page_num)
+        for delay in (0.0,) + BACKOFF_DELAYS:
+            time.sleep(delay)
+            gc.collect()
+            rss = current_rss_mb()
+            if rss is None or rss <= self.limit_mb:
+                return
+
+        raise MemoryLimitError(
+            f"Pemakaian memori {rss:.0f} MB melebihi batas {self.limit_mb:.0f} MB"
+            + (f" saat memproses halaman {page_num}" if page_num is not None else "")
+            + ". Pilih lebih sedikit halaman atau naikkan batas memori."
+        )
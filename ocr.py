@@ -0,0 +1,173 @@
+import os
+import time
+import shutil
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import List, Dict, Optional, Tuple
+
+import PyPDF2
+import pypdfium2 as pdfium
+
+from text_layout import page_content, content_features, extract_text_tables
+from page_analysis import SCANNED_MIN_IMAGE_COVERAGE
+
+try:
+    import pytesseract
+except ImportError:  # OCR opsional: butuh paket pytesseract dan program tesseract
+    pytesseract = None
+
+# Resolusi render halaman untuk OCR (dpi)
+OCR_RESOLUTION = 300
+# Bahasa Tesseract (paket bahasa harus terpasang)
+OCR_LANGUAGE = os.environ.get("PDF2EXCEL_OCR_LANG", "ind+eng")
+# psm 6: halaman dibaca sebagai satu blok teks seragam, baris tabel tetap satu baris
+OCR_CONFIG = "--psm 6"
+# Kunci pengaturan TableStore/cache disk untuk hasil OCR (berbeda per bahasa dan resolusi)
+OCR_SETTINGS_KEY = f"ocr-tesseract-{OCR_LANGUAGE}-{OCR_RESOLUTION}dpi"
+
+
+# Fungsi untuk mengecek apakah OCR bisa dipakai (pytesseract dan program tesseract terpasang)
+def ocr_available() -> bool:
+    return pytesseract is not None and shutil.which(pytesseract.pytesseract.tesseract_cmd) is not None
+
+
+# Fungsi untuk menghitung luas gambar terbesar di halaman PyPDF2 (rasio luas halaman)
+def image_coverage(page, content=None) -> float:
+    """
+    Luas gambar dihitung dari matriks CTM saat gambar digambar (gambar PDF
+    selalu persegi satuan yang ditransformasi CTM); Form XObject tidak dihitung.
+    """
+    if content is None:
+        content = page_content(page)
+    page_area = float(page.mediabox.width) * float(page.mediabox.height)
+    if content is None or page_area <= 0:
+        return 0.0
+
+    resources = page.get("/Resources")
+    xobjects = resources.get_object().get("/XObject", {}) if resources is not None else {}
+    xobjects = xobjects.get_object() if hasattr(xobjects, "get_object") else xobjects
+
+    cm = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
+    stack = []
+    largest = 0.0
+    for operands, operator in content.operations:
+        try:
+            if operator == b"q":
+                stack.append(cm)
+            elif operator == b"Q":
+                if stack:
+                    cm = stack.pop()
+            elif operator == b"cm":
+                a, b, c, d, e, f = [float(v) for v in operands]
+                cm = [
+                    a * cm[0] + b * cm[2], a * cm[1] + b * cm[3],
+                    c * cm[0] + d * cm[2], c * cm[1] + d * cm[3],
+                    e * cm[0] + f * cm[2] + cm[4], e * cm[1] + f * cm[3] + cm[5],
+                ]
+            elif operator in (b"Do", b"INLINE IMAGE"):
+                if operator == b"Do":
+                    xobject = xobjects.get(operands[0])
+                    if xobject is None or xobject.get_object().get("/Subtype") != "/Image":
+                        continue
+                largest = max(largest, abs(cm[0] * cm[3] - cm[1] * cm[2]))
+        except (ValueError, TypeError, IndexError, KeyError):
+            continue
+    return min(1.0, largest / page_area)
+
+
+# Fungsi untuk mendeteksi halaman hasil scan (tanpa teks, satu gambar besar)
+def is_scanned_page(page, content=None) -> bool:
+    """
+    Hanya membaca operator content stream (tanpa analisis layout), sehingga
+    murah untuk semua halaman. PDF hasil scan yang sudah punya lapisan teks
+    OCR tidak dianggap scan: teksnya diproses seperti halaman digital.
+    """
+    if content is None:
+        content = page_content(page)
+    features = content_features(content)
+    if features["text_ops"] or not features["images"]:
+        return False
+    return image_coverage(page, content) >= SCANNED_MIN_IMAGE_COVERAGE
+
+
+# Fungsi untuk mencari halaman hasil scan di antara halaman yang diminta
+def find_scanned_pages(pdf_file, page_numbers) -> List[int]:
+    pdf_reader = PyPDF2.PdfReader(pdf_file)
+    return [page_num for page_num in page_numbers
+            if page_num <= len(pdf_reader.pages) and is_scanned_page(pdf_reader.pages[page_num - 1])]
+
+
+# Fungsi untuk mengubah output image_to_data Tesseract menjadi kata berposisi (point PDF)
+def tesseract_words(data: Dict, scale: float) -> List[Dict]:
+    """
+    data: hasil pytesseract.image_to_data(..., output_type=Output.DICT) (piksel)
+    scale: point per piksel (72 / dpi)
+    Kata dalam satu baris Tesseract diberi bottom dan ukuran yang sama (tinggi
+    baris), seperti baseline dan ukuran font pada kata dari page_words, agar
+    huruf tanpa/ dengan kaki (mis. "no" dan "Kg") tetap satu baris.
+    Returns: kata {'text', 'x0', 'x1', 'top', 'bottom', 'size'}
+    """
+    lines: Dict[Tuple, List[int]] = {}
+    for i, text in enumerate(data["text"]):
+        if data["level"][i] == 5 and text and text.strip():
+            key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+            lines.setdefault(key, []).append(i)
+
+    words = []
+    for indices in lines.values():
+        bottom = max(data["top"][i] + data["height"][i] for i in indices) * scale
+        size = max(data["height"][i] for i in indices) * scale
+        for i in indices:
+            words.append({
+                "text": data["text"][i].strip(),
+                "x0": data["left"][i] * scale,
+                "x1": (data["left"][i] + data["width"][i]) * scale,
+                "top": bottom - size,
+                "bottom": bottom,
+                "size": size,
+            })
+    return words
+
+
+# Fungsi untuk OCR satu halaman dan menyusun tabelnya (dijalankan di proses worker)
+def ocr_page_tables(pdf_path: str, page_num: int, language: str = OCR_LANGUAGE,
+                    resolution: int = OCR_RESOLUTION) -> Tuple[List[List[List]], List[Dict], float]:
+    """
+    Halaman dirender dengan pdfium, dibaca dengan Tesseract, lalu kolom disusun
+    dari posisi kata dengan text_layout.extract_text_tables (sama seperti
+    backend PyPDF2 untuk tabel tanpa garis).
+    Returns: (tabel_mentah, layout_tabel, detik)
+    """
+    start = time.perf_counter()
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        page = pdf[page_num - 1]
+        page_width, page_height = page.get_size()
+        image = page.render(scale=resolution / 72).to_pil()
+        page.close()
+    finally:
+        pdf.close()
+
+    data = pytesseract.image_to_data(image, lang=language, config=OCR_CONFIG,
+                                     output_type=pytesseract.Output.DICT)
+    # Baris yang jaraknya sedikit berbeda antar kolom tetap digabung (toleransi mengikuti resolusi)
+    tables, layouts = extract_text_tables(tesseract_words(data, 72 / resolution), page_width, page_height,
+                                          line_tolerance=4.0)
+    return tables, layouts, time.perf_counter() - start
+
+
+# Fungsi untuk memulai OCR halaman-halaman hasil scan di process pool terpisah
+def submit_ocr_pages(pdf_path: str, page_numbers: List[int], workers: int = 1,
+                     language: str = OCR_LANGUAGE) -> Tuple[ProcessPoolExecutor, Dict[int, Future]]:
+    """
+    Semua halaman langsung dikirim ke pool, sehingga OCR berjalan bersamaan
+    dengan ekstraksi halaman digital di proses utama.
+    Pemanggil wajib memanggil executor.shutdown() (cancel_futures=True jika berhenti lebih awal).
+    Returns: (executor, {nomor_halaman: Future (tabel_mentah, layout_tabel, detik)})
+    """
+    # "spawn" agar aman dipakai dari server multi-thread seperti Streamlit
+    executor = ProcessPoolExecutor(max_workers=max(1, min(workers, len(page_numbers))),
+                                   mp_context=multiprocessing.get_context("spawn"))
+    futures = {page_num: executor.submit(ocr_page_tables, pdf_path, page_num, language)
+               for page_num in page_numbers}
+    return executor, futures
@@ -0,0 +1,174 @@
+import dataclasses
+from typing import List, Dict, Optional, Tuple
+
+from pdfplumber.table import TableSettings
+
+# Hasil klasifikasi halaman
+PAGE_NO_TABLE = "no_table"                # Tidak mungkin ada tabel sama sekali
+PAGE_BELOW_THRESHOLD = "below_threshold"  # Mungkin ada tabel, tapi terlalu kecil untuk threshold deteksi
+PAGE_CANDIDATE = "candidate"              # Perlu dianalisis dengan table finder
+PAGE_SCANNED = "scanned"                  # Hasil scan: tanpa teks, satu gambar besar (butuh OCR)
+
+# Minimal luas gambar terbesar (rasio luas halaman) agar halaman tanpa teks dianggap hasil scan
+SCANNED_MIN_IMAGE_COVERAGE = 0.5
+
+# Preset table_settings pdfplumber
+PRESET_DEFAULT = "default"
+PRESET_LINES = "lines"
+PRESET_TEXT = "text"
+TABLE_SETTINGS_PRESETS = {
+    # Pengaturan bawaan page.extract_tables()
+    PRESET_DEFAULT: {},
+    # Tabel bergaris: hanya garis/kotak, potongan garis pendek (garis bawah, tanda) diabaikan
+    PRESET_LINES: {
+        "vertical_strategy": "lines",
+        "horizontal_strategy": "lines",
+        "edge_min_length": 10,
+    },
+    # Tabel tanpa garis (mis. rekening koran): kolom dan baris dari posisi teks
+    PRESET_TEXT: {
+        "vertical_strategy": "text",
+        "horizontal_strategy": "text",
+        "snap_tolerance": 3,
+        "join_tolerance": 3,
+        "min_words_vertical": 3,
+        "min_words_horizontal": 1,
+        "text_x_tolerance": 2,
+        "text_y_tolerance": 2,
+    },
+}
+PRESET_LABELS = {
+    PRESET_DEFAULT: "Default pdfplumber",
+    PRESET_LINES: "Garis saja (tabel bergaris)",
+    PRESET_TEXT: "Teks (tabel tanpa garis)",
+}
+
+
+# Fungsi untuk melengkapi table_settings dengan nilai default pdfplumber
+def resolve_table_settings(table_settings: Optional[Dict] = None) -> Dict:
+    """
+    Returns: semua pengaturan table finder sebagai dict (nilai yang tidak diisi
+    memakai default pdfplumber), sehingga pengaturan yang setara punya bentuk yang sama.
+    Melempar ValueError untuk kunci atau strategi yang tidak dikenal.
+    """
+    return dataclasses.asdict(TableSettings.resolve(table_settings or {}))
+
+
+# Fungsi untuk menentukan pre-filter yang aman untuk table_settings
+def prefilter_strategy(table_settings: Optional[Dict] = None) -> Optional[str]:
+    """
+    Returns: "lines" jika kedua arah memakai garis, "text" jika kedua arah memakai
+    posisi teks, None jika campuran/explicit (pre-filter tidak dipakai)
+    """
+    resolved = resolve_table_settings(table_settings)
+    strategies = {resolved["vertical_strategy"], resolved["horizontal_strategy"]}
+    if strategies <= {"lines", "lines_strict"}:
+        return "lines"
+    if strategies == {"text"}:
+        return "text"
+    return None
+
+
+# Fungsi untuk menghitung posisi unik (dengan toleransi) dari sekumpulan koordinat
+def _count_positions(values: List[float], tolerance: float = 1.0) -> int:
+    count = 0
+    last = None
+    for value in sorted(values):
+        if last is None or value - last > tolerance:
+            count += 1
+        last = value
+    return count
+
+
+# Fungsi untuk mengambil fitur murah dari halaman
+def page_features(page, strategy: str = "lines") -> Dict:
+    """
+    Fitur murah sebuah halaman pdfplumber: jumlah posisi garis horizontal dan
+    vertikal (dari line, rect, curve), jumlah karakter, luas gambar terbesar
+    (rasio luas halaman) dan, untuk strategi teks, jumlah karakter yang bukan spasi.
+    """
+    edges = page.edges
+    page_area = float(page.width * page.height) or 1.0
+    features = {
+        "h_positions": _count_positions([e["top"] for e in edges if e["orientation"] == "h"]),
+        "v_positions": _count_positions([e["x0"] for e in edges if e["orientation"] == "v"]),
+        "chars": len(page.chars),
+        "image_coverage": max((float(img["width"] * img["height"]) / page_area for img in page.images), default=0.0),
+    }
+    if strategy == "text":
+        features["text_chars"] = sum(1 for char in page.chars if char.get("text", "").strip())
+    return features
+
+
+# Fungsi untuk mengklasifikasi halaman sebelum table finder dijalankan
+def classify_page(features: Dict, min_rows: Optional[int] = None, strategy: str = "lines") -> str:
+    """
+    Mengklasifikasi halaman dari fitur murahnya.
+    Untuk strategi garis (default pdfplumber) batasnya pasti: tabel dengan N baris
+    butuh minimal N+1 posisi garis horizontal, dan 2 kolom butuh 3 garis vertikal.
+    Jumlah posisi dihitung dengan toleransi kecil sehingga tidak pernah kurang
+    dari yang dilihat table finder.
+    Untuk strategi teks hanya halaman tanpa teks yang pasti tidak punya tabel;
+    jumlah baris/kolom dari posisi teks tidak bisa diperkirakan lebih murah dari
+    table finder itu sendiri, sehingga threshold tidak dipakai untuk pre-filter.
+    min_rows: threshold baris dari deteksi (None = tidak ada syarat minimal)
+    Halaman hasil scan (PAGE_SCANNED) dikenali dulu untuk semua strategi.
+    """
+    if not features["chars"] and features["image_coverage"] >= SCANNED_MIN_IMAGE_COVERAGE:
+        return PAGE_SCANNED
+    if strategy == "text":
+        return PAGE_CANDIDATE if features["text_chars"] else PAGE_NO_TABLE
+
+    rows = features["h_positions"] - 1
+    cols = features["v_positions"] - 1
+    if rows < 1 or cols < 1:
+        return PAGE_NO_TABLE
+    if min_rows is not None and (rows < max(min_rows, 2) or cols < 2):
+        return PAGE_BELOW_THRESHOLD
+    return PAGE_CANDIDATE
+
+
+# Fungsi untuk mengambil posisi tabel dan batas kolomnya (dipakai untuk menyambung tabel lintas halaman)
+def table_layout(table, page) -> Dict:
+    """
+    Returns: {'bbox': [x0, top, x1, bottom], 'columns': [x0 setiap kolom..., x1 kolom terakhir],
+    'page_height': tinggi halaman}
+    """
+    columns = [round(column.bbox[0], 2) for column in table.columns]
+    columns.append(round(table.bbox[2], 2))
+    return {
+        "bbox": [round(value, 2) for value in table.bbox],
+        "columns": columns,
+        "page_height": round(page.height, 2),
+    }
+
+
+# Fungsi untuk mengekstrak tabel satu halaman dengan pre-filter
+def extract_page_tables(page, min_rows: Optional[int] = None,
+                        table_settings: Optional[Dict] = None) -> Tuple[List[List[List]], bool, List[Dict]]:
+    """
+    Mengekstrak tabel mentah dari satu halaman, melewati table finder jika
+    pre-filter memastikan halaman tidak punya tabel (yang memenuhi threshold)
+    atau halaman adalah hasil scan. Pre-filter mengikuti strategi table_settings
+    (lihat prefilter_strategy).
+    Returns: (tabel_mentah, lengkap, layout_tabel). lengkap=False berarti halaman dilewati
+    hanya karena threshold, sehingga hasilnya tidak boleh disimpan di cache.
+    layout_tabel: posisi setiap tabel (lihat table_layout), sejajar dengan tabel_mentah
+    """
+    strategy = prefilter_strategy(table_settings)
+    verdict = classify_page(page_features(page, strategy or "lines"), min_rows, strategy or "lines")
+    # Halaman hasil scan tidak punya teks untuk table finder (lihat ocr.py), apa pun strateginya
+    if verdict == PAGE_SCANNED:
+        return [], True, []
+    if strategy is not None:
+        if verdict == PAGE_NO_TABLE:
+            return [], True, []
+        if verdict == PAGE_BELOW_THRESHOLD:
+            return [], False, []
+
+    # Sama seperti page.extract_tables(), tapi posisi tabel ikut disimpan
+    resolved = TableSettings.resolve(table_settings or {})
+    found_tables = page.find_tables(resolved)
+    tables = [table.extract(**(resolved.text_settings or {})) for table in found_tables]
+    layouts = [table_layout(table, page) for table in found_tables]
+    return tables, True, layouts
@@ -0,0 +1,138 @@
+import threading
+from io import BytesIO
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, List, Optional
+
+import pypdfium2 as pdfium
+
+# Resolusi gambar preview (dpi); cukup untuk melihat tata letak halaman
+PREVIEW_RESOLUTION = 60
+# Jumlah halaman preview yang disimpan per dokumen
+DEFAULT_MAX_PAGES = 64
+# Jumlah halaman tetangga (sebelum dan sesudah) yang disiapkan di background
+DEFAULT_PREFETCH_RADIUS = 2
+
+# pdfium tidak thread-safe, bahkan untuk dokumen yang berbeda (dipakai bersama semua sesi)
+_PDFIUM_LOCK = threading.Lock()
+
+
+class PagePreviewCache:
+    """
+    Preview halaman (teks dan gambar JPEG resolusi rendah) yang dibuat hanya saat
+    diminta, disimpan untuk max_pages halaman terakhir, dan halaman tetangganya
+    disiapkan di background. Semua rendering berjalan di satu thread worker
+    dengan dokumen pdfium sendiri, sehingga tidak memakai handle pdfplumber sesi.
+    """
+
+    def __init__(self, pdf_bytes: bytes, document_id: Optional[str] = None,
+                 max_pages: int = DEFAULT_MAX_PAGES,
+                 prefetch_radius: int = DEFAULT_PREFETCH_RADIUS,
+                 resolution: int = PREVIEW_RESOLUTION):
+        self.document_id = document_id
+        self.max_pages = max(1, max_pages)
+        self.prefetch_radius = prefetch_radius
+        self.resolution = resolution
+        self._pdf_bytes = pdf_bytes
+        self._pdf = None  # Dibuka di thread worker saat pertama dipakai
+        self._cache: "OrderedDict[int, Dict]" = OrderedDict()
+        self._pending: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-preview")
+
+        with _PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(pdf_bytes)
+            self.total_pages = len(pdf)
+            pdf.close()
+
+    def get(self, page_num: int) -> Dict:
+        """
+        Mengambil preview satu halaman (1-based), menunggu jika belum siap.
+        Returns: {'page', 'text', 'words', 'lines', 'image', 'width', 'height'}
+        """
+        if page_num < 1 or page_num > self.total_pages:
+            raise IndexError(f"Halaman {page_num} tidak ada (total {self.total_pages})")
+
+        with self._lock:
+            preview = self._cache.get(page_num)
+            if preview is not None:
+                self._cache.move_to_end(page_num)
+            else:
+                future = self._submit(page_num)
+
+        if preview is None:
+            preview = future.result()
+        self.prefetch(page_num)
+        return preview
+
+    def prefetch(self, page_num: int):
+        """
+        Menyiapkan halaman di sekitar page_num; prefetch lama yang belum
+        berjalan dan tidak lagi di sekitar halaman ini dibatalkan.
+        """
+        wanted: List[int] = []
+        for distance in range(1, self.prefetch_radius + 1):
+            for neighbour in (page_num + distance, page_num - distance):
+                if 1 <= neighbour <= self.total_pages:
+                    wanted.append(neighbour)
+
+        with self._lock:
+            for pending_page, future in list(self._pending.items()):
+                if pending_page != page_num and pending_page not in wanted and future.cancel():
+                    del self._pending[pending_page]
+            for neighbour in wanted:
+                if neighbour not in self._cache:
+                    self._submit(neighbour)
+
+    def _submit(self, page_num: int) -> Future:
+        # Dipanggil dengan self._lock terkunci
+        future = self._pending.get(page_num)
+        if future is None:
+            future = self._executor.submit(self._render, page_num)
+            self._pending[page_num] = future
+        return future
+
+    def _render(self, page_num: int) -> Dict:
+        try:
+            with _PDFIUM_LOCK:
+                if self._pdf is None:
+                    self._pdf = pdfium.PdfDocument(self._pdf_bytes)
+                page = self._pdf[page_num - 1]
+                try:
+                    text_page = page.get_textpage()
+                    text = text_page.get_text_bounded().replace("\r\n", "\n")
+                    text_page.close()
+                    image = page.render(scale=self.resolution / 72).to_pil()
+                finally:
+                    page.close()
+
+            # Kompresi JPEG tidak perlu memegang kunci pdfium
+            output = BytesIO()
+            image.save(output, format="JPEG", quality=75)
+            preview = {
+                "page": page_num,
+                "text": text,
+                "words": len(text.split()),
+                "lines": len(text.splitlines()),
+                "image": output.getvalue(),
+                "width": image.width,
+                "height": image.height,
+            }
+
+            with self._lock:
+                self._cache[page_num] = preview
+                while len(self._cache) > self.max_pages:
+                    self._cache.popitem(last=False)
+            return preview
+        finally:
+            with self._lock:
+                self._pending.pop(page_num, None)
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        with _PDFIUM_LOCK:
+            if self._pdf is not None:
+                self._pdf.close()
+                self._pdf = None
+        with self._lock:
+            self._cache.clear()
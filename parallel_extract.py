@@ -0,0 +1,100 @@
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import List, Dict, Optional, Iterator, Tuple
+
+import pdfplumber
+
+from page_analysis import extract_page_tables
+from profiling import StageProfiler, NULL_PROFILER, STAGE_OPEN, STAGE_TABLE_FINDING
+
+# Di bawah jumlah halaman ini, biaya start proses lebih besar dari keuntungannya
+MIN_PAGES_FOR_PARALLEL = 4
+
+
+def extract_page_range(pdf_path: str, page_numbers: List[int], min_rows: Optional[int] = None,
+                       profile: bool = False, trace_memory: bool = False,
+                       table_settings: Optional[Dict] = None) -> Tuple[List[Tuple], List[Dict]]:
+    """
+    Dijalankan di proses worker: membuka PDF sendiri dan mengekstrak tabel
+    dari halaman-halaman yang diberikan (dengan pre-filter, lihat extract_page_tables).
+    Returns: (List (nomor_halaman, tabel_mentah, lengkap, layout_tabel), catatan_profil);
+    tabel_mentah None jika halaman tidak ada
+    """
+    profiler = StageProfiler(trace_memory=trace_memory) if profile else NULL_PROFILER
+    if profile:
+        profiler.start()
+
+    results = []
+    try:
+        with profiler.stage(STAGE_OPEN):
+            pdf = pdfplumber.open(pdf_path)
+        with pdf:
+            for page_num in page_numbers:
+                page_idx = page_num - 1
+                if page_idx >= len(pdf.pages):
+                    results.append((page_num, None, True, None))
+                    continue
+
+                page = pdf.pages[page_idx]
+                with profiler.stage(STAGE_TABLE_FINDING, page_num):
+                    tables, complete, layouts = extract_page_tables(page, min_rows, table_settings)
+                results.append((page_num, tables, complete, layouts))
+                # Lepaskan objek layout halaman yang sudah selesai
+                page.close()
+    finally:
+        if profile:
+            profiler.stop()
+
+    return results, list(profiler.records)
+
+
+def split_pages(page_numbers: List[int], workers: int) -> List[List[int]]:
+    """
+    Membagi daftar halaman menjadi potongan kecil (sekitar 4 potongan per worker)
+    agar beban merata dan progress bisa diperbarui sering
+    """
+    chunk_size = max(1, min(16, math.ceil(len(page_numbers) / (workers * 4))))
+    return [page_numbers[i:i + chunk_size] for i in range(0, len(page_numbers), chunk_size)]
+
+
+def iter_page_tables_parallel(pdf_path: str, page_numbers: List[int], workers: int,
+                              min_rows: Optional[int] = None,
+                              profiler=NULL_PROFILER,
+                              table_settings: Optional[Dict] = None) -> Iterator[Tuple[int, Optional[List[List[List]]], bool, Optional[List[Dict]]]]:
+    """
+    Mengekstrak tabel dari banyak halaman dengan process pool.
+    Hasil dikirim kembali sesuai urutan page_numbers segera setelah
+    potongan halaman sebelumnya selesai.
+    Catatan profil dari worker diteruskan ke profiler (jika aktif).
+    table_settings: pengaturan table finder pdfplumber (None = default)
+    """
+    chunks = split_pages(list(page_numbers), workers)
+    # "spawn" agar aman dipakai dari server multi-thread seperti Streamlit
+    executor = ProcessPoolExecutor(
+        max_workers=min(workers, len(chunks)),
+        mp_context=multiprocessing.get_context("spawn")
+    )
+    try:
+        futures = {executor.submit(extract_page_range, pdf_path, chunk, min_rows,
+                                   profiler.enabled, getattr(profiler, "trace_memory", False),
+                                   table_settings): chunk_idx
+                   for chunk_idx, chunk in enumerate(chunks)}
+        pending = set(futures)
+        finished = {}
+        next_chunk = 0
+
+        while next_chunk < len(chunks):
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                results, records = future.result()
+                for record in records:
+                    profiler.add_record({**record, "worker": True})
+                finished[futures[future]] = results
+
+            # Kirim hasil yang sudah berurutan
+            while next_chunk in finished:
+                yield from finished.pop(next_chunk)
+                next_chunk += 1
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,170 @@
+import sys
+import json
+import time
+import logging
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import List, Dict, Optional
+
+# Nama tahap yang diukur
+STAGE_OPEN = "open"
+STAGE_TABLE_FINDING = "table_finding"
+STAGE_DATAFRAME = "dataframe"
+STAGE_CLEANING = "cleaning"
+STAGE_TYPE_INFERENCE = "type_inference"
+STAGE_SERIALIZATION = "serialization"
+
+profile_logger = logging.getLogger("pdf2excel.profile")
+
+# tracemalloc berlaku untuk seluruh proses: dimulai oleh profiler pertama dan
+# dihentikan oleh profiler terakhir yang selesai (job diagnostik bisa bersamaan)
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_owned = False  # False jika tracemalloc sudah dimulai pihak lain
+
+
+# Fungsi untuk mulai memakai tracemalloc (dihitung per pemakai)
+def _acquire_tracing():
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        if _tracing_users == 0:
+            _tracing_owned = not tracemalloc.is_tracing()
+            if _tracing_owned:
+                tracemalloc.start()
+        _tracing_users += 1
+
+
+# Fungsi untuk berhenti memakai tracemalloc; dihentikan jika tidak ada pemakai lagi
+def _release_tracing():
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _tracing_owned:
+            tracemalloc.stop()
+            _tracing_owned = False
+
+
+# Fungsi untuk memastikan log profil (JSON per baris) benar-benar ditulis
+def enable_json_logging(stream=None):
+    if not profile_logger.handlers:
+        handler = logging.StreamHandler(stream or sys.stderr)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        profile_logger.addHandler(handler)
+    profile_logger.setLevel(logging.INFO)
+    profile_logger.propagate = False
+
+
+class StageProfiler:
+    """
+    Mencatat waktu (wall time) dan, jika trace_memory=True, puncak alokasi memori
+    Python (tracemalloc) untuk setiap tahap dan halaman.
+    Setiap catatan juga dikirim sebagai log JSON jika log_json=True.
+    Tahap tidak boleh bersarang karena puncak memori di-reset di awal tahap.
+    Puncak memori diukur untuk seluruh proses: jika beberapa profiler dengan
+    trace_memory berjalan bersamaan (mis. job diagnostik dari beberapa sesi),
+    peak_mb ikut menghitung alokasi job lain dan hanya bisa dipakai sebagai
+    perkiraan. Waktu per tahap tidak terpengaruh.
+    """
+
+    def __init__(self, trace_memory: bool = False, log_json: bool = False, context: Optional[Dict] = None):
+        self.trace_memory = trace_memory
+        self.log_json = log_json
+        self.context = context or {}
+        self.records: List[Dict] = []
+        self._started_tracing = False
+        if log_json:
+            enable_json_logging()
+
+    @property
+    def enabled(self) -> bool:
+        return True
+
+    def start(self):
+        if self.trace_memory and not self._started_tracing:
+            _acquire_tracing()
+            self._started_tracing = True
+
+    def stop(self):
+        if self._started_tracing:
+            _release_tracing()
+            self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str, page: Optional[int] = None, **extra):
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            base_memory = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = {"stage": name, "page": page, "seconds": time.perf_counter() - start}
+            if tracing:
+                record["peak_mb"] = max(0, tracemalloc.get_traced_memory()[1] - base_memory) / (1024 * 1024)
+            record.update(extra)
+            self.add_record(record)
+
+    def add_record(self, record: Dict):
+        """
+        Menambahkan catatan (juga dipakai untuk catatan dari proses worker)
+        """
+        self.records.append(record)
+        if self.log_json:
+            profile_logger.info(json.dumps({**self.context, **record}, default=str))
+
+    def stage_summary(self) -> List[Dict]:
+        """
+        Ringkasan per tahap: jumlah, total, rata-rata dan maksimum waktu, puncak memori
+        """
+        summary: Dict[str, Dict] = {}
+        for record in self.records:
+            item = summary.setdefault(record["stage"], {
+                "stage": record["stage"], "count": 0, "total_seconds": 0.0, "max_seconds": 0.0, "peak_mb": None
+            })
+            item["count"] += 1
+            item["total_seconds"] += record["seconds"]
+            item["max_seconds"] = max(item["max_seconds"], record["seconds"])
+            if record.get("peak_mb") is not None:
+                item["peak_mb"] = max(item["peak_mb"] or 0.0, record["peak_mb"])
+
+        for item in summary.values():
+            item["mean_seconds"] = item["total_seconds"] / item["count"]
+        return list(summary.values())
+
+    def slowest_pages(self, limit: int = 10) -> List[Dict]:
+        """
+        Halaman dengan total waktu terbesar (semua tahap yang punya nomor halaman)
+        """
+        pages: Dict[int, Dict] = {}
+        for record in self.records:
+            if record.get("page") is None:
+                continue
+            item = pages.setdefault(record["page"], {"page": record["page"], "seconds": 0.0, "peak_mb": None})
+            item["seconds"] += record["seconds"]
+            item[record["stage"]] = item.get(record["stage"], 0.0) + record["seconds"]
+            if record.get("peak_mb") is not None:
+                item["peak_mb"] = max(item["peak_mb"] or 0.0, record["peak_mb"])
+        return sorted(pages.values(), key=lambda item: item["seconds"], reverse=True)[:limit]
+
+
+class NullProfiler:
+    """
+    Profiler kosong yang dipakai jika instrumentasi tidak diaktifkan
+    """
+    records: List[Dict] = []
+
+    @property
+    def enabled(self) -> bool:
+        return False
+
+    @contextmanager
+    def stage(self, name: str, page: Optional[int] = None, **extra):
+        yield
+
+    def add_record(self, record: Dict):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
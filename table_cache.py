@@ -0,0 +1,179 @@
+import os
+import json
+import hashlib
+import tempfile
+from typing import List, Dict, Optional, Tuple
+
+import pyarrow as pa
+
+# Versi format cache; naikkan jika struktur file berubah
+CACHE_VERSION = 2
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "PDF2EXCEL_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "pdf2excel_cache")
+)
+DEFAULT_MAX_BYTES = int(os.environ.get("PDF2EXCEL_CACHE_MAX_MB", "500")) * 1024 * 1024
+
+# Skema Arrow untuk tabel mentah: satu record per baris tabel
+# (posisi tabel disimpan sebagai JSON di metadata skema, kunci b"layouts")
+RAW_TABLE_SCHEMA = pa.schema([
+    ("table_index", pa.int32()),
+    ("cells", pa.list_(pa.string())),
+])
+
+
+class TableDiskCache:
+    """
+    Cache tabel mentah di disk, lintas sesi dan rerun Streamlit.
+    Kunci: hash isi PDF, pengaturan ekstraksi (metode + parameter) dan nomor halaman.
+    Setiap halaman disimpan sebagai satu file Arrow IPC; ukuran total dibatasi
+    dengan eviksi LRU berdasarkan waktu akses terakhir (mtime).
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = os.path.join(cache_dir, f"v{CACHE_VERSION}")
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._approx_size = self._scan_size()
+
+    def _document_dir(self, document_id: str) -> str:
+        return os.path.join(self.cache_dir, document_id[:2], document_id)
+
+    def _page_path(self, document_id: str, settings_key: str, page_num: int) -> str:
+        settings_hash = hashlib.sha1(settings_key.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self._document_dir(document_id), settings_hash, f"p{page_num:05d}.arrow")
+
+    def _meta_path(self, document_id: str) -> str:
+        return os.path.join(self._document_dir(document_id), "meta.json")
+
+    def _iter_files(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                yield os.path.join(root, name)
+
+    def _scan_size(self) -> int:
+        total = 0
+        for path in self._iter_files():
+            try:
+                total += os.path.getsize(path)
+            except OSError:
+                pass
+        return total
+
+    def _write_atomic(self, path: str, write_func) -> int:
+        # Tulis ke file sementara lalu rename, agar aman dipakai beberapa proses
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write_func(f)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+        return os.path.getsize(path)
+
+    def get(self, document_id: str, settings_key: str,
+            page_num: int) -> Optional[Tuple[List[List[List]], List[Optional[Dict]]]]:
+        """
+        Mengambil tabel mentah satu halaman dari cache.
+        Returns: (List tabel (list baris berisi sel), List layout per tabel),
+        atau None jika tidak ada di cache
+        """
+        path = self._page_path(document_id, settings_key, page_num)
+        try:
+            with pa.memory_map(path, "r") as source:
+                table = pa.ipc.open_file(source).read_all()
+            os.utime(path)  # Tandai sebagai baru dipakai (LRU)
+        except (OSError, pa.ArrowInvalid):
+            return None
+
+        tables = []
+        for table_idx, cells in zip(table.column("table_index").to_pylist(), table.column("cells").to_pylist()):
+            while len(tables) <= table_idx:
+                tables.append([])
+            tables[table_idx].append(cells)
+
+        metadata = table.schema.metadata or {}
+        layouts = json.loads(metadata.get(b"layouts", b"[]"))
+        layouts = layouts[:len(tables)] + [None] * (len(tables) - len(layouts))
+        return tables, layouts
+
+    def contains(self, document_id: str, settings_key: str, page_num: int) -> bool:
+        """
+        Mengecek apakah halaman ada di cache tanpa membacanya
+        """
+        return os.path.exists(self._page_path(document_id, settings_key, page_num))
+
+    def put(self, document_id: str, settings_key: str, page_num: int, tables: List[List[List]],
+            layouts: Optional[List[Optional[Dict]]] = None):
+        """
+        Menyimpan tabel mentah satu halaman ke cache (halaman tanpa tabel juga disimpan)
+        """
+        table_indices = []
+        rows = []
+        for table_idx, table in enumerate(tables):
+            for row in table:
+                table_indices.append(table_idx)
+                rows.append([None if cell is None else str(cell) for cell in row])
+
+        schema = RAW_TABLE_SCHEMA.with_metadata({b"layouts": json.dumps(layouts or []).encode("utf-8")})
+        arrow_table = pa.table(
+            {"table_index": pa.array(table_indices, pa.int32()), "cells": pa.array(rows, pa.list_(pa.string()))},
+            schema=schema
+        )
+
+        def write(f):
+            with pa.ipc.new_file(f, schema) as writer:
+                writer.write_table(arrow_table)
+
+        path = self._page_path(document_id, settings_key, page_num)
+        self._approx_size += self._write_atomic(path, write)
+        if self._approx_size > self.max_bytes:
+            self.evict()
+
+    def get_total_pages(self, document_id: str) -> Optional[int]:
+        try:
+            with open(self._meta_path(document_id), "r", encoding="utf-8") as f:
+                return json.load(f)["total_pages"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put_total_pages(self, document_id: str, total_pages: int):
+        data = json.dumps({"total_pages": total_pages}).encode("utf-8")
+        self._approx_size += self._write_atomic(self._meta_path(document_id), lambda f: f.write(data))
+
+    def evict(self):
+        """
+        Menghapus file yang paling lama tidak dipakai sampai ukuran cache
+        turun ke 90% dari batas maksimum
+        """
+        entries = []
+        for path in self._iter_files():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                pass
+
+        self._approx_size = total
+
+    def clear(self):
+        for path in list(self._iter_files()):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        self._approx_size = 0
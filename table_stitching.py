@@ -0,0 +1,121 @@
+from typing import List, Dict, Optional, Iterable, Iterator, Tuple
+
+# Selisih maksimal posisi batas kolom (point PDF) agar dianggap kolom yang sama
+COLUMN_X_TOLERANCE = 3.0
+# Tabel lanjutan harus mulai di bagian atas halaman, tabel sebelumnya berakhir di bagian bawah
+CONTINUATION_EDGE_RATIO = 0.5
+
+
+# Fungsi untuk menormalkan satu baris (untuk membandingkan header)
+def _normalize_row(row: List) -> Tuple[str, ...]:
+    return tuple("" if cell is None else " ".join(str(cell).split()) for cell in row)
+
+
+# Fungsi untuk mengecek apakah baris kosong (semua sel None atau spasi saja)
+def is_blank_row(row: List) -> bool:
+    return all(cell is None or not str(cell).strip() for cell in row)
+
+
+# Fungsi untuk membandingkan batas kolom dua tabel
+def columns_match(layout_a: Optional[Dict], layout_b: Optional[Dict],
+                  tolerance: float = COLUMN_X_TOLERANCE) -> bool:
+    if not layout_a or not layout_b:
+        return False
+    columns_a, columns_b = layout_a["columns"], layout_b["columns"]
+    if len(columns_a) != len(columns_b):
+        return False
+    return all(abs(a - b) <= tolerance for a, b in zip(columns_a, columns_b))
+
+
+# Fungsi untuk mengecek posisi vertikal (akhir halaman -> awal halaman berikutnya)
+def _at_page_break(previous_layout: Optional[Dict], next_layout: Optional[Dict]) -> bool:
+    if not previous_layout.get("page_height") or not next_layout.get("page_height"):
+        return True  # Tanpa tinggi halaman (mis. tabula) posisi tidak bisa diperiksa
+    previous_bottom = previous_layout["bbox"][3]
+    next_top = next_layout["bbox"][1]
+    return (previous_bottom >= previous_layout["page_height"] * CONTINUATION_EDGE_RATIO and
+            next_top <= next_layout["page_height"] * CONTINUATION_EDGE_RATIO)
+
+
+def _new_group(page_num: int, table_idx: int, rows: List[List], layout: Optional[Dict]) -> Dict:
+    return {
+        "page": page_num,
+        "index": table_idx,
+        "pages": [page_num],
+        "rows": list(rows),
+        "row_pages": [page_num] * len(rows),
+        "header": _normalize_row(rows[0]),
+        "num_cols": max(len(row) for row in rows),
+        "layout": layout,
+    }
+
+
+# Fungsi untuk menentukan apakah tabel adalah lanjutan dari grup sebelumnya
+def continuation_of(group: Dict, rows: List[List], layout: Optional[Dict]) -> Tuple[bool, bool]:
+    """
+    Tabel lanjutan harus punya jumlah kolom yang sama, dan salah satu dari:
+    - baris pertamanya sama dengan header grup (header diulang di halaman baru), atau
+    - batas kolomnya sama (dalam toleransi) dan posisinya di awal halaman
+      sementara tabel sebelumnya berakhir di bagian bawah halaman.
+    Returns: (lanjutan, header_diulang)
+    """
+    if max(len(row) for row in rows) != group["num_cols"]:
+        return False, False
+
+    header_repeated = any(group["header"]) and _normalize_row(rows[0]) == group["header"]
+    if header_repeated:
+        return True, True
+
+    if columns_match(group["layout"], layout) and _at_page_break(group["layout"], layout):
+        return True, False
+    return False, False
+
+
+# Fungsi untuk menyambung tabel yang terpotong di beberapa halaman
+def stitch_tables(pages: Iterable[Tuple[int, List[List[List]], List[Optional[Dict]]]],
+                  enabled: bool = True) -> Iterator[Dict]:
+    """
+    Menggabungkan tabel mentah per halaman (urutan halaman naik, seperti hasil
+    iter_page_tables) menjadi tabel logis dalam satu kali jalan.
+    Hanya tabel terakhir di satu halaman yang bisa disambung dengan tabel pertama
+    di halaman berikutnya; header yang diulang dibuang.
+    enabled=False: setiap tabel menjadi tabel logis sendiri (tanpa penyambungan).
+    Returns (yield): {'page', 'index', 'pages', 'rows', 'row_pages', ...} dengan
+    'page'/'index' dari potongan pertama dan 'row_pages' halaman asal setiap baris
+    """
+    pending = None  # Grup terakhir yang masih mungkin berlanjut ke halaman berikutnya
+
+    for page_num, tables, layouts in pages:
+        layouts = layouts or []
+        entries = [
+            (table_idx, table, layouts[table_idx] if table_idx < len(layouts) else None)
+            for table_idx, table in enumerate(tables)
+            if table
+        ]
+
+        start = 0
+        if enabled and pending is not None and entries and page_num == pending["pages"][-1] + 1:
+            _, rows, layout = entries[0]
+            is_continuation, header_repeated = continuation_of(pending, rows, layout)
+            if is_continuation:
+                rows = rows[1:] if header_repeated else rows
+                pending["rows"].extend(rows)
+                pending["row_pages"].extend([page_num] * len(rows))
+                pending["pages"].append(page_num)
+                pending["layout"] = layout or pending["layout"]
+                start = 1
+
+        if start == len(entries) and start > 0:
+            continue  # Satu-satunya tabel di halaman ini adalah lanjutan, grup masih terbuka
+
+        if pending is not None:
+            yield pending
+            pending = None
+
+        for table_idx, rows, layout in entries[start:]:
+            if pending is not None:
+                yield pending
+            pending = _new_group(page_num, table_idx, rows, layout)
+
+    if pending is not None:
+        yield pending
@@ -0,0 +1,123 @@
+import os
+import sys
+from io import BytesIO
+
+import pytest
+
+# Modul aplikasi berada di root repo (bukan package); PDF uji dibuat dengan generator benchmark
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from synthetic_pdf import escape_text, write_pdf
+
+
+PROSE = ("Laporan ini berisi ringkasan transaksi bulanan nasabah beserta catatan "
+         "tambahan dari petugas cabang mengenai saldo dan mutasi rekening.")
+HEADER = ["Tanggal", "Keterangan", "Debit", "Kredit", "Saldo"]
+
+
+# Fungsi untuk membuat baris tabel contoh
+def sample_rows(count, start=1):
+    return [
+        [f"{(i % 28) + 1:02d}/01/2024", f"TRANSAKSI {i}", f"{i * 1000:,}".replace(",", "."),
+         "", f"{i * 2500:,}".replace(",", ".")]
+        for i in range(start, start + count)
+    ]
+
+
+# Fungsi untuk menggambar tabel bergaris; mengembalikan posisi y di bawah tabel
+def draw_ruled_table(canvas, rows, top=780, left=40, col_width=100, row_height=18):
+    bottom = top - row_height * len(rows)
+    for i in range(len(rows) + 1):
+        canvas.line(left, top - i * row_height, left + col_width * len(rows[0]), top - i * row_height)
+    for j in range(len(rows[0]) + 1):
+        canvas.line(left + j * col_width, top, left + j * col_width, bottom)
+    for i, row in enumerate(rows):
+        for j, cell in enumerate(row):
+            canvas.drawString(left + j * col_width + 3, top - (i + 1) * row_height + 5, str(cell))
+    return bottom
+
+
+# Fungsi untuk menggambar tabel tanpa garis (kolom dari posisi teks)
+def draw_text_table(canvas, rows, top=780, left=40, col_width=100, row_height=14):
+    for i, row in enumerate(rows):
+        for j, cell in enumerate(row):
+            canvas.drawString(left + j * col_width, top - i * row_height, str(cell))
+    return top - row_height * len(rows)
+
+
+# Canvas minimal (subset API reportlab) yang menulis operator PDF untuk synthetic_pdf.write_pdf
+class PdfCanvas:
+    def __init__(self):
+        self.fonts = []
+        self.pages = []
+        self._ops = []
+        self.setFont("Helvetica", 9)
+
+    def setFont(self, name, size):
+        if name not in self.fonts:
+            self.fonts.append(name)
+        self._font = f"/F{self.fonts.index(name) + 1} {size} Tf"
+
+    def drawString(self, x, y, text):
+        self._ops.append(f"BT {self._font} {x} {y} Td ({escape_text(str(text))}) Tj ET")
+
+    def line(self, x1, y1, x2, y2):
+        self._ops.append(f"{x1} {y1} m {x2} {y2} l S")
+
+    def rect(self, x, y, width, height):
+        self._ops.append(f"{x} {y} {width} {height} re S")
+
+    def showPage(self):
+        self.pages.append("\n".join(self._ops))
+        self._ops = []
+
+    def save(self) -> bytes:
+        return write_pdf(self.pages, self.fonts)
+
+
+@pytest.fixture
+def make_pdf():
+    """
+    make_pdf(gambar_halaman_1, gambar_halaman_2, ...) -> BytesIO; setiap fungsi
+    menerima PdfCanvas dan menggambar satu halaman.
+    """
+    def build(*pages):
+        canvas = PdfCanvas()
+        for draw in pages:
+            canvas.setFont("Helvetica", 9)
+            draw(canvas)
+            canvas.showPage()
+        return BytesIO(canvas.save())
+
+    return build
+
+
+@pytest.fixture
+def prose_and_table_pdf(make_pdf):
+    # 40 baris paragraf dan tabel kecil tanpa garis di bawahnya
+    def page(canvas):
+        y = 800
+        for _ in range(40):
+            canvas.drawString(40, y, PROSE)
+            y -= 12
+        draw_text_table(canvas, [HEADER] + sample_rows(6), top=y - 10)
+
+    return make_pdf(page)
+
+
+@pytest.fixture
+def mixed_pdf(make_pdf):
+    # Halaman 1 tabel bergaris, halaman 2 hanya paragraf, halaman 3 tabel tanpa garis, halaman 4 kosong
+    def ruled(canvas):
+        draw_ruled_table(canvas, [HEADER] + sample_rows(8))
+
+    def prose(canvas):
+        for i in range(20):
+            canvas.drawString(40, 800 - i * 12, PROSE)
+
+    def unruled(canvas):
+        draw_text_table(canvas, [HEADER] + sample_rows(10))
+
+    return make_pdf(ruled, prose, unruled, lambda canvas: None)
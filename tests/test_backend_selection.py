@@ -0,0 +1,126 @@
+import pytest
+
+import converter
+from converter import TableStore
+from backend_selection import (
+    BACKEND_PDFPLUMBER, BACKEND_TABULA, BACKEND_PYPDF2, DENSE_PATH_OPS, MIN_RULE_OPS,
+    table_quality, plan_backends, should_fall_back,
+)
+
+GOOD = [[["Tanggal", "Saldo"], ["01/01/2024", "1.000"]]]
+POOR = [[["Tanggal", None, None], [None, "1.000", None]]]
+
+
+def features(text_ops=10, rule_ops=0, path_ops=0):
+    return {"text_ops": text_ops, "rule_ops": rule_ops, "path_ops": path_ops, "images": 0}
+
+
+def test_table_quality_is_weighted_fill_ratio():
+    assert table_quality(GOOD) == 1.0
+    assert table_quality(POOR) == pytest.approx(2 / 6)
+    assert table_quality(GOOD + POOR) == pytest.approx(6 / 10)
+    # Tabel kurang dari 2 baris atau 2 kolom tidak dinilai
+    assert table_quality([[["satu baris", "x"]], [["a"], ["b"]]]) == 0.0
+    assert table_quality([]) == 0.0
+
+
+@pytest.mark.parametrize("page_features, expected", [
+    (features(text_ops=0, rule_ops=20), []),
+    (features(rule_ops=20, path_ops=DENSE_PATH_OPS), [BACKEND_TABULA, BACKEND_PYPDF2]),
+    (features(rule_ops=MIN_RULE_OPS), [BACKEND_PDFPLUMBER, BACKEND_TABULA]),
+    (features(rule_ops=MIN_RULE_OPS - 1), [BACKEND_PYPDF2, BACKEND_TABULA]),
+])
+def test_plan_backends(page_features, expected):
+    assert plan_backends(page_features) == expected
+
+
+@pytest.mark.parametrize("score, page_features, expected", [
+    (0.9, features(rule_ops=20), False),
+    (0.3, features(), True),
+    (0.0, features(rule_ops=20), True),
+    (0.0, features(), False),  # Halaman teks biasa: tidak mencoba backend yang lebih mahal
+])
+def test_should_fall_back(score, page_features, expected):
+    assert should_fall_back(score, page_features) is expected
+
+
+# Hasil backend tiruan per halaman; Exception berarti backend gagal
+RESULTS = {
+    1: {BACKEND_PDFPLUMBER: GOOD},
+    2: {BACKEND_PYPDF2: POOR, BACKEND_TABULA: GOOD},
+    3: {BACKEND_PYPDF2: []},
+    4: {BACKEND_PDFPLUMBER: POOR, BACKEND_TABULA: RuntimeError("java tidak ditemukan")},
+    5: {BACKEND_PYPDF2: POOR},
+}
+RULED_PAGES = (1, 4)
+
+
+# Fungsi untuk mengambil hasil tiruan (dan mencatat backend yang dipanggil)
+def fake_result(calls, page_num, backend):
+    calls.append((page_num, backend))
+    result = RESULTS[page_num][backend]
+    if isinstance(result, Exception):
+        raise result
+    return result, [None] * len(result)
+
+
+@pytest.fixture
+def stub_backends(monkeypatch):
+    calls = []
+    monkeypatch.setattr(converter, "extract_text_tables",
+                        lambda words, width, height: fake_result(calls, int(words[0]["text"][4:]), BACKEND_PYPDF2))
+
+    def fake_pdfplumber(page, *args):
+        tables, layouts = fake_result(calls, page.page_number, BACKEND_PDFPLUMBER)
+        return tables, True, layouts
+
+    monkeypatch.setattr(converter, "extract_page_tables", fake_pdfplumber)
+    monkeypatch.setattr(converter, "read_tabula_page",
+                        lambda path, page_num: fake_result(calls, page_num, BACKEND_TABULA))
+    return calls
+
+
+@pytest.fixture
+def labelled_pdf(make_pdf):
+    # Setiap halaman diawali label "hal-N"; halaman bergaris punya garis tabel
+    def page(page_num):
+        def draw(canvas):
+            canvas.drawString(40, 800, f"hal-{page_num}")
+            if page_num in RULED_PAGES:
+                for i in range(MIN_RULE_OPS):
+                    canvas.line(40, 700 - i * 18, 340, 700 - i * 18)
+        return draw
+
+    return make_pdf(*(page(page_num) for page_num in sorted(RESULTS)))
+
+
+def test_auto_backend_falls_back_per_page(labelled_pdf, stub_backends):
+    store = TableStore("doc", "auto")
+    report = []
+    results = list(converter.iter_auto_page_tables(labelled_pdf, sorted(RESULTS), table_store=store,
+                                                   backend_callback=report.append))
+
+    assert [(page_num, tables) for page_num, tables, _ in results] == [
+        (1, GOOD), (2, GOOD), (3, []), (4, POOR), (5, POOR)]
+    assert [entry["backend"] for entry in report] == [
+        BACKEND_PDFPLUMBER, BACKEND_TABULA, BACKEND_PYPDF2, BACKEND_PDFPLUMBER, BACKEND_PYPDF2]
+    # Halaman 3 tanpa tabel tidak memicu fallback; tabula yang gagal di halaman 4 dilewati di halaman 5
+    assert stub_backends == [(1, BACKEND_PDFPLUMBER), (2, BACKEND_PYPDF2), (2, BACKEND_TABULA),
+                             (3, BACKEND_PYPDF2), (4, BACKEND_PDFPLUMBER), (4, BACKEND_TABULA),
+                             (5, BACKEND_PYPDF2)]
+    assert report[3]["attempts"][1]["error"] == "java tidak ditemukan"
+    assert report[4]["attempts"][1]["error"].startswith("dilewati")
+
+    # Hasil halaman dengan backend gagal atau dilewati tidak disimpan
+    assert [page_num for page_num in RESULTS if store.has_page(page_num)] == [1, 2, 3]
+
+
+def test_auto_backend_reuses_stored_pages(labelled_pdf, stub_backends):
+    store = TableStore("doc", "auto")
+    store.put_page(2, GOOD, [None])
+    report = []
+    results = list(converter.iter_auto_page_tables(labelled_pdf, [2, 3], table_store=store,
+                                                   backend_callback=report.append))
+    assert [tables for _, tables, _ in results] == [GOOD, []]
+    assert report[0]["cached"] and report[0]["backend"] is None
+    assert stub_backends == [(3, BACKEND_PYPDF2)]
@@ -0,0 +1,18 @@
+import pandas as pd
+
+from converter import clean_dataframe
+
+
+def test_clean_dataframe_drops_empty_rows_and_columns():
+    df = pd.DataFrame([["a", None, "1"], ["", " ", None], ["b", None, "2"]],
+                      columns=["Nama", None, "Nama"])
+    cleaned = clean_dataframe(df)
+    assert list(cleaned.columns) == ["Nama", "Nama_1"]
+    assert cleaned.values.tolist() == [["a", "1"], ["b", "2"]]
+
+
+def test_clean_dataframe_keeps_names_from_original_positions():
+    df = pd.DataFrame([[None, "x", None], [None, "y", "1"]], columns=[None, "Kode Akun", None])
+    cleaned = clean_dataframe(df)
+    assert list(cleaned.columns) == ["Kode_Akun", "Column_3"]
+    assert cleaned.values.tolist() == [["x", ""], ["y", "1"]]
@@ -0,0 +1,67 @@
+import os
+
+import cli
+
+
+def test_output_names_unique_basenames_stay_flat():
+    names = cli.output_names(["in/a/januari.pdf", "in/b/februari.pdf"])
+    assert names == {"in/a/januari.pdf": "januari", "in/b/februari.pdf": "februari"}
+
+
+def test_output_names_mirror_directories_on_collision():
+    names = cli.output_names(["in/a/report.pdf", "in/b/report.pdf", "in/b/lain.pdf"])
+    assert names["in/a/report.pdf"] == os.path.join("a", "report")
+    assert names["in/b/report.pdf"] == os.path.join("b", "report")
+    assert names["in/b/lain.pdf"] == "lain"
+
+
+def test_output_names_suffix_when_still_equal():
+    names = cli.output_names(["in/report.pdf", "in/report.PDF"])
+    assert sorted(names.values()) == ["report", "report_2"]
+
+
+def test_main_does_not_overwrite_same_named_files(tmp_path, mixed_pdf, capsys):
+    for folder in ("a", "b"):
+        (tmp_path / "in" / folder).mkdir(parents=True)
+        (tmp_path / "in" / folder / "report.pdf").write_bytes(mixed_pdf.getvalue())
+
+    out_dir = tmp_path / "out"
+    exit_code = cli.main([str(tmp_path / "in" / "*" / "report.pdf"), "-o", str(out_dir), "-f", "csv",
+                          "-m", "pypdf2", "--pages", "all", "--no-cache", "-j", "1"])
+    assert exit_code == 0
+    assert (out_dir / "a" / "report.csv").exists() and (out_dir / "b" / "report.csv").exists()
+    assert "Total halaman: 8 (8 diekstrak)" in capsys.readouterr().out
+
+
+def test_convert_file_reports_extracted_pages(tmp_path, mixed_pdf):
+    pdf_path = tmp_path / "report.pdf"
+    pdf_path.write_bytes(mixed_pdf.getvalue())
+    result = cli.convert_file(str(pdf_path), str(tmp_path), "csv", cli.METHOD_PDFPLUMBER, all_pages=False,
+                              threshold=3, merge=False, cache_dir=None)
+    assert result["pages"] == 4
+    assert 0 < result["pages_extracted"] < result["pages"]
+
+
+# Fungsi untuk menjalankan convert_file dengan OCR; halaman 4 dianggap hasil scan
+def convert_with_ocr(tmp_path, mixed_pdf, monkeypatch, method):
+    pdf_path = tmp_path / "report.pdf"
+    pdf_path.write_bytes(mixed_pdf.getvalue())
+    scanned_lookups = []
+    monkeypatch.setattr(cli, "find_scanned_pages", lambda pdf_file, pages: scanned_lookups.append(method) or [4])
+    extracted = []
+    monkeypatch.setattr(cli, "extract_tables_from_pages",
+                        lambda pdf_file, pages, *args, **kwargs: extracted.append(list(pages)) or [])
+    result = cli.convert_file(str(pdf_path), str(tmp_path), "csv", method, all_pages=False,
+                              threshold=3, merge=False, cache_dir=None, ocr=True)
+    return result, scanned_lookups, extracted
+
+
+def test_scanned_pages_are_added_for_ocr_methods(tmp_path, mixed_pdf, monkeypatch):
+    result, scanned_lookups, extracted = convert_with_ocr(tmp_path, mixed_pdf, monkeypatch, cli.METHOD_PYPDF2)
+    assert scanned_lookups and 4 in extracted[0]
+    assert result["pages_extracted"] == len(extracted[0])
+
+
+def test_scanned_pages_are_not_added_for_tabula(tmp_path, mixed_pdf, monkeypatch):
+    _, scanned_lookups, extracted = convert_with_ocr(tmp_path, mixed_pdf, monkeypatch, cli.METHOD_TABULA)
+    assert not scanned_lookups and 4 not in extracted[0]
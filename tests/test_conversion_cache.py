@@ -0,0 +1,117 @@
+import pandas as pd
+
+import converter
+from conversion_cache import ConversionCache, options_key, conversion_signature, conversion_complete
+from profiling import StageProfiler, STAGE_TABLE_FINDING, STAGE_CLEANING
+
+CLEAN_OPTIONS = {"clean_columns": True, "remove_empty": True, "fill_na": True}
+
+
+# Fungsi untuk membuat grup tabel seperti hasil stitch_tables
+def make_group(rows, page=1, index=0, pages=None):
+    return {"page": page, "index": index, "pages": pages or [page], "rows": rows}
+
+
+def test_table_key_changes_with_cell_content():
+    rows = [["A", "B"], ["1", "2"]]
+    key = ConversionCache.table_key("doc", "settings", "opts", make_group(rows))
+    assert key == ConversionCache.table_key("doc", "settings", "opts", make_group([list(r) for r in rows]))
+    # Jumlah baris sama, isi berbeda
+    assert key != ConversionCache.table_key("doc", "settings", "opts", make_group([["A", "B"], ["1", "3"]]))
+    # Halaman lanjutan ikut dipilih
+    assert key != ConversionCache.table_key("doc", "settings", "opts", make_group(rows, pages=[1, 2]))
+
+
+def test_options_key_includes_every_option():
+    base = options_key(CLEAN_OPTIONS, stitch=True, infer_types=False)
+    assert base == options_key(dict(reversed(list(CLEAN_OPTIONS.items()))), stitch=True, infer_types=False)
+    assert base != options_key({**CLEAN_OPTIONS, "fill_na": False}, stitch=True, infer_types=False)
+    assert base != options_key(CLEAN_OPTIONS, stitch=False, infer_types=False)
+    assert base != options_key(CLEAN_OPTIONS, stitch=True, infer_types=True)
+    ocr_ind = options_key(CLEAN_OPTIONS, True, False, "ocr-tesseract-ind-300dpi")
+    assert ocr_ind != base
+    assert ocr_ind != options_key(CLEAN_OPTIONS, True, False, "ocr-tesseract-eng-300dpi")
+
+
+def test_conversion_signature_depends_on_pages():
+    options = options_key(CLEAN_OPTIONS)
+    assert conversion_signature("doc", "s", [1, 2], options) != conversion_signature("doc", "s", [1, 2, 3], options)
+
+
+def test_conversion_with_lost_pages_is_not_complete():
+    clean_page = {"page": 1, "attempts": [{"backend": "pdfplumber", "error": None}]}
+    fallback_page = {"page": 2, "attempts": [{"backend": "pdfplumber", "error": "timeout"},
+                                             {"backend": "pypdf2", "error": None}]}
+    assert conversion_complete([], [clean_page, {"page": 3, "cached": True, "attempts": []}])
+    assert not conversion_complete(["OCR gagal di halaman 4: tesseract tidak ditemukan"])
+    assert not conversion_complete([], [clean_page, fallback_page])
+
+
+def test_cached_dataframe_is_isolated_from_callers():
+    cache = ConversionCache()
+    df = pd.DataFrame({"a": ["x", "y"]})
+    cache.put(("table", 1), df)
+    df.iloc[0, 0] = "diubah"
+
+    first = cache.get(("table", 1))
+    assert first.iloc[0, 0] == "x"
+    first.iloc[0, 0] = "diubah juga"
+    assert cache.get(("table", 1)).iloc[0, 0] == "x"
+
+
+def test_lru_eviction_respects_size_limit():
+    cache = ConversionCache(max_bytes=25)
+    cache.put(("output", "a"), b"x" * 10)
+    cache.put(("output", "b"), b"x" * 10)
+    cache.get(("output", "a"))  # a baru dipakai, b yang dibuang
+    cache.put(("output", "c"), b"x" * 10)
+    assert cache.get(("output", "b")) is None
+    assert cache.get(("output", "a")) is not None and cache.get(("output", "c")) is not None
+    assert cache.total_bytes <= 25
+    cache.put(("output", "besar"), b"x" * 100)
+    assert cache.get(("output", "besar")) is None
+
+
+# Fungsi untuk menjalankan konversi dan menghitung tahap per nama
+def run_conversion(pdf_file, pages, store, cache, clean_options=CLEAN_OPTIONS):
+    profiler = StageProfiler()
+    profiler.start()
+    tables = converter.extract_tables_from_pages(pdf_file, pages, converter.METHOD_PYPDF2, store,
+                                                 clean_options=clean_options, profiler=profiler,
+                                                 stitch=True, conversion_cache=cache)
+    profiler.stop()
+    stages = {}
+    for record in profiler.records:
+        stages[record["stage"]] = stages.get(record["stage"], 0) + 1
+    return tables, stages
+
+
+def test_incremental_conversion(mixed_pdf):
+    document_id = converter.get_document_id(mixed_pdf)
+    store = converter.TableStore(document_id, converter.METHOD_SETTINGS_KEYS[converter.METHOD_PYPDF2])
+    cache = ConversionCache()
+
+    first, stages = run_conversion(mixed_pdf, [1, 2], store, cache)
+    assert stages[STAGE_TABLE_FINDING] == 2
+
+    # Menambah halaman: hanya halaman baru yang diekstrak dan dibersihkan
+    added, stages = run_conversion(mixed_pdf, [1, 2, 3], store, cache)
+    assert stages.get(STAGE_TABLE_FINDING) == 1
+    assert stages.get(STAGE_CLEANING) == len(added) - len(first)
+
+    # Mengubah opsi pembersihan: tanpa ekstraksi ulang
+    toggled, stages = run_conversion(mixed_pdf, [1, 2, 3], store, cache, {**CLEAN_OPTIONS, "fill_na": False})
+    assert STAGE_TABLE_FINDING not in stages
+    assert stages[STAGE_CLEANING] == len(toggled)
+
+    # Hasil dari cache sama dengan konversi tanpa cache
+    fresh = converter.extract_tables_from_pages(mixed_pdf, [1, 2, 3], converter.METHOD_PYPDF2,
+                                                clean_options=CLEAN_OPTIONS, stitch=True)
+    cached, stages = run_conversion(mixed_pdf, [1, 2, 3], store, cache)
+    assert not stages.get(STAGE_CLEANING)
+    assert len(cached) == len(fresh) and all(a.equals(b) for a, b in zip(cached, fresh))
+
+    # Mengubah tabel hasil tidak mengubah hasil konversi berikutnya
+    cached[0].iloc[0, 2] = "rusak"
+    again, _ = run_conversion(mixed_pdf, [1, 2, 3], store, cache)
+    assert again[0].equals(fresh[0])
@@ -0,0 +1,169 @@
+import io
+import os
+import sys
+import json
+import zipfile
+import subprocess
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from exporters import (
+    write_excel,
+    write_excel_streaming,
+    write_csv,
+    write_csv_zip,
+    write_parquet,
+    write_arrow,
+    write_tables_streaming,
+)
+
+
+# Fungsi untuk membuat tabel contoh seperti hasil iter_extracted_tables
+def sample_tables():
+    return [
+        pd.DataFrame({"PDF_Halaman": [1, 1, 1], "PDF_Tabel_Index": [1, 1, 1],
+                      "Tanggal": ["01/01/2024", "02/01/2024", "03/01/2024"], "Saldo": [1.5, 2.0, 3.25]}),
+        pd.DataFrame({"PDF_Halaman": [2, 3], "PDF_Tabel_Index": [1, 1],
+                      "Tanggal": ["04/01/2024", "05/01/2024"], "Keterangan": ["A", "B"]}),
+    ]
+
+
+TOTAL_ROWS = 5
+
+
+def as_input(kind):
+    tables = sample_tables()
+    return tables if kind == "list" else (table_df for table_df in tables)
+
+
+@pytest.mark.parametrize("kind", ["list", "generator"])
+def test_write_parquet_row_count(kind):
+    output = io.BytesIO()
+    write_parquet(as_input(kind), output)
+    output.seek(0)
+    table = pq.read_table(output)
+    assert table.num_rows == TOTAL_ROWS
+    assert {"Saldo", "Keterangan"} <= set(table.column_names)
+
+
+@pytest.mark.parametrize("kind", ["list", "generator"])
+def test_write_arrow_row_count(kind):
+    output = io.BytesIO()
+    write_arrow(as_input(kind), output)
+    output.seek(0)
+    assert pa.ipc.open_stream(output).read_all().num_rows == TOTAL_ROWS
+
+
+def duplicate_header_table():
+    return pd.DataFrame([["a", "b", "x", 1], ["c", "d", "y", 2]], columns=["Nama", "Nama", None, float("nan")])
+
+
+@pytest.mark.parametrize("writer", [write_parquet, write_arrow])
+def test_arrow_writers_accept_duplicate_and_empty_headers(writer):
+    output = io.BytesIO()
+    writer([duplicate_header_table()], output)
+    output.seek(0)
+    table = pq.read_table(output) if writer is write_parquet else pa.ipc.open_stream(output).read_all()
+    assert table.column_names == ["Nama", "Nama_1", "Column_3", "Column_4"]
+    assert table.to_pylist()[0] == {"Nama": "a", "Nama_1": "b", "Column_3": "x", "Column_4": 1}
+
+
+@pytest.mark.parametrize("output_format", ["parquet", "arrows"])
+def test_write_tables_streaming_duplicate_headers(tmp_path, output_format):
+    path = tmp_path / f"out.{output_format}"
+    summary = write_tables_streaming(iter([duplicate_header_table()]), str(path), output_format)
+    assert summary["rows"] == 2
+
+
+@pytest.mark.parametrize("kind", ["list", "generator"])
+@pytest.mark.parametrize("merge", [False, True])
+def test_write_excel_streaming_row_count(tmp_path, kind, merge):
+    path = tmp_path / "out.xlsx"
+    write_excel_streaming(as_input(kind), str(path), merge=merge)
+    sheets = pd.read_excel(path, sheet_name=None)
+    assert sum(len(df) for df in sheets.values()) == TOTAL_ROWS
+    if not merge:
+        assert len(sheets) == 2
+
+
+def test_write_excel_streaming_merge_same_columns(tmp_path):
+    path = tmp_path / "out.xlsx"
+    tables = [sample_tables()[0], sample_tables()[0].iloc[:2]]
+    write_excel_streaming(iter(tables), str(path), merge=True)
+    sheets = pd.read_excel(path, sheet_name=None)
+    assert len(sheets) == 1 and len(next(iter(sheets.values()))) == 5
+
+
+@pytest.mark.parametrize("merge", [False, True])
+def test_write_excel_streaming_keeps_duplicate_and_empty_headers(tmp_path, merge):
+    path = tmp_path / "out.xlsx"
+    table_df = duplicate_header_table()
+    write_excel_streaming(iter([table_df, table_df.copy()]), str(path), merge=merge)
+
+    sheets = pd.read_excel(path, sheet_name=None, header=None)
+    first = next(iter(sheets.values()))
+    assert first.iloc[0].fillna("").tolist() == ["Nama", "Nama", "", ""]
+    assert first.iloc[1:3].values.tolist() == [["a", "b", "x", 1], ["c", "d", "y", 2]]
+    if merge:
+        assert len(sheets) == 1
+        assert first.iloc[3:].values.tolist() == [["a", "b", "x", 1], ["c", "d", "y", 2]]
+
+
+@pytest.mark.parametrize("merge", [False, True])
+def test_write_excel_row_count(merge):
+    output = io.BytesIO()
+    write_excel(sample_tables(), output, merge=merge)
+    output.seek(0)
+    sheets = pd.read_excel(output, sheet_name=None)
+    assert sum(len(df) for df in sheets.values()) == TOTAL_ROWS
+
+
+def test_write_csv_row_count():
+    output = io.StringIO()
+    write_csv(sample_tables(), output)
+    output.seek(0)
+    assert len(pd.read_csv(output)) == TOTAL_ROWS
+
+
+@pytest.mark.parametrize("kind", ["list", "generator"])
+@pytest.mark.parametrize("compress", [False, True])
+def test_write_csv_zip_row_count(kind, compress):
+    output = io.BytesIO()
+    summary = write_csv_zip(as_input(kind), output, compress=compress)
+    assert summary["tables"] == 2 and summary["rows"] == TOTAL_ROWS
+
+    with zipfile.ZipFile(output) as archive:
+        manifest = json.loads(archive.read("manifest.json"))
+        rows = 0
+        for entry in manifest:
+            with archive.open(entry["file"]) as member:
+                rows += len(pd.read_csv(member, compression="gzip" if compress else None))
+    assert rows == TOTAL_ROWS
+    assert manifest[1]["halaman"] == [2, 3]
+
+
+@pytest.mark.parametrize("kind", ["list", "generator"])
+@pytest.mark.parametrize("output_format", ["xlsx", "csv", "zip", "parquet", "arrows"])
+def test_write_tables_streaming_row_count(tmp_path, kind, output_format):
+    path = tmp_path / f"out.{output_format}"
+    summary = write_tables_streaming(as_input(kind), str(path), output_format)
+    assert summary["tables"] == 2 and summary["rows"] == TOTAL_ROWS
+
+    if output_format == "csv":
+        assert len(pd.read_csv(path)) == TOTAL_ROWS
+    elif output_format == "parquet":
+        assert pq.read_table(path).num_rows == TOTAL_ROWS
+    elif output_format == "arrows":
+        with pa.memory_map(str(path)) as source:
+            assert pa.ipc.open_stream(source).read_all().num_rows == TOTAL_ROWS
+
+
+def test_exporters_do_not_import_extraction_stack():
+    code = ("import sys, exporters; "
+            "print(','.join(m for m in ('converter', 'tabula', 'pdfplumber', 'PyPDF2') if m in sys.modules))")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
@@ -0,0 +1,101 @@
+import time
+import threading
+
+import job_queue
+from job_queue import JobManager, JOB_DONE, JOB_FAILED, JOB_CANCELLED, job_process_budget
+
+
+# Fungsi untuk menunggu job selesai (batas waktu agar uji tidak menggantung)
+def wait_finished(manager, job_id, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.get(job_id)
+        if job.finished:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} belum selesai")
+
+
+def blocking_job(job, started, release):
+    started.set()
+    release.wait(5)
+    return "selesai"
+
+
+def test_job_result_and_failure():
+    manager = JobManager(max_workers=1)
+    done = wait_finished(manager, manager.submit("a", lambda job, x: x * 2, 21))
+    assert done.status == JOB_DONE and done.result == 42 and done.finished_at is not None
+
+    def broken(job):
+        raise ValueError("rusak")
+
+    failed = wait_finished(manager, manager.submit("a", broken))
+    assert failed.status == JOB_FAILED and failed.error == "rusak"
+    assert "ValueError" in failed.error_traceback and failed.finished_at is not None
+
+
+def test_owners_take_turns():
+    manager = JobManager(max_workers=1)
+    started, release = threading.Event(), threading.Event()
+    order = []
+    blocker = manager.submit("x", blocking_job, started, release)
+    assert started.wait(5)
+
+    job_ids = [manager.submit(owner, lambda job, name: order.append(name), name)
+               for owner, name in [("a", "a1"), ("a", "a2"), ("a", "a3"), ("b", "b1")]]
+    assert manager.queue_position(job_ids[3]) == 2
+    assert manager.stats() == {"workers": 1, "running": 1, "queued": 4}
+
+    release.set()
+    wait_finished(manager, blocker)
+    for job_id in job_ids:
+        wait_finished(manager, job_id)
+    assert order == ["a1", "b1", "a2", "a3"]
+
+
+def test_cancel_queued_and_running_jobs():
+    manager = JobManager(max_workers=1)
+    started = threading.Event()
+
+    def loop(job):
+        started.set()
+        for i in range(500):
+            job.report_progress(i, 500)
+            time.sleep(0.01)
+
+    running = manager.submit("a", loop)
+    queued = manager.submit("a", lambda job: "tidak dijalankan")
+    assert started.wait(5)
+
+    manager.cancel(queued)
+    job = manager.get(queued)
+    assert job.status == JOB_CANCELLED and job.finished_at is not None and job.result is None
+
+    manager.cancel(running)
+    job = wait_finished(manager, running)
+    assert job.status == JOB_CANCELLED and job.finished_at is not None
+    assert manager.stats()["running"] == 0
+
+
+def test_cleanup_drops_expired_and_old_results(monkeypatch):
+    manager = JobManager(max_workers=1, result_ttl=60)
+    job_ids = []
+    for _ in range(4):
+        job_ids.append(manager.submit("a", lambda job: None))
+        wait_finished(manager, job_ids[-1])
+    # Hanya MAX_FINISHED_PER_OWNER job selesai terakhir yang disimpan
+    kept = [job_id for job_id in job_ids if manager.get(job_id) is not None]
+    assert kept == job_ids[-job_queue.MAX_FINISHED_PER_OWNER:]
+
+    now = time.time()
+    monkeypatch.setattr(job_queue.time, "time", lambda: now + 61)
+    assert all(manager.get(job_id) is None for job_id in job_ids)
+
+
+def test_process_budget_splits_cpus_between_jobs(monkeypatch):
+    monkeypatch.setattr("os.cpu_count", lambda: 8)
+    assert job_process_budget(4) == 2
+    assert job_process_budget(1) == 8
+    assert job_process_budget(16) == 1
+    assert JobManager(max_workers=2).process_budget == 4
@@ -0,0 +1,63 @@
+import pytest
+
+import memory_guard
+from memory_guard import MemoryGuard, MemoryLimitError, BACKOFF_DELAYS
+
+
+@pytest.fixture
+def fake_rss(monkeypatch):
+    """
+    fake_rss(nilai, ...) -> daftar jeda sleep; current_rss_mb mengembalikan nilai berurutan
+    (nilai terakhir diulang)
+    """
+    sleeps = []
+    monkeypatch.setattr(memory_guard.time, "sleep", sleeps.append)
+    monkeypatch.setattr(memory_guard.gc, "collect", lambda: 0)
+
+    def install(*values):
+        readings = list(values)
+        monkeypatch.setattr(memory_guard, "current_rss_mb",
+                            lambda: readings.pop(0) if len(readings) > 1 else readings[0])
+        return sleeps
+
+    return install
+
+
+def test_under_limit_does_not_back_off(fake_rss):
+    sleeps = fake_rss(100.0)
+    guard = MemoryGuard(limit_mb=500)
+    guard.check(1)
+    assert guard.backoffs == 0 and guard.peak_mb == 100.0 and sleeps == []
+
+
+def test_back_off_until_memory_is_released(fake_rss):
+    sleeps = fake_rss(800.0, 700.0, 600.0, 400.0)
+    guard = MemoryGuard(limit_mb=500)
+    guard.check(3)
+    assert guard.backoffs == 1 and guard.peak_mb == 800.0
+    assert sleeps == [0.0] + list(BACKOFF_DELAYS[:2])
+
+
+def test_raises_when_memory_stays_above_limit(fake_rss):
+    sleeps = fake_rss(900.0)
+    guard = MemoryGuard(limit_mb=500)
+    with pytest.raises(MemoryLimitError, match="900 MB melebihi batas 500 MB saat memproses halaman 7"):
+        guard.check(7)
+    assert sleeps == [0.0] + list(BACKOFF_DELAYS)
+
+
+def test_disabled_or_unreadable_rss_is_ignored(fake_rss):
+    fake_rss(900.0)
+    MemoryGuard(limit_mb=0).check(1)
+
+    fake_rss(900.0, None)  # RSS tidak bisa dibaca lagi saat back-off
+    MemoryGuard(limit_mb=500).check(1)
+
+    fake_rss(None)
+    guard = MemoryGuard(limit_mb=500)
+    guard.check(1)
+    assert guard.peak_mb == 0.0
+
+
+def test_current_rss_is_readable():
+    assert memory_guard.current_rss_mb() > 0
@@ -0,0 +1,118 @@
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+
+import PyPDF2
+import pytest
+from PIL import Image
+
+import converter
+import ocr
+from converter import TableStore
+from table_cache import TableDiskCache
+
+# Kata hasil Tesseract tiruan (piksel pada 300 dpi): tabel 2 kolom, 4 baris
+OCR_LINES = [["Kode", "Jumlah"], ["A1", "1.000"], ["B2", "2.000"], ["C3", "3.000"]]
+DIGITAL_TABLES = {1: [[["Tanggal", "Saldo"], ["01/01/2024", "1.000"]]],
+                  3: [[["Tanggal", "Saldo"], ["02/01/2024", "2.000"]]]}
+
+
+class FakeTesseract:
+    class Output:
+        DICT = "dict"
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = 0
+
+    def image_to_data(self, image, lang, config, output_type):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("tesseract tidak ditemukan")
+        data = {key: [] for key in ("level", "text", "block_num", "par_num", "line_num",
+                                    "left", "top", "width", "height")}
+        for line_num, words in enumerate(OCR_LINES, start=1):
+            for col, text in enumerate(words):
+                for key, value in (("level", 5), ("text", text), ("block_num", 1), ("par_num", 1),
+                                   ("line_num", line_num), ("left", 200 + col * 1000),
+                                   ("top", 300 + line_num * 60), ("width", 40 * len(text)), ("height", 40)):
+                    data[key].append(value)
+        return data
+
+
+# Fungsi untuk membuat halaman hasil scan (hanya satu gambar seukuran halaman)
+def scanned_page_pdf() -> PyPDF2.PageObject:
+    output = BytesIO()
+    Image.new("L", (595, 842), color=255).save(output, "PDF", resolution=72)
+    return PyPDF2.PdfReader(output).pages[0]
+
+
+@pytest.fixture
+def mixed_scan_pdf(make_pdf):
+    # Halaman 1 dan 3 digital, halaman 2 dan 4 hasil scan
+    digital = PyPDF2.PdfReader(make_pdf(lambda canvas: canvas.drawString(40, 800, "Laporan"),
+                                        lambda canvas: canvas.drawString(40, 800, "Lampiran")))
+    writer = PyPDF2.PdfWriter()
+    for page in (digital.pages[0], scanned_page_pdf(), digital.pages[1], scanned_page_pdf()):
+        writer.add_page(page)
+    output = BytesIO()
+    writer.write(output)
+    output.seek(0)
+    return output
+
+
+def test_image_only_page_is_scanned(mixed_scan_pdf):
+    reader = PyPDF2.PdfReader(mixed_scan_pdf)
+    assert ocr.image_coverage(reader.pages[1]) == pytest.approx(1.0)
+    assert ocr.is_scanned_page(reader.pages[1])
+    assert ocr.image_coverage(reader.pages[0]) == 0.0
+    assert not ocr.is_scanned_page(reader.pages[0])
+    assert ocr.find_scanned_pages(mixed_scan_pdf, [1, 2, 3, 4, 9]) == [2, 4]
+
+
+@pytest.fixture
+def fake_ocr(monkeypatch):
+    # OCR dijalankan di thread (bukan process pool) agar pytesseract tiruan terpakai
+    def submit(pdf_path, page_numbers, workers=1, language=ocr.OCR_LANGUAGE):
+        executor = ThreadPoolExecutor(max_workers=1)
+        return executor, {page_num: executor.submit(ocr.ocr_page_tables, pdf_path, page_num, language)
+                          for page_num in page_numbers}
+
+    monkeypatch.setattr(converter, "submit_ocr_pages", submit)
+
+    def install(fail=False):
+        tesseract = FakeTesseract(fail)
+        monkeypatch.setattr(ocr, "pytesseract", tesseract)
+        return tesseract
+
+    return install
+
+
+def digital_source():
+    return ((page_num, tables, [None]) for page_num, tables in DIGITAL_TABLES.items())
+
+
+def test_ocr_tables_are_merged_in_page_order(tmp_path, mixed_scan_pdf, fake_ocr):
+    tesseract = fake_ocr()
+    store = TableStore("doc", "pdfplumber", disk_cache=TableDiskCache(str(tmp_path)))
+    results = list(converter.iter_with_ocr_pages(digital_source(), [1, 2, 3, 4], mixed_scan_pdf, [2, 4], store))
+
+    assert [page_num for page_num, _, _ in results] == [1, 2, 3, 4]
+    assert results[0][1] == DIGITAL_TABLES[1] and results[2][1] == DIGITAL_TABLES[3]
+    assert results[1][1] == [OCR_LINES] and results[3][1] == [OCR_LINES]
+    assert tesseract.calls == 2
+
+    # Hasil OCR disimpan di cache disk: konversi berikutnya tidak menjalankan OCR lagi
+    tesseract = fake_ocr(fail=True)
+    again = list(converter.iter_with_ocr_pages(digital_source(), [1, 2, 3, 4], mixed_scan_pdf, [2, 4],
+                                               TableStore("doc", "pdfplumber", disk_cache=store.disk_cache)))
+    assert again == results and tesseract.calls == 0
+
+
+def test_failed_ocr_pages_are_reported_and_skipped(mixed_scan_pdf, fake_ocr):
+    fake_ocr(fail=True)
+    warnings = []
+    results = list(converter.iter_with_ocr_pages(digital_source(), [1, 2, 3, 4], mixed_scan_pdf, [2, 4],
+                                                 warning_callback=warnings.append))
+    assert [page_num for page_num, _, _ in results] == [1, 3]
+    assert warnings == ["OCR gagal di halaman 2: tesseract tidak ditemukan",
+                        "OCR gagal di halaman 4: tesseract tidak ditemukan"]
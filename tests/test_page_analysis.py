@@ -0,0 +1,67 @@
+import pdfplumber
+import pytest
+
+from converter import summarize_page_tables
+from page_analysis import (
+    TABLE_SETTINGS_PRESETS,
+    PRESET_TEXT,
+    PAGE_NO_TABLE,
+    PAGE_CANDIDATE,
+    PAGE_SCANNED,
+    classify_page,
+    extract_page_tables,
+    page_features,
+    prefilter_strategy,
+)
+
+
+# Fungsi untuk membandingkan deteksi dengan pre-filter dan deteksi tanpa pre-filter
+def assert_same_detection(pdf_file, table_settings, threshold):
+    with pdfplumber.open(pdf_file) as pdf:
+        for page in pdf.pages:
+            baseline = summarize_page_tables(page.extract_tables(table_settings), threshold)
+            tables, _, _ = extract_page_tables(page, threshold, table_settings)
+            assert summarize_page_tables(tables, threshold) == baseline, f"halaman {page.page_number}"
+
+
+@pytest.mark.parametrize("preset", list(TABLE_SETTINGS_PRESETS))
+@pytest.mark.parametrize("threshold", [2, 3, 5])
+def test_prefilter_matches_baseline_detection(mixed_pdf, preset, threshold):
+    assert_same_detection(mixed_pdf, TABLE_SETTINGS_PRESETS[preset], threshold)
+
+
+@pytest.mark.parametrize("threshold", [2, 3, 4, 5])
+def test_text_preset_prose_page_keeps_table(prose_and_table_pdf, threshold):
+    settings = TABLE_SETTINGS_PRESETS[PRESET_TEXT]
+    assert_same_detection(prose_and_table_pdf, settings, threshold)
+    with pdfplumber.open(prose_and_table_pdf) as pdf:
+        tables, _, _ = extract_page_tables(pdf.pages[0], threshold, settings)
+    assert summarize_page_tables(tables, threshold)
+
+
+def test_extract_page_tables_forwards_text_settings(prose_and_table_pdf):
+    settings = dict(TABLE_SETTINGS_PRESETS[PRESET_TEXT], text_x_tolerance=1, text_y_tolerance=1)
+    with pdfplumber.open(prose_and_table_pdf) as pdf:
+        page = pdf.pages[0]
+        tables, complete, _ = extract_page_tables(page, None, settings)
+        assert complete
+        assert tables == page.extract_tables(settings)
+
+
+def test_classify_page_text_strategy():
+    assert classify_page({"chars": 0, "image_coverage": 0.0, "text_chars": 0}, 3, "text") == PAGE_NO_TABLE
+    assert classify_page({"chars": 5, "image_coverage": 0.0, "text_chars": 5}, 50, "text") == PAGE_CANDIDATE
+    assert classify_page({"chars": 0, "image_coverage": 0.9, "text_chars": 0}, 3, "text") == PAGE_SCANNED
+
+
+def test_prefilter_strategy_per_preset():
+    assert prefilter_strategy(TABLE_SETTINGS_PRESETS["default"]) == "lines"
+    assert prefilter_strategy(TABLE_SETTINGS_PRESETS["lines"]) == "lines"
+    assert prefilter_strategy(TABLE_SETTINGS_PRESETS["text"]) == "text"
+    assert prefilter_strategy({"vertical_strategy": "text", "horizontal_strategy": "lines"}) is None
+
+
+def test_blank_page_has_no_table(mixed_pdf):
+    with pdfplumber.open(mixed_pdf) as pdf:
+        features = page_features(pdf.pages[3], "text")
+    assert classify_page(features, 3, "text") == PAGE_NO_TABLE
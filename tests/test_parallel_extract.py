@@ -0,0 +1,52 @@
+from io import BytesIO
+
+import pytest
+
+import converter
+from converter import TableStore
+from parallel_extract import split_pages, extract_page_range, iter_page_tables_parallel
+from synthetic_pdf import build_pdf
+
+# Halaman campuran agar tabel dan halaman kosong jatuh di batas potongan yang berbeda
+PAGE_KINDS = ["ruled", "prose", "unruled", "ruled", "ruled", "prose", "unruled", "ruled", "prose", "ruled", "unruled"]
+
+
+@pytest.fixture(scope="module")
+def pdf_bytes():
+    return build_pdf(PAGE_KINDS, rows=6, cols=4)
+
+
+def test_split_pages_keeps_order_and_covers_all_pages():
+    pages = list(range(1, 12))
+    chunks = split_pages(pages, workers=2)
+    assert len(chunks) > 2
+    assert [page for chunk in chunks for page in chunk] == pages
+
+
+@pytest.mark.parametrize("min_rows", [None, 3])
+def test_parallel_matches_sequential_in_page_order(tmp_path, pdf_bytes, min_rows):
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(pdf_bytes)
+    pages = list(range(1, len(PAGE_KINDS) + 1)) + [99]
+
+    sequential, _ = extract_page_range(str(path), pages, min_rows)
+    parallel = list(iter_page_tables_parallel(str(path), pages, workers=2, min_rows=min_rows))
+    assert len(split_pages(pages, 2)) > 2
+    assert [result[0] for result in parallel] == pages
+    assert parallel == sequential
+    assert parallel[-1][1] is None  # Halaman di luar jangkauan
+    assert any(result[1] for result in parallel)
+
+
+def test_iter_page_tables_parallel_path_matches_sequential(pdf_bytes):
+    pages = [11, 2, 3, 4, 5, 6, 7, 8, 9, 10, 1]
+    sequential = list(converter.iter_page_tables(BytesIO(pdf_bytes), pages, workers=1))
+
+    # Halaman 5 sudah tersimpan: diambil dari store di antara hasil process pool
+    store = TableStore("doc", "settings")
+    store.put_page(5, *next((tables, layouts) for page, tables, layouts in sequential if page == 5))
+    parallel = list(converter.iter_page_tables(BytesIO(pdf_bytes), pages, table_store=store, workers=2))
+
+    assert [page for page, _, _ in parallel] == pages
+    assert parallel == sequential
+    assert all(store.has_page(page) for page in pages)
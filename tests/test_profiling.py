@@ -0,0 +1,32 @@
+import tracemalloc
+
+from profiling import StageProfiler
+
+
+def test_concurrent_profilers_share_tracemalloc():
+    assert not tracemalloc.is_tracing()
+    first = StageProfiler(trace_memory=True)
+    second = StageProfiler(trace_memory=True)
+    first.start()
+    second.start()
+
+    first.stop()
+    # Profiler kedua masih berjalan: tracemalloc tidak boleh dihentikan
+    assert tracemalloc.is_tracing()
+    with second.stage("cleaning", 1):
+        data = [0] * 10000
+    assert second.records[-1]["peak_mb"] is not None and data
+
+    second.stop()
+    assert not tracemalloc.is_tracing()
+
+
+def test_external_tracing_is_left_running():
+    tracemalloc.start()
+    try:
+        profiler = StageProfiler(trace_memory=True)
+        profiler.start()
+        profiler.stop()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,65 @@
+import os
+import time
+
+from table_cache import TableDiskCache
+
+TABLES = [
+    [["Tanggal", "Saldo"], ["01/01/2024", "1.000"], ["02/01/2024", None]],
+    [["Kode", "Nama", "Jumlah"], ["A1", "Kas", 5]],
+]
+LAYOUTS = [{"bbox": [40, 60, 240, 120], "columns": [40, 140, 240], "page_height": 842}, None]
+
+
+# Fungsi untuk mencari file cache satu halaman
+def page_file(cache_dir, page_num):
+    return next(cache_dir.rglob(f"p{page_num:05d}.arrow"))
+
+
+def test_page_round_trip_across_instances(tmp_path):
+    TableDiskCache(str(tmp_path)).put("doc", "pdfplumber", 3, TABLES, LAYOUTS)
+
+    cache = TableDiskCache(str(tmp_path))
+    tables, layouts = cache.get("doc", "pdfplumber", 3)
+    assert tables == [TABLES[0], [["Kode", "Nama", "Jumlah"], ["A1", "Kas", "5"]]]
+    assert layouts == LAYOUTS
+    assert cache.contains("doc", "pdfplumber", 3)
+    assert cache.get("doc", "tabula", 3) is None
+    assert cache.get("doc", "pdfplumber", 4) is None
+
+
+def test_page_without_tables_is_cached(tmp_path):
+    cache = TableDiskCache(str(tmp_path))
+    cache.put("doc", "pdfplumber", 1, [])
+    assert cache.get("doc", "pdfplumber", 1) == ([], [])
+
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    cache = TableDiskCache(str(tmp_path))
+    past = time.time() - 100
+    for page_num in (1, 2, 3):
+        cache.put("doc", "s", page_num, TABLES)
+        os.utime(page_file(tmp_path, page_num), (past + page_num, past + page_num))
+    size = os.path.getsize(page_file(tmp_path, 1))
+
+    # Halaman 1 dibaca terakhir sehingga halaman 2 menjadi yang paling lama tidak dipakai
+    assert cache.get("doc", "s", 1) is not None
+    cache.max_bytes = int(size * 2.5)
+    cache.evict()
+    assert [cache.contains("doc", "s", page_num) for page_num in (1, 2, 3)] == [True, False, True]
+
+
+def test_put_evicts_down_to_ninety_percent(tmp_path):
+    probe = TableDiskCache(str(tmp_path / "probe"))
+    probe.put("doc", "s", 1, TABLES)
+    size = os.path.getsize(page_file(tmp_path / "probe", 1))
+
+    cache = TableDiskCache(str(tmp_path / "cache"), max_bytes=int(size * 3.5))
+    past = time.time() - 100
+    for page_num in (1, 2, 3, 4):
+        cache.put("doc", "s", page_num, TABLES)
+        os.utime(page_file(tmp_path / "cache", page_num), (past + page_num, past + page_num))
+
+    remaining = [page_num for page_num in (1, 2, 3, 4) if cache.contains("doc", "s", page_num)]
+    assert remaining == [2, 3, 4]
+    total = sum(path.stat().st_size for path in (tmp_path / "cache").rglob("*") if path.is_file())
+    assert total <= cache.max_bytes * 0.9
@@ -0,0 +1,75 @@
+from table_stitching import stitch_tables
+
+HEADER = ["Tanggal", "Keterangan", "Jumlah"]
+PAGE_HEIGHT = 842
+
+
+# Fungsi untuk membuat layout tabel pada posisi vertikal tertentu
+def layout(top, bottom, columns=(40, 140, 240, 340)):
+    return {"bbox": [40, top, 340, bottom], "columns": list(columns), "page_height": PAGE_HEIGHT}
+
+
+def rows(start, count):
+    return [[f"0{i}/01/2024", f"TRANSAKSI {i}", str(i * 1000)] for i in range(start, start + count)]
+
+
+def test_repeated_header_is_stitched_and_dropped():
+    pages = [
+        (1, [[HEADER] + rows(1, 3)], [None]),
+        (2, [[HEADER] + rows(4, 2)], [None]),
+    ]
+    groups = list(stitch_tables(pages))
+    assert len(groups) == 1
+    assert groups[0]["pages"] == [1, 2]
+    assert groups[0]["rows"] == [HEADER] + rows(1, 5)
+    assert groups[0]["row_pages"] == [1, 1, 1, 1, 2, 2]
+
+
+def test_continuation_by_column_layout_at_page_break():
+    pages = [
+        (1, [[HEADER] + rows(1, 3)], [layout(500, 800)]),
+        (2, [rows(4, 2)], [layout(40, 120)]),
+    ]
+    groups = list(stitch_tables(pages))
+    assert len(groups) == 1
+    assert groups[0]["rows"] == [HEADER] + rows(1, 5)
+
+
+def test_no_continuation_when_previous_table_ends_mid_page():
+    pages = [
+        (1, [[HEADER] + rows(1, 3)], [layout(100, 200)]),
+        (2, [rows(4, 2)], [layout(40, 120)]),
+    ]
+    assert [group["pages"] for group in stitch_tables(pages)] == [[1], [2]]
+
+
+def test_no_continuation_when_columns_differ_or_pages_skip():
+    shifted = (40, 180, 240, 340)
+    pages = [
+        (1, [[HEADER] + rows(1, 3)], [layout(500, 800)]),
+        (2, [rows(4, 2)], [layout(40, 120, shifted)]),
+        (4, [[HEADER] + rows(6, 1)], [None]),
+    ]
+    assert [group["pages"] for group in stitch_tables(pages)] == [[1], [2], [4]]
+
+
+def test_only_last_table_continues_and_first_table_on_next_page():
+    other = [["Kode", "Nama"], ["1", "A"]]
+    pages = [
+        (1, [[HEADER] + rows(1, 2), other, [HEADER] + rows(3, 1)], [None, None, None]),
+        (2, [[HEADER] + rows(4, 1), other], [None, None]),
+    ]
+    groups = list(stitch_tables(pages))
+    assert [(group["page"], group["index"], group["pages"]) for group in groups] == [
+        (1, 0, [1]), (1, 1, [1]), (1, 2, [1, 2]), (2, 1, [2])]
+    assert groups[2]["rows"] == [HEADER] + rows(3, 2)
+
+
+def test_disabled_keeps_every_table_separate():
+    pages = [
+        (1, [[HEADER] + rows(1, 3)], [None]),
+        (2, [[HEADER] + rows(4, 2)], [None]),
+    ]
+    groups = list(stitch_tables(pages, enabled=False))
+    assert [group["pages"] for group in groups] == [[1], [2]]
+    assert groups[1]["rows"][0] == HEADER
@@ -0,0 +1,25 @@
+from converter import TableStore
+from table_cache import TableDiskCache
+
+TABLE = [["A", "B"], ["1", "2"]]
+
+
+def test_snapshot_is_isolated_from_original():
+    store = TableStore("doc", "settings")
+    store.put_page(1, [TABLE])
+
+    snapshot = store.snapshot()
+    assert snapshot.has_page(1) and snapshot.get_page(1) == [TABLE]
+
+    snapshot.put_page(2, [TABLE])
+    snapshot.release_page(1)
+    assert store.get_page(1) == [TABLE]
+    assert not store.has_page(2)
+
+
+def test_snapshot_pages_reach_original_through_disk_cache(tmp_path):
+    store = TableStore("doc", "settings", disk_cache=TableDiskCache(str(tmp_path)))
+    snapshot = store.snapshot()
+    snapshot.put_page(3, [TABLE], [None])
+    assert store.has_page(3)
+    assert store.get_page(3) == [TABLE]
@@ -0,0 +1,50 @@
+import PyPDF2
+import pdfplumber
+import pytest
+
+from conftest import HEADER, sample_rows, draw_text_table
+from text_layout import page_content, content_features, page_words, extract_text_tables
+
+EXPECTED_ROWS = [HEADER] + [[cell or None for cell in row] for row in sample_rows(6)]
+
+
+@pytest.fixture(params=["Helvetica", "Times-Roman", "Courier"])
+def statement_pdf(request, make_pdf):
+    def page(canvas):
+        canvas.setFont(request.param, 9)
+        canvas.drawString(40, 810, "Rekening Koran Januari 2024")
+        draw_text_table(canvas, [HEADER] + sample_rows(6))
+
+    return make_pdf(page)
+
+
+def test_page_words_match_pdfplumber_positions(statement_pdf):
+    words, _, _ = page_words(PyPDF2.PdfReader(statement_pdf).pages[0])
+    with pdfplumber.open(statement_pdf) as pdf:
+        reference = pdf.pages[0].extract_words()
+
+    assert [word["text"] for word in words] == [word["text"] for word in reference]
+    for word, expected in zip(words, reference):
+        assert word["x0"] == pytest.approx(expected["x0"], abs=0.5)
+        assert word["x1"] == pytest.approx(expected["x1"], abs=0.5)
+        assert word["bottom"] == pytest.approx(expected["bottom"], abs=0.5)
+
+
+def test_extract_text_tables_rebuilds_known_table(statement_pdf):
+    words, width, height = page_words(PyPDF2.PdfReader(statement_pdf).pages[0])
+    tables, layouts = extract_text_tables(words, width, height)
+    assert tables == [EXPECTED_ROWS]
+    assert len(layouts[0]["columns"]) == len(HEADER) + 1
+
+
+def test_content_features_counts_operators(make_pdf):
+    def page(canvas):
+        canvas.drawString(40, 800, "teks")
+        canvas.rect(40, 700, 100, 50)
+        canvas.line(40, 600, 200, 600)
+
+    reader = PyPDF2.PdfReader(make_pdf(page))
+    features = content_features(page_content(reader.pages[0]))
+    assert features["text_ops"] == 1
+    assert features["rule_ops"] >= 2
+    assert features["images"] == 0
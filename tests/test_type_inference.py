@@ -0,0 +1,73 @@
+import pandas as pd
+import pytest
+
+from type_inference import (TYPE_DATE, TYPE_FLOAT, TYPE_INTEGER, TYPE_PERCENT, TYPE_TEXT,
+                            infer_column, infer_column_types, parse_numbers)
+
+
+def test_parse_numbers_indonesian_format():
+    numbers, percent = parse_numbers(pd.Series(["1.234.567,89", "(1.000)", "Rp 2.500", "750-", "-3,5"],
+                                               dtype="string"))
+    assert numbers.tolist() == [1234567.89, -1000.0, 2500.0, -750.0, -3.5]
+    assert not percent.any()
+
+
+def test_parse_numbers_english_format_wins_by_majority():
+    numbers, _ = parse_numbers(pd.Series(["1,234,567.89", "2,000.50", "12"], dtype="string"))
+    assert numbers.tolist() == [1234567.89, 2000.5, 12.0]
+
+
+@pytest.mark.parametrize("values, expected_type", [
+    (["1.000", "(2.000)", "3"], TYPE_INTEGER),
+    (["1.234.567,89", "0,5", "10"], TYPE_FLOAT),
+    (["12,5%", "7%", "100%"], TYPE_PERCENT),
+    (["02/01/2024", "31-12-2023", "1.3.2024"], TYPE_DATE),
+    (["001234", "005678", "009999"], TYPE_TEXT),
+    (["Setoran", "Tarik tunai", "1.000"], TYPE_TEXT),
+])
+def test_infer_column_type(values, expected_type):
+    _, column_type, _ = infer_column(pd.Series(values, dtype=object))
+    assert column_type == expected_type
+
+
+def test_infer_column_types_converts_and_reports():
+    df = pd.DataFrame({
+        "Tanggal": ["02/01/2024", "15/01/2024", "31/01/2024"],
+        "Keterangan": ["Setoran", "Biaya admin", "Bunga"],
+        "Jumlah": ["1.234.567,89", "(1.000)", "12,5"],
+        "Bunga": ["12,5%", "", "3%"],
+    })
+    typed, report = infer_column_types(df)
+
+    assert typed["Tanggal"].tolist() == list(pd.to_datetime(["2024-01-02", "2024-01-15", "2024-01-31"]))
+    assert typed["Keterangan"].tolist() == df["Keterangan"].tolist()
+    assert typed["Jumlah"].tolist() == [1234567.89, -1000.0, 12.5]
+    assert typed["Bunga"].iloc[0] == pytest.approx(0.125)
+    assert pd.isna(typed["Bunga"].iloc[1])
+    assert typed["Bunga"].iloc[2] == pytest.approx(0.03)
+    assert {entry["column"]: entry["type"] for entry in report} == {
+        "Tanggal": TYPE_DATE, "Jumlah": TYPE_FLOAT, "Bunga": TYPE_PERCENT}
+
+
+def test_only_percent_cells_are_scaled():
+    converted, column_type, _ = infer_column(pd.Series(["12,5%", "7%", "3", "40"], dtype=object))
+    assert column_type == TYPE_FLOAT
+    assert converted.tolist() == pytest.approx([0.125, 0.07, 3.0, 40.0])
+
+
+def test_infer_column_types_reports_failed_cells():
+    values = ["1.000"] * 9 + ["n/a"]
+    typed, report = infer_column_types(pd.DataFrame({"Debit": values}))
+    assert typed["Debit"].dtype == "Int16"
+    assert pd.isna(typed["Debit"].iloc[9])
+    assert report[0]["failed"] == 1
+    assert report[0]["failed_rows"] == [9]
+    assert report[0]["failed_examples"] == ["n/a"]
+
+
+def test_infer_column_types_leaves_mixed_column_as_text():
+    df = pd.DataFrame({"Catatan": ["1.000", "lihat lampiran", "2.000", "-"]})
+    typed, report = infer_column_types(df)
+    assert report == []
+    assert typed["Catatan"].tolist() == df["Catatan"].tolist()
+    assert not pd.api.types.is_numeric_dtype(typed["Catatan"])
@@ -0,0 +1,386 @@
+import math
+from bisect import bisect_right
+from collections import Counter
+from typing import List, Dict, Optional, Tuple
+
+import numpy as np
+from PyPDF2.generic import ContentStream
+# build_char_map adalah fungsi internal PyPDF2; dipakai agar decoding teks sama
+# dengan page.extract_text(); versi PyPDF2 dikunci ke 3.0.* di requirements.txt
+# (lihat tests/test_text_layout.py untuk uji regresi posisi kata)
+from PyPDF2._cmap import build_char_map
+from pdfminer.fontmetrics import FONT_METRICS
+
+# Toleransi posisi baseline (point) agar kata dianggap satu baris
+LINE_TOLERANCE = 3.0
+# Glyph yang berjarak kurang dari rasio ini (x ukuran font) masih satu kata
+WORD_GAP_RATIO = 0.15
+# Kata yang berjarak lebih dari rasio ini (x ukuran font) dianggap sel berbeda
+CELL_GAP_RATIO = 1.0
+# Maksimal rasio baris tabel yang boleh menutupi celah kolom (teks panjang yang melewati kolom)
+GUTTER_MAX_COVERAGE = 0.1
+# Lebar glyph default (per 1000 unit font) jika metrik font tidak diketahui
+DEFAULT_GLYPH_WIDTH = 500.0
+# Operator content stream yang menampilkan teks dan yang menggambar path
+TEXT_SHOW_OPERATORS = (b"Tj", b"TJ", b"'", b'"')
+PATH_OPERATORS = (b"m", b"l", b"c", b"v", b"y", b"re", b"h")
+
+
+# Fungsi untuk mengalikan dua matriks transformasi PDF [a b c d e f]
+def _mult(m: List[float], n: List[float]) -> List[float]:
+    return [
+        m[0] * n[0] + m[1] * n[2],
+        m[0] * n[1] + m[1] * n[3],
+        m[2] * n[0] + m[3] * n[2],
+        m[2] * n[1] + m[3] * n[3],
+        m[4] * n[0] + m[5] * n[2] + n[4],
+        m[4] * n[1] + m[5] * n[3] + n[5],
+    ]
+
+
+class _FontMetrics:
+    """
+    Lebar glyph satu font: dari /Widths (font biasa), /W dan /DW (font Type0),
+    atau metrik standar pdfminer untuk 14 font standar tanpa /Widths
+    """
+
+    def __init__(self, font):
+        self.widths: Dict[int, float] = {}
+        self.ranges: List[Tuple[int, int, float]] = []
+        self.char_widths: Optional[Dict[str, float]] = None
+        self.default = DEFAULT_GLYPH_WIDTH
+        self.two_byte = font is not None and font.get("/Subtype") == "/Type0"
+        if font is None:
+            return
+
+        if self.two_byte:
+            descendant = font["/DescendantFonts"][0].get_object()
+            self.default = float(descendant.get("/DW", 1000))
+            w = descendant.get("/W", [])
+            i = 0
+            while i + 1 < len(w):
+                first, second = int(w[i]), w[i + 1].get_object()
+                if isinstance(second, list):
+                    for offset, width in enumerate(second):
+                        self.widths[first + offset] = float(width)
+                    i += 2
+                else:
+                    self.ranges.append((first, int(second), float(w[i + 2])))
+                    i += 3
+        elif "/Widths" in font:
+            first_char = int(font.get("/FirstChar", 0))
+            for offset, width in enumerate(font["/Widths"].get_object()):
+                self.widths[first_char + offset] = float(width)
+            descriptor = font.get("/FontDescriptor")
+            if descriptor is not None:
+                self.default = float(descriptor.get_object().get("/MissingWidth", DEFAULT_GLYPH_WIDTH))
+        else:
+            base_font = str(font.get("/BaseFont", "")).lstrip("/").split("+")[-1]
+            if base_font in FONT_METRICS:
+                self.char_widths = FONT_METRICS[base_font][1]
+
+    def width(self, code: int, char: str) -> float:
+        if self.char_widths is not None:
+            return self.char_widths.get(char, self.default)
+        if code in self.widths:
+            return self.widths[code]
+        for first, last, width in self.ranges:
+            if first <= code <= last:
+                return width
+        return self.default
+
+
+# Fungsi untuk mengubah operand Tj menjadi glyph (kode, teks unicode) seperti PyPDF2
+def _decode_glyphs(operand, encoding, char_map: Dict) -> List[Tuple[int, str]]:
+    if isinstance(operand, str):
+        chars = operand
+    elif isinstance(encoding, str):
+        try:
+            chars = operand.decode(encoding, "surrogatepass")
+        except Exception:
+            chars = operand.decode("utf-16-be" if encoding == "charmap" else "charmap", "surrogatepass")
+    else:
+        return [(code, char_map.get(encoding.get(code, chr(code)), encoding.get(code, chr(code))))
+                for code in operand]
+    return [(ord(char), char_map.get(char, char)) for char in chars]
+
+
+# Fungsi untuk membaca content stream halaman PyPDF2 (None jika halaman kosong)
+def page_content(page) -> Optional[ContentStream]:
+    content = page.get_contents()
+    if content is not None and not isinstance(content, ContentStream):
+        content = ContentStream(content, page.pdf, "bytes")
+    return content
+
+
+# Fungsi untuk menghitung fitur murah dari operator content stream
+def content_features(content: Optional[ContentStream]) -> Dict:
+    """
+    Hanya menghitung operator, tanpa posisi glyph atau analisis layout.
+    Returns: {'text_ops': operator penampil teks, 'rule_ops': garis lurus dan
+    kotak (re, l), 'path_ops': semua operator path, 'images': XObject yang digambar}
+    """
+    counts = Counter(operator for _, operator in content.operations) if content is not None else Counter()
+    return {
+        "text_ops": sum(counts[op] for op in TEXT_SHOW_OPERATORS),
+        "rule_ops": counts[b"re"] + counts[b"l"],
+        "path_ops": sum(counts[op] for op in PATH_OPERATORS),
+        "images": counts[b"Do"],
+    }
+
+
+# Fungsi untuk mengambil kata beserta posisinya dari halaman PyPDF2
+def page_words(page, content: Optional[ContentStream] = None) -> Tuple[List[Dict], float, float]:
+    """
+    Membaca content stream halaman sekali dan menghitung posisi setiap glyph dari
+    matriks teks dan lebar glyph font, tanpa analisis layout lengkap seperti pdfminer.
+    Hanya teks horizontal yang diambil; teks di dalam Form XObject dilewati.
+    content: hasil page_content(page) jika sudah dibaca sebelumnya
+    Returns: (kata {'text', 'x0', 'x1', 'top', 'bottom', 'size'} dengan koordinat
+    dari kiri atas halaman seperti pdfplumber, lebar halaman, tinggi halaman)
+    """
+    mediabox = page.mediabox
+    left, page_top = float(mediabox.left), float(mediabox.top)
+    width, height = float(mediabox.width), float(mediabox.height)
+
+    if content is None:
+        content = page_content(page)
+    resources = page.get("/Resources")
+    if content is None or resources is None:
+        return [], width, height
+
+    fonts = {}
+    font_resources = resources.get_object().get("/Font", {})
+    font_resources = font_resources.get_object() if hasattr(font_resources, "get_object") else font_resources
+    for name in font_resources:
+        _, _, encoding, char_map, _ = build_char_map(name, 200.0, page)
+        fonts[name] = (encoding, char_map, _FontMetrics(font_resources[name].get_object()))
+    unknown_font = ("charmap", {}, _FontMetrics(None))
+
+    words: List[Dict] = []
+    word: Optional[Dict] = None
+
+    def close_word():
+        nonlocal word
+        if word is not None and word["text"].strip():
+            words.append(word)
+        word = None
+
+    cm = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
+    tm = lm = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
+    stack = []
+    font, font_size = unknown_font, 12.0
+    char_spacing = word_spacing = leading = 0.0
+    h_scale = 1.0
+
+    def show_text(operand):
+        nonlocal tm, word
+        encoding, char_map, metrics = font
+        for code, text in _decode_glyphs(operand, encoding, char_map):
+            glyph_width = metrics.width(code, text) / 1000 * font_size
+            m = _mult(tm, cm)
+            advance = (glyph_width + char_spacing +
+                       (word_spacing if code == 32 and not metrics.two_byte else 0.0)) * h_scale
+            if m[0] > 0 and abs(m[1]) < 1e-3:  # Hanya teks horizontal
+                size = font_size * abs(m[3])
+                x0 = m[4] - left
+                x1 = x0 + glyph_width * h_scale * m[0]
+                baseline = page_top - m[5]
+                if not text.strip():
+                    close_word()
+                elif (word is not None and abs(word["baseline"] - baseline) < 0.5 and
+                      x0 - word["x1"] <= WORD_GAP_RATIO * size):
+                    word["text"] += text
+                    word["x1"] = max(word["x1"], x1)
+                else:
+                    close_word()
+                    word = {"text": text, "x0": x0, "x1": x1, "baseline": baseline, "size": size}
+            tm = [tm[0], tm[1], tm[2], tm[3], tm[4] + advance * tm[0], tm[5] + advance * tm[1]]
+
+    def move_line(tx, ty):
+        nonlocal tm, lm
+        lm = [lm[0], lm[1], lm[2], lm[3], lm[4] + tx * lm[0] + ty * lm[2], lm[5] + tx * lm[1] + ty * lm[3]]
+        tm = list(lm)
+
+    for operands, operator in content.operations:
+        try:
+            if operator == b"q":
+                stack.append((cm, font, font_size, char_spacing, word_spacing, h_scale, leading))
+            elif operator == b"Q":
+                if stack:
+                    cm, font, font_size, char_spacing, word_spacing, h_scale, leading = stack.pop()
+            elif operator == b"cm":
+                cm = _mult([float(v) for v in operands], cm)
+            elif operator == b"BT":
+                tm = lm = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
+            elif operator == b"Tf":
+                font = fonts.get(operands[0], unknown_font)
+                font_size = float(operands[1])
+            elif operator == b"Tc":
+                char_spacing = float(operands[0])
+            elif operator == b"Tw":
+                word_spacing = float(operands[0])
+            elif operator == b"Tz":
+                h_scale = float(operands[0]) / 100
+            elif operator == b"TL":
+                leading = float(operands[0])
+            elif operator == b"Td":
+                move_line(float(operands[0]), float(operands[1]))
+            elif operator == b"TD":
+                leading = -float(operands[1])
+                move_line(float(operands[0]), float(operands[1]))
+            elif operator == b"Tm":
+                tm = lm = [float(v) for v in operands]
+            elif operator == b"T*":
+                move_line(0.0, -leading)
+            elif operator == b"Tj":
+                show_text(operands[0])
+            elif operator == b"'":
+                move_line(0.0, -leading)
+                show_text(operands[0])
+            elif operator == b'"':
+                word_spacing, char_spacing = float(operands[0]), float(operands[1])
+                move_line(0.0, -leading)
+                show_text(operands[2])
+            elif operator == b"TJ":
+                for item in operands[0]:
+                    if isinstance(item, (str, bytes)):
+                        show_text(item)
+                    else:
+                        # Angka di TJ menggeser posisi (per 1000 unit font), tanpa glyph
+                        shift = -float(item) / 1000 * font_size * h_scale
+                        tm = [tm[0], tm[1], tm[2], tm[3], tm[4] + shift * tm[0], tm[5] + shift * tm[1]]
+        except (ValueError, TypeError, IndexError, KeyError):
+            continue  # Operator rusak dilewati, seperti extract_text()
+    close_word()
+
+    for item in words:
+        baseline = item.pop("baseline")
+        item["top"] = baseline - item["size"] * 0.8
+        item["bottom"] = baseline + item["size"] * 0.2
+    return words, width, height
+
+
+# Fungsi untuk mengelompokkan kata menjadi baris (urutan atas ke bawah, kiri ke kanan)
+def group_lines(words: List[Dict], tolerance: float = LINE_TOLERANCE) -> List[List[Dict]]:
+    lines: List[List[Dict]] = []
+    for word in sorted(words, key=lambda w: (w["bottom"], w["x0"])):
+        if lines and abs(lines[-1][0]["bottom"] - word["bottom"]) <= tolerance:
+            lines[-1].append(word)
+        else:
+            lines.append([word])
+    for line in lines:
+        line.sort(key=lambda w: w["x0"])
+    return lines
+
+
+# Fungsi untuk menggabungkan kata yang berdekatan dalam satu baris menjadi segmen (calon sel)
+def line_segments(line: List[Dict]) -> List[Tuple[float, float]]:
+    segments: List[List[float]] = []
+    for word in line:
+        if segments and word["x0"] - segments[-1][1] <= CELL_GAP_RATIO * word["size"]:
+            segments[-1][1] = max(segments[-1][1], word["x1"])
+        else:
+            segments.append([word["x0"], word["x1"]])
+    return [(x0, x1) for x0, x1 in segments]
+
+
+# Fungsi untuk mencari blok baris yang berbentuk tabel
+def find_table_blocks(lines: List[List[Dict]]) -> List[List[List[Dict]]]:
+    """
+    Blok tabel: baris berurutan dengan minimal dua segmen. Satu baris dengan satu
+    segmen (mis. sel lain kosong) boleh berada di tengah blok, tetapi dua baris
+    seperti itu berturut-turut (paragraf) atau jarak vertikal yang besar
+    mengakhiri blok.
+    """
+    blocks = []
+    current: List[List[Dict]] = []
+    pending_single = None  # Baris satu segmen yang belum pasti masuk blok
+    previous_bottom = None
+
+    for line in lines:
+        multi_segment = len(line_segments(line)) >= 2
+        bottom = line[0]["bottom"]
+        far = previous_bottom is not None and bottom - previous_bottom > 2.5 * max(w["size"] for w in line)
+        previous_bottom = bottom
+
+        if far or (not multi_segment and pending_single is not None):
+            if len(current) >= 2:
+                blocks.append(current)
+            current, pending_single = [], None
+
+        if multi_segment:
+            if pending_single is not None:
+                current.append(pending_single)
+            pending_single = None
+            current.append(line)
+        elif current:
+            pending_single = line
+
+    if len(current) >= 2:
+        blocks.append(current)
+    return blocks
+
+
+# Fungsi untuk mencari kolom dari celah spasi yang berulang di banyak baris
+def find_columns(block: List[List[Dict]], page_width: float) -> List[Tuple[float, float]]:
+    """
+    Menghitung berapa baris yang menutupi setiap posisi x (resolusi 1 point);
+    posisi yang ditutupi paling banyak GUTTER_MAX_COVERAGE baris adalah celah.
+    Returns: rentang (x0, x1) setiap kolom, urut dari kiri
+    """
+    multi_segment = [line_segments(line) for line in block]
+    multi_segment = [segments for segments in multi_segment if len(segments) >= 2]
+    size = max(1, int(math.ceil(page_width)) + 2)
+    coverage = np.zeros(size, dtype=np.int32)
+    for segments in multi_segment:
+        for x0, x1 in segments:
+            coverage[max(0, int(x0)):min(size, int(math.ceil(x1)))] += 1
+
+    covered = coverage > int(len(multi_segment) * GUTTER_MAX_COVERAGE)
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], covered.astype(np.int8), [0]))))
+    return [(float(start), float(end)) for start, end in zip(edges[::2], edges[1::2])]
+
+
+# Fungsi untuk mengubah blok baris menjadi tabel mentah sesuai kolom
+def block_to_table(block: List[List[Dict]], columns: List[Tuple[float, float]]) -> List[List[Optional[str]]]:
+    starts = [start for start, _ in columns]
+    rows = []
+    for line in block:
+        cells: List[List[str]] = [[] for _ in columns]
+        for word in line:
+            center = (word["x0"] + word["x1"]) / 2
+            col = max(0, bisect_right(starts, center) - 1)
+            # Kata di celah kolom masuk ke kolom terdekat
+            if col + 1 < len(columns) and starts[col + 1] - center < center - columns[col][1]:
+                col += 1
+            cells[col].append(word["text"])
+        rows.append([" ".join(cell) if cell else None for cell in cells])
+    return rows
+
+
+# Fungsi untuk mendeteksi tabel tanpa garis dari posisi kata
+def extract_text_tables(words: List[Dict], page_width: float, page_height: float,
+                        line_tolerance: float = LINE_TOLERANCE) -> Tuple[List[List[List]], List[Dict]]:
+    """
+    Kolom dipisah berdasarkan celah spasi yang sama di banyak baris (lihat
+    find_columns), sehingga cocok untuk laporan sederhana tanpa garis.
+    words: kata dengan posisi (lihat page_words; juga bisa dari OCR)
+    line_tolerance: lihat group_lines (posisi dari OCR kurang presisi)
+    Returns: (tabel_mentah, layout_tabel) dengan format yang sama seperti
+    extract_page_tables (baris pertama = header)
+    """
+    tables, layouts = [], []
+    for block in find_table_blocks(group_lines(words, line_tolerance)):
+        columns = find_columns(block, page_width)
+        if len(columns) < 2:
+            continue
+        table = block_to_table(block, columns)
+        tables.append(table)
+        layouts.append({
+            "bbox": [round(columns[0][0], 2), round(min(w["top"] for w in block[0]), 2),
+                     round(columns[-1][1], 2), round(max(w["bottom"] for w in block[-1]), 2)],
+            "columns": [round(start, 2) for start, _ in columns] + [round(columns[-1][1], 2)],
+            "page_height": round(page_height, 2),
+        })
+    return tables, layouts
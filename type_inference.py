@@ -0,0 +1,156 @@
+from typing import List, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Tipe hasil inferensi kolom
+TYPE_TEXT = "text"
+TYPE_INTEGER = "integer"
+TYPE_FLOAT = "float"
+TYPE_PERCENT = "percent"
+TYPE_DATE = "date"
+
+# Minimal rasio sel terisi yang berhasil di-parse agar kolom dikonversi
+MIN_PARSED_RATIO = 0.9
+# Jumlah contoh sel gagal yang dicatat per kolom
+MAX_FAILED_EXAMPLES = 5
+
+# Format angka Indonesia/Eropa: titik ribuan, koma desimal (1.234.567,89)
+_ID_NUMBER = r"(?:\d{1,3}(?:\.\d{3})+|\d+)(?:,\d+)?"
+# Format angka Inggris: koma ribuan, titik desimal (1,234,567.89)
+_EN_NUMBER = r"(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?"
+# Tanggal dd/mm/yyyy (juga dengan pemisah - atau .)
+_DATE = r"\d{1,2}[/.-]\d{1,2}[/.-]\d{4}"
+# Kode/nomor identitas (nol di depan atau terlalu panjang untuk angka) tetap teks
+_IDENTIFIER = r"0\d.*|.*\d{16,}.*"
+
+
+# Fungsi untuk regex fullmatch vektor yang menghasilkan array boolean (NA = False)
+def _fullmatch(text: pd.Series, pattern: str) -> np.ndarray:
+    return text.str.fullmatch(pattern).fillna(False).to_numpy(dtype=bool)
+
+
+# Fungsi untuk parsing tanggal dd/mm/yyyy
+def parse_dates(text: pd.Series) -> pd.Series:
+    """
+    text: Series string (NA untuk sel kosong). Returns: Series datetime (NaT jika gagal)
+    """
+    valid = _fullmatch(text, _DATE)
+    normalized = text.where(valid).str.replace(r"[.-]", "/", regex=True)
+    return pd.to_datetime(normalized, format="%d/%m/%Y", errors="coerce")
+
+
+# Fungsi untuk parsing angka dengan format Indonesia/Eropa atau Inggris
+def parse_numbers(text: pd.Series) -> Tuple[pd.Series, np.ndarray]:
+    """
+    Mengenali awalan Rp/IDR, negatif dalam kurung "(1.234,56)", tanda minus
+    di depan atau di belakang, dan persen "12,5%".
+    Format (Indonesia atau Inggris) dipilih per kolom: yang paling banyak cocok.
+    text: Series string (NA untuk sel kosong).
+    Returns: (angka float (NaN jika gagal), mask sel persen)
+    """
+    body = text.str.replace(r"^(?:Rp\.?|IDR)\s*", "", regex=True, case=False).str.strip()
+
+    parenthesized = _fullmatch(body, r"\(.*\)")
+    body = body.mask(parenthesized, body.str.slice(1, -1)).str.strip()
+    trailing_minus = _fullmatch(body, r".*\d\s*-")
+    body = body.mask(trailing_minus, body.str.rstrip("- "))
+    leading_minus = _fullmatch(body, r"[-−].*")
+    body = body.mask(leading_minus, body.str.slice(1)).str.strip()
+    percent = _fullmatch(body, r".*%")
+    body = body.mask(percent, body.str.rstrip("% "))
+
+    identifier = _fullmatch(body, _IDENTIFIER)
+    id_valid = _fullmatch(body, _ID_NUMBER) & ~identifier
+    en_valid = _fullmatch(body, _EN_NUMBER) & ~identifier
+
+    # Angka tanpa pemisah ("1234") cocok dengan kedua format; seri dimenangkan format Indonesia
+    if en_valid.sum() > id_valid.sum():
+        normalized = body.where(en_valid).str.replace(",", "", regex=False)
+    else:
+        normalized = body.where(id_valid).str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+
+    numbers = pd.to_numeric(normalized, errors="coerce").astype("float64")
+    negative = parenthesized | trailing_minus | leading_minus
+    numbers = numbers.mask(negative, -numbers)
+    return numbers, percent
+
+
+# Fungsi untuk memilih dtype integer terkecil
+def _compact_integers(numbers: pd.Series) -> pd.Series:
+    present = numbers.dropna()
+    dtype = pd.to_numeric(present.astype("int64"), downcast="integer").dtype if len(present) else np.dtype("int8")
+    if len(present) == len(numbers):
+        return numbers.astype(dtype)
+    # Ada sel kosong/gagal: pakai integer nullable (Int8, Int16, ...)
+    return numbers.astype(dtype.name.capitalize())
+
+
+# Fungsi untuk menentukan dan mengkonversi tipe satu kolom
+def infer_column(values: pd.Series) -> Tuple[pd.Series, str, np.ndarray]:
+    """
+    Returns: (kolom hasil konversi, tipe, mask sel terisi yang gagal di-parse)
+    Kolom dikembalikan apa adanya (TYPE_TEXT) jika kurang dari MIN_PARSED_RATIO
+    sel terisi yang berhasil di-parse.
+    """
+    text = values.astype("string").str.strip()
+    text = text.mask(text == "")
+    filled = text.notna().to_numpy(dtype=bool)
+    filled_count = filled.sum()
+    no_failures = np.zeros(len(values), dtype=bool)
+    if filled_count == 0:
+        return values, TYPE_TEXT, no_failures
+
+    dates = parse_dates(text)
+    parsed = dates.notna().to_numpy(dtype=bool)
+    if parsed.sum() >= filled_count * MIN_PARSED_RATIO:
+        return dates, TYPE_DATE, filled & ~parsed
+
+    numbers, percent = parse_numbers(text)
+    parsed = numbers.notna().to_numpy(dtype=bool)
+    if parsed.sum() < filled_count * MIN_PARSED_RATIO:
+        return values, TYPE_TEXT, no_failures
+
+    failed = filled & ~parsed
+    # Hanya sel bertanda % yang dibagi 100; kolom bertipe persen jika semua selnya persen
+    numbers = numbers.mask(percent, numbers / 100)
+    if percent[parsed].all():
+        return numbers, TYPE_PERCENT, failed
+    if (numbers.dropna() % 1 == 0).all():
+        return _compact_integers(numbers), TYPE_INTEGER, failed
+    return numbers, TYPE_FLOAT, failed
+
+
+# Fungsi untuk mengkonversi kolom teks menjadi angka/tanggal
+def infer_column_types(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict]]:
+    """
+    Mengkonversi setiap kolom teks yang berisi angka (format Indonesia/Eropa atau
+    Inggris, negatif dalam kurung, persen) atau tanggal dd/mm/yyyy menjadi dtype
+    numerik/datetime. Sel persen disimpan sebagai pecahan (12,5% -> 0.125); angka
+    tanpa % di kolom yang sama tidak diubah.
+    Sel yang gagal di-parse pada kolom yang dikonversi menjadi kosong (NA).
+    Returns: (DataFrame baru, laporan per kolom yang dikonversi:
+    {'column', 'type', 'parsed', 'failed', 'failed_rows', 'failed_examples'})
+    """
+    typed_df = df.copy(deep=False)
+    report = []
+    for col_idx in range(df.shape[1]):
+        values = df.iloc[:, col_idx]
+        if not (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)):
+            continue
+
+        converted, column_type, failed = infer_column(values)
+        if column_type == TYPE_TEXT:
+            continue
+
+        typed_df.isetitem(col_idx, converted)
+        failed_rows = np.flatnonzero(failed)
+        report.append({
+            'column': str(df.columns[col_idx]),
+            'type': column_type,
+            'parsed': int(converted.notna().sum()),
+            'failed': len(failed_rows),
+            'failed_rows': failed_rows[:MAX_FAILED_EXAMPLES].tolist(),
+            'failed_examples': [str(v) for v in values.iloc[failed_rows[:MAX_FAILED_EXAMPLES]]],
+        })
+    return typed_df, report